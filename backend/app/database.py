@@ -1,9 +1,11 @@
 import os
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, create_engine, Integer
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, create_engine, Integer, Index, Boolean, Float, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
+from typing import Optional
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -21,6 +23,38 @@ engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+def get_async_database_url(url: str) -> str:
+    """
+    Map the configured sync URL onto its async driver
+    (asyncpg for Postgres, aiosqlite for the SQLite fallback).
+    """
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    for prefix in ("postgresql+psycopg2://", "postgresql://"):
+        if url.startswith(prefix):
+            return url.replace(prefix, "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    return url
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+
+_async_engine_options = {"pool_pre_ping": True}
+if not ASYNC_DATABASE_URL.startswith("sqlite"):
+    _async_engine_options.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    )
+    # Transaction-mode poolers (e.g. Supabase on port 6543) can't hold asyncpg's prepared statements
+    if os.getenv("DB_PGBOUNCER", "false").lower() == "true":
+        _async_engine_options["connect_args"] = {"statement_cache_size": 0}
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_async_engine_options)
+# expire_on_commit=False so committed rows can still be serialized without a lazy reload
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 class Conversation(Base):
     __tablename__ = "conversations"
 
@@ -29,10 +63,16 @@ class Conversation(Base):
     user_id = Column(String, nullable=True) # UUID as string from Supabase
     bioguide_id = Column(String, nullable=True) # Optional link to a specific member
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped by renames and reorders (bulk UPDATEs included) for `since` syncs
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     position = Column(Integer, default=0)
     
     messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_conversations_user_id_bioguide_id", "user_id", "bioguide_id"),
+    )
+
 class Message(Base):
     __tablename__ = "messages"
 
@@ -44,6 +84,10 @@ class Message(Base):
 
     conversation = relationship("Conversation", back_populates="messages")
 
+    __table_args__ = (
+        Index("ix_messages_conversation_id_created_at", "conversation_id", "created_at"),
+    )
+
 class TrackedBill(Base):
     __tablename__ = "tracked_bills"
 
@@ -55,8 +99,14 @@ class TrackedBill(Base):
     congress = Column(Integer)
     title = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped by renames and reorders (bulk UPDATEs included) for `since` syncs
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     position = Column(Integer, default=0)
 
+    __table_args__ = (
+        Index("uq_tracked_bills_user_id_bill_id", "user_id", "bill_id", unique=True),
+    )
+
 class ResearchNote(Base):
     __tablename__ = "research_notes"
 
@@ -68,6 +118,106 @@ class ResearchNote(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_research_notes_user_id_bioguide_id_created_at", "user_id", "bioguide_id", "created_at"),
+    )
+
+# --- Legislative data warehouse (loaded by services/warehouse/ingest.py) ---
+
+class WarehouseBill(Base):
+    __tablename__ = "wh_bills"
+
+    bill_id = Column(String, primary_key=True) # e.g., "118-hr-1"
+    congress = Column(Integer, nullable=False)
+    bill_type = Column(String, nullable=False) # lowercase, e.g. "hr"
+    bill_number = Column(String, nullable=False)
+    title = Column(Text)
+    introduced_date = Column(String) # ISO date as published
+    origin_chamber = Column(String)
+    policy_area = Column(String)
+    sponsor_bioguide_id = Column(String, index=True)
+    sponsor_name = Column(String)
+    sponsor_party = Column(String)
+    sponsor_state = Column(String)
+    sponsor_district = Column(Integer)
+    latest_action_date = Column(String)
+    latest_action_text = Column(Text)
+    update_date = Column(String) # Source updateDate, used for incremental loads
+    actions_loaded = Column(Boolean, default=False)
+    cosponsors_loaded = Column(Boolean, default=False)
+    ingested_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_wh_bills_congress_type_number", "congress", "bill_type", "bill_number", unique=True),
+        Index("ix_wh_bills_update_date", "update_date"),
+    )
+
+class WarehouseBillAction(Base):
+    __tablename__ = "wh_bill_actions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    bill_id = Column(String, ForeignKey("wh_bills.bill_id", ondelete="CASCADE"), nullable=False)
+    seq = Column(Integer, nullable=False) # Position in the source (newest first)
+    action_date = Column(String)
+    action_time = Column(String)
+    text = Column(Text)
+    action_type = Column(String)
+    action_code = Column(String)
+
+    __table_args__ = (
+        Index("ix_wh_bill_actions_bill_id_seq", "bill_id", "seq"),
+    )
+
+class WarehouseBillCosponsor(Base):
+    __tablename__ = "wh_bill_cosponsors"
+
+    bill_id = Column(String, ForeignKey("wh_bills.bill_id", ondelete="CASCADE"), primary_key=True)
+    bioguide_id = Column(String, primary_key=True)
+    full_name = Column(String)
+    party = Column(String)
+    state = Column(String)
+    district = Column(Integer)
+    sponsorship_date = Column(String)
+    is_original_cosponsor = Column(Boolean)
+    withdrawn_date = Column(String)
+
+    __table_args__ = (
+        Index("ix_wh_bill_cosponsors_bioguide_id", "bioguide_id"),
+    )
+
+class WarehouseMember(Base):
+    __tablename__ = "wh_members"
+
+    bioguide_id = Column(String, primary_key=True)
+    name = Column(String) # "Last, First" as in the member list API
+    direct_order_name = Column(String)
+    first_name = Column(String)
+    last_name = Column(String)
+    party = Column(String)
+    state = Column(String)
+    district = Column(Integer)
+    chamber = Column(String)
+    current_member = Column(Boolean, default=False)
+    image_url = Column(String)
+    official_url = Column(String)
+    address_information = Column(JSON) # {"officeAddress", "phoneNumber", ...} as in the member detail API
+    terms = Column(JSON)
+    party_history = Column(JSON)
+    update_date = Column(String)
+    ingested_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_wh_members_state_district", "state", "district"),
+    )
+
+class WarehouseIngestFile(Base):
+    __tablename__ = "wh_ingest_files"
+
+    path = Column(String, primary_key=True)
+    mtime = Column(Float, nullable=False)
+    records = Column(Integer, default=0)
+    ingested_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
@@ -76,6 +226,17 @@ def get_db():
     finally:
         db.close()
 
-# Create tables if they don't exist (useful for initial setup)
-def init_db():
-    Base.metadata.create_all(bind=engine)
+# Async dependency used by the routers so queries don't block the event loop
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def parse_uuid(value: str) -> Optional[uuid.UUID]:
+    """
+    Parse a path/body ID into a UUID, returning None for malformed input.
+    """
+    try:
+        return uuid.UUID(str(value))
+    except (ValueError, TypeError):
+        return None
+
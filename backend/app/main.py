@@ -1,7 +1,16 @@
+import time
+
+IMPORT_STARTED = time.perf_counter()
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from .database import init_db
-from .routers import chat, intelligence, notebook
+from .services.startup import check_readiness
+from .services.cosint.loader import AGENT_PRELOAD, agent_loaded, preload_agent
+from .services.warmup import WARMUP_ON_STARTUP, start_background_warmup
+from .services.bill_watcher import BILL_WATCH_ENABLED, get_bill_watcher
+from .services.metrics import metrics
+from .routers import chat, intelligence, notebook, analytics
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -9,10 +18,30 @@ load_dotenv()
 
 app = FastAPI(title="COSINT API")
 
-# Initialize database tables on startup
+# The schema is managed by migrations (`alembic upgrade head`), not at startup
 @app.on_event("startup")
 def startup_event():
-    init_db()
+    if AGENT_PRELOAD:
+        preload_agent()
+    if WARMUP_ON_STARTUP:
+        start_background_warmup()
+    metrics.set("app_startup_seconds", time.perf_counter() - IMPORT_STARTED)
+
+@app.on_event("startup")
+async def start_bill_watcher():
+    if BILL_WATCH_ENABLED:
+        get_bill_watcher().start()
+
+@app.on_event("shutdown")
+async def stop_bill_watcher():
+    await get_bill_watcher().stop()
+
+@app.on_event("shutdown")
+async def close_brave_client():
+    # Imported here so httpx stays out of the startup import path
+    from .services.brave_search_client import close_async_client
+
+    await close_async_client()
 
 # Enable CORS
 app.add_middleware(
@@ -21,18 +50,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Conversation-Id"],
+    expose_headers=["X-Conversation-Id", "X-Next-Cursor", "X-Synced-At"],
 )
 
 # Include Routers
 app.include_router(chat.router)
 app.include_router(intelligence.router)
 app.include_router(notebook.router)
+app.include_router(analytics.router)
+
+metrics.set("app_import_seconds", time.perf_counter() - IMPORT_STARTED)
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    Whether this instance should receive traffic (database reachable and
+    migrated). /health only says the process is up.
+    """
+    readiness = await check_readiness()
+    # Informational: chat works either way, the first one is just slower
+    readiness["agent"] = "loaded" if agent_loaded() else "loading"
+    return JSONResponse(readiness, status_code=200 if readiness["status"] == "ready" else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,100 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from datetime import date
+from ..services.cosint.api_client import CongressAPIClient
+from ..services.analytics.vote_matrix import get_vote_matrix, VoteRange
+from ..services.analytics.cosponsorship import get_cosponsorship_graph
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+# Endpoints are plain `def` so numpy work and any sync run in the threadpool
+
+def vote_range(
+    congress: Optional[int] = Query(None, description="Only roll calls from this Congress"),
+    session: Optional[int] = Query(None, description="Only roll calls from this session (1 or 2)"),
+    start_roll: Optional[int] = Query(None, description="First roll-call number, inclusive"),
+    end_roll: Optional[int] = Query(None, description="Last roll-call number, inclusive"),
+    since: Optional[date] = Query(None, description="First vote date, inclusive"),
+    until: Optional[date] = Query(None, description="Last vote date, inclusive"),
+) -> VoteRange:
+    return VoteRange(congress, session, start_roll, end_roll, since, until)
+
+def _fresh_matrix():
+    matrix = get_vote_matrix()
+    matrix.ensure_fresh(CongressAPIClient())
+    return matrix
+
+@router.get("/votes/member/{bioguide_id}")
+def get_member_voting_analytics(
+    bioguide_id: str,
+    votes: VoteRange = Depends(vote_range),
+):
+    """
+    Attendance, party unity and most/least aligned colleagues for one representative.
+    """
+    matrix = _fresh_matrix()
+    try:
+        return matrix.member_summary(bioguide_id.upper(), votes)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="No recorded House votes for this member")
+
+@router.get("/votes/agreement")
+def get_vote_agreement(
+    members: str = Query(..., description="Comma-separated Bioguide IDs"),
+    votes: VoteRange = Depends(vote_range),
+):
+    """
+    Pairwise agreement rates between the given representatives.
+    """
+    bioguide_ids = [m.strip().upper() for m in members.split(",") if m.strip()]
+    if not bioguide_ids:
+        raise HTTPException(status_code=400, detail="No members given")
+
+    matrix = _fresh_matrix()
+    try:
+        return matrix.agreement(bioguide_ids, votes)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"No recorded House votes for: {e.args[0]}")
+
+@router.get("/votes/party-unity")
+def get_party_unity(votes: VoteRange = Depends(vote_range)):
+    """
+    Party unity scores for every representative in the matrix.
+    """
+    matrix = _fresh_matrix()
+    return matrix.party_unity(votes)
+
+@router.get("/votes/attendance")
+def get_attendance(votes: VoteRange = Depends(vote_range)):
+    """
+    Share of eligible roll calls each representative voted on.
+    """
+    matrix = _fresh_matrix()
+    return matrix.attendance(votes)
+
+def _fresh_graph():
+    graph = get_cosponsorship_graph()
+    graph.ensure_fresh()
+    return graph
+
+@router.get("/cosponsorship/{bioguide_id}")
+def get_member_collaboration(bioguide_id: str, top: int = Query(10, ge=1, le=100)):
+    """
+    Top cosponsorship collaborators and bipartisan score for a member.
+    """
+    graph = _fresh_graph()
+    try:
+        return graph.member_summary(bioguide_id.upper(), k=top)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="No cosponsorship data for this member")
+
+@router.get("/cosponsorship/{bioguide_id}/committee-overlap")
+def get_collaborator_committee_overlap(bioguide_id: str, top: int = Query(10, ge=1, le=25)):
+    """
+    Committees a member shares with each of their top collaborators.
+    """
+    graph = _fresh_graph()
+    try:
+        return graph.committee_overlap(bioguide_id.upper(), CongressAPIClient(), k=top)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="No cosponsorship data for this member")
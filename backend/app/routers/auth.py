@@ -1,67 +1,175 @@
 import os
-import requests
+import time
+import asyncio
+import hashlib
+import httpx
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 from fastapi import Header, HTTPException
-from jose import jwt
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# How long a fetched JWKS is trusted, and how close to expiry we refresh it in the background
+JWKS_TTL = int(os.getenv("JWKS_TTL", "3600"))
+JWKS_REFRESH_MARGIN = int(os.getenv("JWKS_REFRESH_MARGIN", "300"))
+# An unknown kid triggers at most one refetch per interval, shared by all waiting requests
+JWKS_MIN_REFETCH_INTERVAL = float(os.getenv("JWKS_MIN_REFETCH_INTERVAL", "30"))
+JWKS_FETCH_TIMEOUT = float(os.getenv("JWKS_FETCH_TIMEOUT", "5"))
+# Verified tokens are remembered (by hash) until they expire
+TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+
 # JWT Verification Logic using JWKS (Supports ES256)
-_jwks_cache = None
+class JWKSCache:
+    """
+    Holds the parsed public keys from Supabase's JWKS endpoint. Fetches are
+    async, single-flight and refreshed ahead of expiry, so requests only
+    wait on the network for the very first fetch or a genuinely new kid.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
 
-def get_jwks():
-    global _jwks_cache
-    if _jwks_cache is None:
+    def _jwks_url(self) -> str:
         supabase_url = os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL")
         if not supabase_url:
             raise HTTPException(status_code=500, detail="SUPABASE_URL not configured")
-            
-        jwks_url = f"{supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
+        return f"{supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
+
+    async def _fetch(self):
+        jwks_url = self._jwks_url()
         try:
-            response = requests.get(jwks_url)
-            response.raise_for_status()
-            _jwks_cache = response.json()
+            async with httpx.AsyncClient(timeout=JWKS_FETCH_TIMEOUT) as client:
+                response = await client.get(jwks_url)
+                response.raise_for_status()
+                jwks = response.json()
         except Exception as e:
             print(f"Failed to fetch JWKS from {jwks_url}: {e}")
-            raise HTTPException(status_code=500, detail="Internal authentication error")
-    return _jwks_cache
+            if not self._keys:
+                raise HTTPException(status_code=500, detail="Internal authentication error")
+            # Keep serving the keys we already have
+            self._fetched_at = time.monotonic()
+            return
+
+        from jose import jwk
+
+        keys = {}
+        for key_json in jwks.get("keys", []):
+            try:
+                keys[key_json["kid"]] = jwk.construct(key_json, algorithm=key_json.get("alg", "ES256"))
+            except Exception as e:
+                print(f"Skipping unusable JWKS key {key_json.get('kid')}: {e}")
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+
+    async def refresh(self):
+        """
+        Refresh the key set, joining a fetch that is already in flight.
+        """
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._fetch())
+            self._refresh_task = task
+        await asyncio.shield(task)
+
+    async def get_key(self, kid: Optional[str]):
+        age = time.monotonic() - self._fetched_at
+        if not self._keys or age >= JWKS_TTL:
+            await self.refresh()
+        elif age >= JWKS_TTL - JWKS_REFRESH_MARGIN and (self._refresh_task is None or self._refresh_task.done()):
+            # Still valid: refresh in the background instead of making this request wait
+            self._refresh_task = asyncio.create_task(self._fetch())
+
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._fetched_at >= JWKS_MIN_REFETCH_INTERVAL:
+            # Possibly a rotated key: refetch once, shared by every request holding this kid
+            await self.refresh()
+            key = self._keys.get(kid)
+        return key
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified token claims keyed by the token's hash.
+    Entries are only returned while the token is unexpired.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        claims, expires_at = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def put(self, token: str, claims: Dict[str, Any]):
+        exp = claims.get("exp")
+        if not exp or self.max_size <= 0:
+            return
+        key = self._key(token)
+        self._entries[key] = (claims, float(exp))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+jwks_cache = JWKSCache()
+verified_tokens = VerifiedTokenCache(TOKEN_CACHE_SIZE)
 
 async def get_current_user(authorization: str = Header(None)):
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing or invalid token")
-    
+
     token = authorization.split(" ")[1]
+
+    # 0. Skip signature verification for tokens we've already verified
+    claims = verified_tokens.get(token)
+    if claims is not None:
+        return claims["sub"]
+
+    # Imported here so startup doesn't pay for jose and its crypto backends
+    from jose import jwt
+
     try:
         # 1. Get the Key ID (kid) from the token header
         unverified_header = jwt.get_unverified_header(token)
         kid = unverified_header.get("kid")
-        
-        # 2. Get the corresponding public key from JWKS
-        jwks = get_jwks()
-        key_json = next((k for k in jwks["keys"] if k["kid"] == kid), None)
-        
-        if not key_json:
-            # Refresh cache and try again once if key not found
-            global _jwks_cache
-            _jwks_cache = None
-            jwks = get_jwks()
-            key_json = next((k for k in jwks["keys"] if k["kid"] == kid), None)
-            
-        if not key_json:
+
+        # 2. Get the corresponding parsed public key
+        key = await jwks_cache.get_key(kid)
+        if key is None:
             raise HTTPException(status_code=401, detail="Invalid token: unknown key ID")
 
         # 3. Verify the token using the public key
         payload = jwt.decode(
-            token, 
-            key_json, 
-            algorithms=["ES256", "HS256"], 
+            token,
+            key,
+            algorithms=["ES256", "HS256"],
             audience="authenticated"
         )
-        
+
         user_id = payload.get("sub")
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token payload")
+
+        verified_tokens.put(token, payload)
         return user_id
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"JWT Verification Failed: {str(e)}")
         raise HTTPException(status_code=401, detail=f"Token verification failed: {str(e)}")
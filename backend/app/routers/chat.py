@@ -1,12 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, Response
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
-from ..database import get_db, Conversation, Message, SessionLocal, TrackedBill
-from ..services.cosint.agent import get_cosint_agent
+from ..database import get_async_db, parse_uuid, Conversation, Message, AsyncSessionLocal, TrackedBill
+from ..services.cosint.loader import aload_agent
+from ..services.cosint.action_tags import ActionTagParser
+from ..services.message_pruning import prune_conversation, history_limit
+from ..services.tracing import start_trace, activate, start_span, trace_span, finish_trace
 from .auth import get_current_user
-import re
+from ..services.sse import EventChannel, event_stream, SSE_HEADERS
+from ..services.metrics import metrics
+from .pagination import PageParams, paginate, finish_page
+import asyncio
 
 router = APIRouter(tags=["chat"])
 
@@ -16,20 +25,70 @@ class ChatRequest(BaseModel):
     initial_context: Optional[str] = None
     bioguide_id: Optional[str] = None
 
+def _tool_source(tool_name: str) -> str:
+    if "congress" in tool_name or "member" in tool_name:
+        return "Congress.gov"
+    if "address" in tool_name or "civic" in tool_name:
+        return "Google Civic Data"
+    if "search" in tool_name:
+        return "Brave Web Search"
+    return "external sources"
+
+# Appended to responses cut short by a disconnect, so reloads show they're incomplete
+INTERRUPTED_MARKER = "\n\n*(Response interrupted.)*"
+
+async def _save_partial_response(conv_uuid, content: str):
+    try:
+        async with AsyncSessionLocal() as save_db:
+            save_db.add(Message(conversation_id=conv_uuid, role="assistant", content=content + INTERRUPTED_MARKER))
+            await save_db.commit()
+        metrics.inc("chat_partial_responses_saved_total")
+    except Exception as e:
+        print(f"Failed to save partial response: {e}")
+
+async def _track_bill(user_id: str, action: dict):
+    try:
+        async with AsyncSessionLocal() as save_db:
+            existing = await save_db.scalar(select(TrackedBill.id).where(
+                TrackedBill.user_id == user_id,
+                TrackedBill.bill_id == action["billId"]
+            ).limit(1))
+
+            if not existing:
+                save_db.add(TrackedBill(
+                    user_id=user_id,
+                    bill_id=action["billId"],
+                    bill_type=action["billType"],
+                    bill_number=action["billNumber"],
+                    congress=action["congress"],
+                    title=action["title"]
+                ))
+                await save_db.commit()
+    except IntegrityError:
+        # Tracked concurrently (e.g. from the bill page); the unique index kept one row
+        pass
+    except Exception as e:
+        print(f"Failed to track bill {action['billId']}: {e}")
+
 @router.get("/conversations/{conversation_id}/messages")
-async def get_messages(conversation_id: str, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    conv = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+async def get_messages(conversation_id: str, response: Response, page: PageParams = Depends(), user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    conv_uuid = parse_uuid(conversation_id)
+    conv = await db.get(Conversation, conv_uuid) if conv_uuid else None
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
     if conv.user_id and str(conv.user_id) != user_id:
         raise HTTPException(status_code=403, detail="Forbidden")
     
-    messages = db.query(Message).filter(Message.conversation_id == conversation_id).order_by(Message.created_at.asc()).all()
-    return [{"role": m.role, "content": m.content} for m in messages]
+    stmt = select(Message.id, Message.created_at, Message.role, Message.content).where(Message.conversation_id == conv_uuid)
+    result = await db.execute(paginate(stmt, Message, page, descending=False))
+    rows = finish_page(result.all(), page, response)
+    return [{"role": m.role, "content": m.content} for m in rows]
 
 @router.post("/chat/stream")
-async def chat_stream_endpoint(request: ChatRequest, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
+async def chat_stream_endpoint(request: ChatRequest, http_request: Request, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    trace = start_trace("chat_stream", user_id=user_id, new_conversation=not request.conversation_id)
+
     # 1. Ensure conversation exists and belongs to user
     if not request.conversation_id:
         conv = Conversation(
@@ -37,33 +96,52 @@ async def chat_stream_endpoint(request: ChatRequest, user_id: str = Depends(get_
             user_id=user_id
         )
         db.add(conv)
-        db.commit()
-        db.refresh(conv)
-        conv_id = str(conv.id)
+        await db.commit()
+        conv_uuid = conv.id
     else:
-        conv_id = request.conversation_id
-        conv = db.query(Conversation).filter(Conversation.id == conv_id).first()
+        conv_uuid = parse_uuid(request.conversation_id)
+        conv = await db.get(Conversation, conv_uuid) if conv_uuid else None
+        if not conv:
+            finish_trace(trace)
+            raise HTTPException(status_code=404, detail="Conversation not found")
         
-        if conv and conv.user_id and str(conv.user_id) != user_id:
+        if conv.user_id and str(conv.user_id) != user_id:
+            finish_trace(trace)
             raise HTTPException(status_code=403, detail="Forbidden")
             
-        if conv and conv.title == "New Chat":
+        if conv.title == "New Chat":
             conv.title = request.message[:30] + "..."
-            db.commit()
+            await db.commit()
+    conv_id = str(conv_uuid)
 
     # 2. Get history from DB
-    db_messages = db.query(Message).filter(Message.conversation_id == conv_id).order_by(Message.created_at.asc()).all()
-    history = [(m.role, m.content) for m in db_messages]
+    with trace_span("db.load_history") as span:
+        result = await db.execute(
+            select(Message.role, Message.content).where(Message.conversation_id == conv_uuid).order_by(Message.created_at.asc())
+        )
+        history = [(role, content) for role, content in result.all()]
+        if span:
+            span.set_attribute("messages", len(history))
 
     # 3. Save user message to DB
-    user_msg = Message(conversation_id=conv_id, role="human", content=request.message)
-    db.add(user_msg)
-    db.commit()
+    with trace_span("db.save_user_message"):
+        user_msg = Message(conversation_id=conv_uuid, role="human", content=request.message)
+        db.add(user_msg)
+        await db.commit()
 
-    async def event_generator():
+    async def produce(channel: EventChannel):
+        # The producer runs in its own task, so carry the trace over explicitly
+        activate(trace)
+        stream_error = None
+        tags = ActionTagParser()
+        metrics.inc("chat_streams_started_total")
+        metrics.inc("chat_streams_active")
         try:
-            agent_executor = get_cosint_agent(streaming=True)
-            full_response = ""
+            agent_executor = (await aload_agent()).get_cosint_agent(streaming=True)
+            agent_span = start_span("agent.run")
+            activate(trace, agent_span)
+            # Tool and model runs arrive as start/end event pairs keyed by run_id
+            open_spans = {}
             
             async for event in agent_executor.astream_events(
                 {
@@ -74,80 +152,84 @@ async def chat_stream_endpoint(request: ChatRequest, user_id: str = Depends(get_
                 version="v2"
             ):
                 kind = event["event"]
+                if trace is not None:
+                    if kind in ("on_tool_start", "on_chat_model_start"):
+                        prefix = "tool" if kind == "on_tool_start" else "llm"
+                        open_spans[event["run_id"]] = start_span(f"{prefix}.{event['name']}", parent=agent_span)
+                    elif kind in ("on_tool_end", "on_tool_error", "on_chat_model_end"):
+                        span = open_spans.pop(event["run_id"], None)
+                        if span:
+                            span.end()
+                            if kind == "on_tool_error":
+                                span.error = str(event["data"].get("error"))
+
                 if kind == "on_chat_model_stream":
                     content = event["data"]["chunk"].content
                     if content:
-                        full_response += content
-                        yield content
+                        visible, actions = tags.feed(content)
+                        channel.token(visible)
+                        for action in actions:
+                            if action["type"] == "track_bill":
+                                # Track as soon as the tag completes, not after the stream
+                                await _track_bill(user_id, action)
+                            channel.send("action", action)
                 elif kind == "on_tool_start":
-                    tool_name = event['name']
-                    source = "external sources"
-                    if "congress" in tool_name or "member" in tool_name:
-                        source = "Congress.gov"
-                    elif "address" in tool_name or "civic" in tool_name:
-                        source = "Google Civic Data"
-                    elif "search" in tool_name:
-                        source = "Brave Web Search"
-                    yield f"\n\n*Accessing information from {source}...*\n\n"
+                    channel.send("tool_status", {"tool": event["name"], "source": _tool_source(event["name"]), "status": "start"})
+                elif kind in ("on_tool_end", "on_tool_error"):
+                    channel.send("tool_status", {"tool": event["name"], "source": _tool_source(event["name"]), "status": "end" if kind == "on_tool_end" else "error"})
+
+            channel.token(tags.finish())
+            full_response = tags.text()
+            if agent_span:
+                agent_span.end()
+            activate(trace)
 
             # 4. Intel Extraction Step
             try:
                 from ..services.cosint.agent import get_intel_extraction_agent
                 extraction_agent = get_intel_extraction_agent()
-                intel = await extraction_agent.ainvoke({"response": full_response})
+                with trace_span("intel_extraction"):
+                    intel = await extraction_agent.ainvoke({"response": full_response})
                 
                 if intel.is_useful:
-                    packet_tag = f"\n\n[INTEL_PACKET: {intel.title} | {intel.content} |END_PACKET]"
-                    yield packet_tag
-                    full_response += packet_tag
+                    channel.send("intel", {"title": intel.title, "content": intel.content})
+                    # Stored with the message so reloaded conversations keep the packet
+                    full_response += f"\n\n[INTEL_PACKET: {intel.title} | {intel.content} |END_PACKET]"
             except Exception as e:
                 print(f"Intel extraction failed: {e}")
 
             # 5. Save assistant message to DB after stream finishes
-            with SessionLocal() as save_db:
-                assistant_msg = Message(conversation_id=conv_id, role="assistant", content=full_response)
-                save_db.add(assistant_msg)
-                
-                # CHECK FOR BILL TRACKING
-                track_match = re.search(r"\[TRACK_BILL:\s*(\d+)\s*\|\s*([^|]+)\|\s*([^|]+)\|\s*([^\]]+)\]", full_response)
-                if track_match:
-                    congress = int(track_match.group(1))
-                    bill_type = track_match.group(2).strip()
-                    bill_number = track_match.group(3).strip()
-                    title = track_match.group(4).strip()
-                    bill_id = f"{congress}-{bill_type}-{bill_number}".lower()
-                    
-                    existing = save_db.query(TrackedBill).filter(
-                        TrackedBill.user_id == user_id,
-                        TrackedBill.bill_id == bill_id
-                    ).first()
-                    
-                    if not existing:
-                        new_track = TrackedBill(
-                            user_id=user_id,
-                            bill_id=bill_id,
-                            bill_type=bill_type,
-                            bill_number=bill_number,
-                            congress=congress,
-                            title=title
-                        )
-                        save_db.add(new_track)
-                
-                save_db.commit()
-
-                # 6. PRUNING LOGIC
-                try:
-                    limit = 10
-                    all_msgs = save_db.query(Message).filter(Message.conversation_id == conv_id).order_by(Message.created_at.desc()).all()
-                    if len(all_msgs) > limit:
-                        msgs_to_delete = all_msgs[limit:]
-                        for m in msgs_to_delete:
-                            save_db.delete(m)
-                        save_db.commit()
-                except Exception as prune_err:
-                    print(f"Chat pruning failed: {prune_err}")
+            with trace_span("db.save_response"):
+                async with AsyncSessionLocal() as save_db:
+                    assistant_msg = Message(conversation_id=conv_uuid, role="assistant", content=full_response)
+                    save_db.add(assistant_msg)
+                    await save_db.commit()
+
+            channel.send("done", {"conversationId": conv_id})
+            metrics.inc("chat_streams_completed_total")
 
+        except asyncio.CancelledError:
+            # The client went away: stop the agent, tools and post-processing,
+            # but keep what was already generated
+            stream_error = ConnectionAbortedError("client disconnected")
+            metrics.inc("chat_streams_cancelled_total")
+            partial = tags.text()
+            if partial:
+                await asyncio.shield(_save_partial_response(conv_uuid, partial))
+            raise
         except Exception as e:
-            yield f"\n\nError: {str(e)}"
+            stream_error = e
+            metrics.inc("chat_streams_failed_total")
+            channel.send("done", {"conversationId": conv_id, "error": str(e)})
+        finally:
+            metrics.inc("chat_streams_active", -1)
+            finish_trace(trace, error=stream_error)
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream", headers={"X-Conversation-Id": conv_id})
+    # 6. Prune old history once the response has been fully sent
+    prune_task = BackgroundTask(prune_conversation, conv_uuid, history_limit(conv.bioguide_id))
+    return StreamingResponse(
+        event_stream(produce, is_disconnected=http_request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"X-Conversation-Id": conv_id, **SSE_HEADERS},
+        background=prune_task,
+    )
@@ -1,85 +1,218 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List
 from ..services.cosint.api_client import CongressAPIClient
-from ..services.cosint.agent import get_bill_analysis_agent
+from ..services.cosint.loader import aload_agent
+from ..services.response_cache import cached_json_response, DASHBOARD_CACHE_TTL
+from ..services.cache_service import cache
+from ..services.bill_watcher import bill_status_record
+from .auth import get_current_user
+from dotenv import load_dotenv
+import os
 import re
+import asyncio
+
+load_dotenv()
 
 router = APIRouter(tags=["intelligence"])
 
+# Bills with text but no AI summary (fetch or analysis failed) are rebuilt sooner
+AI_RETRY_TTL = 300
+
+# POST /bills/status: most IDs per request, and parallel upstream fetches for cache misses
+MAX_STATUS_BATCH = 100
+BILL_STATUS_CONCURRENCY = int(os.getenv("BILL_STATUS_CONCURRENCY", "8"))
+
+# Parallel upstream lookups while assembling one member or state dashboard
+DASHBOARD_CONCURRENCY = int(os.getenv("DASHBOARD_CONCURRENCY", "8"))
+
+BILL_ID_PATTERN = re.compile(r"^(\d+)-([a-z.]+)-(\d+)$")
+
+class BillStatusRequest(BaseModel):
+    bill_ids: List[str] = Field(..., max_length=MAX_STATUS_BATCH)
+
 @router.get("/member/{bioguide_id}")
-async def get_member_dashboard(bioguide_id: str):
+async def get_member_dashboard(bioguide_id: str, request: Request):
+    return await cached_json_response(
+        request,
+        f"dashboard:member:{bioguide_id.upper()}",
+        lambda: _build_member_dashboard(bioguide_id),
+    )
+
+async def _build_member_dashboard(bioguide_id: str):
     client = CongressAPIClient()
     try:
-        details = client.get_member_details(bioguide_id)
-        bills = client.get_sponsored_legislation(bioguide_id, limit=10)
-        
-        # Get recent votes - fetch more to allow for filtering
-        recent_votes_raw = client.get_recent_house_votes(limit=15)
-        votes = []
-        for v in recent_votes_raw:
-            # Skip amendments (H.Amdt / S.Amdt)
-            leg_type = v.get("legislationType", "").upper()
-            if "AMDT" in leg_type:
-                continue
-                
-            # Fetch bill title for more context
-            bill_details = {}
-            if v.get("legislationNumber") and v.get("legislationType"):
-                try:
-                    bill_details = client.get_bill_details(
-                        v.get("congress"), 
-                        v.get("legislationType"), 
-                        v.get("legislationNumber")
-                    )
-                except:
-                    pass
-
-            vote_cast = client.get_member_vote_on_roll_call(
-                v.get("congress"), 
-                v.get("sessionNumber"), 
-                v.get("rollCallNumber"), 
-                bioguide_id
-            )
-            votes.append({
-                "legislation": v.get("legislationNumber", "N/A"),
-                "legislationUrl": v.get("legislationUrl"),
-                "legislationTitle": bill_details.get("title", "No title available"),
-                "congress": v.get("congress"),
-                "type": v.get("legislationType"),
-                "number": v.get("legislationNumber"),
-                "question": v.get("voteQuestion"),
-                "vote": vote_cast or "Not Voting",
-                "result": v.get("result"),
-                "date": v.get("startDate")
-            })
-
+        details, bills, roll_calls = await asyncio.gather(
+            asyncio.to_thread(client.get_member_details, bioguide_id),
+            asyncio.to_thread(client.get_sponsored_legislation, bioguide_id, limit=10),
+            _recent_house_roll_calls(client),
+        )
         return {
             "details": details,
             "bills": bills,
-            "votes": votes
+            "votes": [_member_vote(roll_call, bioguide_id) for roll_call in roll_calls]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _recent_house_roll_calls(client: CongressAPIClient, limit: int = 15) -> List[Dict[str, Any]]:
+    """
+    The latest House roll calls (amendments skipped), each with its bill
+    title and every member's vote. Fetched once and shared by every member
+    being shown, with the per-roll-call lookups run concurrently.
+    """
+    # Fetch more than we show to allow for filtering
+    recent_votes_raw = await asyncio.to_thread(client.get_recent_house_votes, limit=limit)
+    # Skip amendments (H.Amdt / S.Amdt)
+    roll_calls = [v for v in recent_votes_raw if "AMDT" not in v.get("legislationType", "").upper()]
+    semaphore = asyncio.Semaphore(DASHBOARD_CONCURRENCY)
+
+    async def call(func, *args):
+        async with semaphore:
+            return await asyncio.to_thread(func, *args)
+
+    async def bill_title(v) -> str:
+        # Bill title for more context
+        if v.get("legislationNumber") and v.get("legislationType"):
+            try:
+                bill_details = await call(client.get_bill_details, v.get("congress"), v.get("legislationType"), v.get("legislationNumber"))
+                return bill_details.get("title", "No title available")
+            except Exception:
+                pass
+        return "No title available"
+
+    async def member_votes(v) -> Dict[str, str]:
+        results = await call(client.get_house_roll_call_member_votes, v.get("congress"), v.get("sessionNumber"), v.get("rollCallNumber"))
+        return {mv.get("bioguideID"): mv.get("voteCast") for mv in results.get("results", [])}
+
+    titles, votes = await asyncio.gather(
+        asyncio.gather(*(bill_title(v) for v in roll_calls)),
+        asyncio.gather(*(member_votes(v) for v in roll_calls)),
+    )
+    return [
+        {"rollCall": v, "title": title, "votes": cast}
+        for v, title, cast in zip(roll_calls, titles, votes)
+    ]
+
+def _member_vote(roll_call: Dict[str, Any], bioguide_id: str) -> Dict[str, Any]:
+    v = roll_call["rollCall"]
+    return {
+        "legislation": v.get("legislationNumber", "N/A"),
+        "legislationUrl": v.get("legislationUrl"),
+        "legislationTitle": roll_call["title"],
+        "congress": v.get("congress"),
+        "type": v.get("legislationType"),
+        "number": v.get("legislationNumber"),
+        "question": v.get("voteQuestion"),
+        "vote": roll_call["votes"].get(bioguide_id) or "Not Voting",
+        "result": v.get("result"),
+        "date": v.get("startDate")
+    }
+
+@router.get("/state/{state_code}")
+async def get_state_dashboard(state_code: str, request: Request):
+    state_code = state_code.upper()
+    if not re.fullmatch(r"[A-Z]{2}", state_code):
+        raise HTTPException(status_code=400, detail="Use a two-letter state code")
+    return await cached_json_response(
+        request,
+        f"dashboard:state:{state_code}",
+        lambda: _build_state_dashboard(state_code),
+    )
+
+def _chamber(member: Dict[str, Any]) -> str:
+    terms = (member.get("terms") or {}).get("item") or []
+    if terms:
+        return "Senate" if "Senate" in (terms[-1].get("chamber") or "") else "House"
+    return "House" if member.get("district") is not None else "Senate"
+
+async def _build_state_dashboard(state_code: str):
+    """
+    Details, committees and recent House votes for a state's whole
+    delegation in one pass. The roll calls are fetched once for everyone,
+    so the upstream cost is about that of a single member dashboard.
+    """
+    client = CongressAPIClient()
+    try:
+        members, roll_calls = await asyncio.gather(
+            asyncio.to_thread(client.get_members, state=state_code, limit=100),
+            _recent_house_roll_calls(client),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if not members:
+        raise HTTPException(status_code=404, detail=f"No members found for state: {state_code}")
+
+    semaphore = asyncio.Semaphore(DASHBOARD_CONCURRENCY)
+
+    async def call(func, bioguide_id: str):
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(func, bioguide_id)
+            except Exception as e:
+                print(f"State dashboard {func.__name__} failed for {bioguide_id}: {e}")
+                return None
+
+    async def build(member: Dict[str, Any]) -> Dict[str, Any]:
+        bioguide_id = member.get("bioguideId")
+        chamber = _chamber(member)
+        details, committees = await asyncio.gather(
+            call(client.get_member_details, bioguide_id),
+            call(client.get_member_committees, bioguide_id),
+        )
+        return {
+            "bioguideId": bioguide_id,
+            "name": member.get("name"),
+            "party": member.get("partyName"),
+            "chamber": chamber,
+            "district": member.get("district"),
+            "details": details,
+            "committees": committees,
+            # Only House roll calls are tracked
+            "votes": [_member_vote(roll_call, bioguide_id) for roll_call in roll_calls] if chamber == "House" else None,
+        }
+
+    delegation = await asyncio.gather(*(build(m) for m in members))
+    # Senators first, then representatives by district
+    delegation.sort(key=lambda m: (m["chamber"] != "Senate", m["district"] or 0, m["name"] or ""))
+    return {
+        "state": state_code,
+        "members": delegation,
+    }
+
 @router.get("/bill/{congress}/{bill_type}/{bill_number}")
-async def get_bill_dashboard(congress: int, bill_type: str, bill_number: str):
+async def get_bill_dashboard(congress: int, bill_type: str, bill_number: str, request: Request):
+    # Sanitize bill_type (e.g., 'h.r.' -> 'hr')
+    sanitized_type = re.sub(r'[^a-zA-Z]', '', bill_type).lower()
+    return await cached_json_response(
+        request,
+        f"dashboard:bill:{congress}:{sanitized_type}:{bill_number}",
+        lambda: _build_bill_dashboard(congress, sanitized_type, bill_number),
+        ttl=lambda payload: AI_RETRY_TTL if payload["text"] and not payload["ai_summary"] else DASHBOARD_CACHE_TTL,
+    )
+
+async def _build_bill_dashboard(congress: int, sanitized_type: str, bill_number: str):
     client = CongressAPIClient()
     try:
-        # Sanitize bill_type (e.g., 'h.r.' -> 'hr')
-        sanitized_type = re.sub(r'[^a-zA-Z]', '', bill_type).lower()
-        
-        details = client.get_bill_details(congress, sanitized_type, bill_number)
-        actions = client.get_bill_actions(congress, sanitized_type, bill_number)
-        cosponsors = client.get_bill_cosponsors(congress, sanitized_type, bill_number)
-        text_versions = client.get_bill_text(congress, sanitized_type, bill_number)
-        
-        # 1. Fetch raw text content
-        raw_text = client.get_bill_text_content(congress, sanitized_type, bill_number)
-        
+        # Blocking client calls run off the event loop
+        details, actions, cosponsors, text_versions = await asyncio.gather(*(
+            asyncio.to_thread(method, congress, sanitized_type, bill_number)
+            for method in (
+                client.get_bill_details,
+                client.get_bill_actions,
+                client.get_bill_cosponsors,
+                client.get_bill_text,
+            )
+        ))
+
+        # 1. Fetch raw text content (reuses the text versions just cached)
+        raw_text = await asyncio.to_thread(client.get_bill_text_content, congress, sanitized_type, bill_number)
+
         # 2. Run Analysis Agent
         ai_summary = None
         if raw_text:
             try:
-                analysis_agent = get_bill_analysis_agent()
+                analysis_agent = (await aload_agent()).get_bill_analysis_agent()
                 result = await analysis_agent.ainvoke({"bill_text": raw_text})
                 ai_summary = result.content
             except Exception as e:
@@ -94,3 +227,53 @@ async def get_bill_dashboard(congress: int, bill_type: str, bill_number: str):
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/bills/status")
+async def get_bill_statuses(request: BillStatusRequest, user_id: str = Depends(get_current_user)):
+    """
+    Compact status (title, latest action, last update) for many bills at
+    once, e.g. every tracked bill in the sidebar. Only bill details are
+    read: no actions, text or AI summary. Cached details are served
+    directly and misses are fetched concurrently.
+    """
+    client = CongressAPIClient()
+    bills = {}
+    invalid = []
+    for bill_id in dict.fromkeys(request.bill_ids):
+        match = BILL_ID_PATTERN.match(bill_id.strip().lower())
+        if not match:
+            invalid.append(bill_id)
+            continue
+        congress, bill_type, bill_number = match.groups()
+        # Same arguments as the bill dashboard, so both share one cache entry
+        bills[bill_id] = (int(congress), re.sub(r'[^a-zA-Z]', '', bill_type), bill_number)
+
+    details = {}
+    misses = []
+    for bill_id, args in bills.items():
+        cached = cache.get(CongressAPIClient.get_bill_details.cache_key(*args))
+        # An empty dict is a cached "not found"; the lookup below returns it without a request
+        if cached:
+            details[bill_id] = cached
+        else:
+            misses.append(bill_id)
+
+    semaphore = asyncio.Semaphore(BILL_STATUS_CONCURRENCY)
+
+    async def fetch(bill_id: str):
+        async with semaphore:
+            return await asyncio.to_thread(client.get_bill_details, *bills[bill_id])
+
+    results = await asyncio.gather(*(fetch(bill_id) for bill_id in misses), return_exceptions=True)
+    for bill_id, result in zip(misses, results):
+        if isinstance(result, Exception):
+            print(f"Bill status lookup failed for {bill_id}: {result}")
+        elif result:
+            details[bill_id] = result
+
+    return {
+        # Request order, first occurrence of each ID
+        "bills": [bill_status_record(bill_id, *bills[bill_id], details[bill_id]) for bill_id in bills if bill_id in details],
+        "missing": [bill_id for bill_id in bills if bill_id not in details],
+        "invalid": invalid,
+    }
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update, case
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Literal
 from pydantic import BaseModel
-from ..database import get_db, Conversation, TrackedBill, ResearchNote
+from ..database import get_async_db, parse_uuid, Conversation, TrackedBill, ResearchNote
 from .auth import get_current_user
+from .pagination import PageParams, paginate, finish_page
+from ..services.bill_watcher import get_bill_watcher
+from ..services.sse import EventChannel, event_stream, SSE_HEADERS
 from datetime import datetime
 
 router = APIRouter(tags=["notebook"])
@@ -28,42 +34,47 @@ class BillTrackRequest(BaseModel):
 
 class RegistryOrderItem(BaseModel):
     id: str
-    type: str # 'conversation' or 'bill'
+    type: Literal['conversation', 'bill']
     position: int
 
 class RegistryOrderUpdate(BaseModel):
     items: List[RegistryOrderItem]
+    # 'full' sets every listed position; 'delta' moves only the listed items and shifts the ones in between
+    mode: Literal['full', 'delta'] = 'full'
+
+async def _get_owned(db: AsyncSession, model, criterion, user_id: str):
+    result = await db.execute(select(model).where(criterion, model.user_id == user_id).limit(1))
+    return result.scalars().first()
 
 # --- Conversation Endpoints ---
 
 @router.post("/conversations")
-async def create_conversation(user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_conversation(user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     conv = Conversation(title="New Chat", user_id=user_id)
     db.add(conv)
-    db.commit()
-    db.refresh(conv)
+    await db.commit()
     return {"id": str(conv.id), "title": conv.title}
 
 @router.get("/conversations/member/{bioguide_id}")
-async def get_member_conversation(bioguide_id: str, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    conv = db.query(Conversation).filter(
+async def get_member_conversation(bioguide_id: str, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    conv_id = await db.scalar(select(Conversation.id).where(
         Conversation.user_id == user_id,
         Conversation.bioguide_id == bioguide_id
-    ).first()
+    ).limit(1))
     
-    if conv:
-        return {"id": str(conv.id)}
+    if conv_id:
+        return {"id": str(conv_id)}
     return {"id": None}
 
 @router.post("/conversations/member/{bioguide_id}")
-async def create_member_conversation(bioguide_id: str, name: Optional[str] = None, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    conv = db.query(Conversation).filter(
+async def create_member_conversation(bioguide_id: str, name: Optional[str] = None, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    conv_id = await db.scalar(select(Conversation.id).where(
         Conversation.user_id == user_id,
         Conversation.bioguide_id == bioguide_id
-    ).first()
+    ).limit(1))
     
-    if conv:
-        return {"id": str(conv.id)}
+    if conv_id:
+        return {"id": str(conv_id)}
     
     new_conv = Conversation(
         title=name or f"Briefing: {bioguide_id}",
@@ -71,51 +82,67 @@ async def create_member_conversation(bioguide_id: str, name: Optional[str] = Non
         bioguide_id=bioguide_id
     )
     db.add(new_conv)
-    db.commit()
-    db.refresh(new_conv)
+    await db.commit()
     return {"id": str(new_conv.id)}
 
 @router.get("/conversations")
-async def list_conversations(user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    conversations = db.query(Conversation).filter(
+async def list_conversations(response: Response, page: PageParams = Depends(), user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    stmt = select(Conversation).where(
         Conversation.user_id == user_id,
         Conversation.bioguide_id.isnot(None)
-    ).order_by(Conversation.created_at.desc()).all()
+    )
+    result = await db.execute(paginate(stmt, Conversation, page, since_column=Conversation.updated_at))
+    conversations = finish_page(result.scalars().all(), page, response)
     return [{"id": str(c.id), "title": c.title, "created_at": c.created_at, "bioguide_id": c.bioguide_id, "position": c.position} for c in conversations]
 
 @router.patch("/conversations/{conversation_id}")
-async def update_conversation(conversation_id: str, update: ConversationUpdate, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    conv = db.query(Conversation).filter(Conversation.id == conversation_id, Conversation.user_id == user_id).first()
+async def update_conversation(conversation_id: str, update: ConversationUpdate, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    conv = await _get_owned(db, Conversation, Conversation.id == parse_uuid(conversation_id), user_id)
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
     conv.title = update.title
-    db.commit()
-    db.refresh(conv)
+    await db.commit()
     return conv
 
 @router.delete("/conversations/{conversation_id}")
-async def delete_conversation(conversation_id: str, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    conv = db.query(Conversation).filter(Conversation.id == conversation_id, Conversation.user_id == user_id).first()
+async def delete_conversation(conversation_id: str, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    conv = await _get_owned(db, Conversation, Conversation.id == parse_uuid(conversation_id), user_id)
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    db.delete(conv)
-    db.commit()
+    await db.delete(conv)
+    await db.commit()
     return {"status": "success"}
 
 # --- Bill Tracking Endpoints ---
 
 @router.get("/tracked-bills")
-async def list_tracked_bills(user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    bills = db.query(TrackedBill).filter(TrackedBill.user_id == user_id).order_by(TrackedBill.created_at.desc()).all()
-    return bills
+async def list_tracked_bills(response: Response, page: PageParams = Depends(), user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    stmt = select(TrackedBill).where(TrackedBill.user_id == user_id)
+    result = await db.execute(paginate(stmt, TrackedBill, page, since_column=TrackedBill.updated_at))
+    return finish_page(result.scalars().all(), page, response)
+
+@router.get("/tracked-bills/stream")
+async def stream_tracked_bill_updates(user_id: str = Depends(get_current_user)):
+    """
+    Server-sent `bill_update` events whenever one of the user's tracked bills
+    gets a new latest action.
+    """
+    watcher = get_bill_watcher()
+    queue = watcher.subscribe(user_id)
+
+    async def produce(channel: EventChannel):
+        try:
+            while True:
+                channel.send("bill_update", await queue.get())
+        finally:
+            watcher.unsubscribe(user_id, queue)
+
+    return StreamingResponse(event_stream(produce), media_type="text/event-stream", headers=SSE_HEADERS)
 
 @router.post("/tracked-bills")
-async def track_bill(request: BillTrackRequest, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    existing = db.query(TrackedBill).filter(
-        TrackedBill.user_id == user_id,
-        TrackedBill.bill_id == request.bill_id
-    ).first()
+async def track_bill(request: BillTrackRequest, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    existing = await _get_owned(db, TrackedBill, TrackedBill.bill_id == request.bill_id, user_id)
     
     if existing:
         return existing
@@ -129,56 +156,115 @@ async def track_bill(request: BillTrackRequest, user_id: str = Depends(get_curre
         title=request.title
     )
     db.add(new_track)
-    db.commit()
-    db.refresh(new_track)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Lost a race with another request (e.g. a chat action) tracking the same bill
+        await db.rollback()
+        existing = await _get_owned(db, TrackedBill, TrackedBill.bill_id == request.bill_id, user_id)
+        if existing is None:
+            raise
+        return existing
     return new_track
 
 @router.patch("/tracked-bills/{bill_id}")
-async def update_tracked_bill(bill_id: str, update: NoteUpdate, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    bill = db.query(TrackedBill).filter(TrackedBill.bill_id == bill_id, TrackedBill.user_id == user_id).first()
+async def update_tracked_bill(bill_id: str, update: NoteUpdate, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    bill = await _get_owned(db, TrackedBill, TrackedBill.bill_id == bill_id, user_id)
     if not bill:
         raise HTTPException(status_code=404, detail="Tracked bill not found")
     
     if update.title is not None:
         bill.title = update.title
     
-    db.commit()
-    db.refresh(bill)
+    await db.commit()
     return bill
 
 @router.delete("/tracked-bills/{bill_id}")
-async def untrack_bill(bill_id: str, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    bill = db.query(TrackedBill).filter(TrackedBill.bill_id == bill_id, TrackedBill.user_id == user_id).first()
+async def untrack_bill(bill_id: str, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    bill = await _get_owned(db, TrackedBill, TrackedBill.bill_id == bill_id, user_id)
     if not bill:
         raise HTTPException(status_code=404, detail="Tracked bill not found")
-    db.delete(bill)
-    db.commit()
+    await db.delete(bill)
+    await db.commit()
     return {"status": "success"}
 
 # --- Ordering Endpoint ---
 
-@router.put("/order")
-async def update_registry_order(request: RegistryOrderUpdate, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    for item in request.items:
-        if item.type == 'conversation':
-            db.query(Conversation).filter(Conversation.id == item.id, Conversation.user_id == user_id).update({"position": item.position})
+def _registry_tables(user_id: str):
+    # Sidebar items share one position space across both tables
+    return [
+        (Conversation, Conversation.id, [Conversation.user_id == user_id, Conversation.bioguide_id.isnot(None)]),
+        (TrackedBill, TrackedBill.bill_id, [TrackedBill.user_id == user_id]),
+    ]
+
+def _item_key(item: RegistryOrderItem):
+    return parse_uuid(item.id) if item.type == 'conversation' else item.id
+
+async def _apply_full_order(db: AsyncSession, items: List[RegistryOrderItem], user_id: str):
+    # One CASE-based UPDATE per table, whatever the number of items
+    for (model, key_column, _), item_type in zip(_registry_tables(user_id), ('conversation', 'bill')):
+        positions = {_item_key(i): i.position for i in items if i.type == item_type}
+        positions.pop(None, None)
+        if not positions:
+            continue
+        await db.execute(
+            update(model)
+            .where(model.user_id == user_id, key_column.in_(positions))
+            .values(position=case(positions, value=key_column))
+            .execution_options(synchronize_session=False)
+        )
+
+async def _apply_moves(db: AsyncSession, items: List[RegistryOrderItem], user_id: str):
+    # Each move is a constant number of range shifts, independent of notebook size
+    tables = _registry_tables(user_id)
+    for item in items:
+        model, key_column, criteria = tables[0] if item.type == 'conversation' else tables[1]
+        key = _item_key(item)
+        old = await db.scalar(select(model.position).where(*criteria, key_column == key))
+        if old is None or old == item.position:
+            continue
+
+        if item.position < old:
+            shift, lower, upper = 1, item.position, old - 1
         else:
-            db.query(TrackedBill).filter(TrackedBill.bill_id == item.id, TrackedBill.user_id == user_id).update({"position": item.position})
-    db.commit()
+            shift, lower, upper = -1, old + 1, item.position
+        for shift_model, _, shift_criteria in tables:
+            await db.execute(
+                update(shift_model)
+                .where(*shift_criteria, shift_model.position.between(lower, upper))
+                .values(position=shift_model.position + shift)
+                .execution_options(synchronize_session=False)
+            )
+        await db.execute(
+            update(model).where(*criteria, key_column == key).values(position=item.position)
+            .execution_options(synchronize_session=False)
+        )
+
+@router.put("/order")
+@router.put("/registry/order")
+async def update_registry_order(request: RegistryOrderUpdate, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    if request.mode == 'delta':
+        await _apply_moves(db, request.items, user_id)
+    else:
+        await _apply_full_order(db, request.items, user_id)
+    # Single commit so the whole reorder applies atomically
+    await db.commit()
     return {"status": "success"}
 
 # --- Research Notes Endpoints ---
 
 @router.get("/member/{bioguide_id}/notes")
-async def list_member_notes(bioguide_id: str, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    notes = db.query(ResearchNote).filter(
+async def list_member_notes(bioguide_id: str, response: Response, page: PageParams = Depends(), user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    stmt = select(ResearchNote).where(
         ResearchNote.user_id == user_id,
         ResearchNote.bioguide_id == bioguide_id
-    ).order_by(ResearchNote.created_at.desc()).all()
-    return notes
+    )
+    # Notes are edited in place, so "changed since" follows updated_at
+    result = await db.execute(paginate(stmt, ResearchNote, page, since_column=ResearchNote.updated_at))
+    return finish_page(result.scalars().all(), page, response)
 
 @router.post("/member/{bioguide_id}/notes")
-async def create_member_note(bioguide_id: str, note: NoteCreate, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_member_note(bioguide_id: str, note: NoteCreate, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     new_note = ResearchNote(
         user_id=user_id,
         bioguide_id=bioguide_id,
@@ -186,13 +272,12 @@ async def create_member_note(bioguide_id: str, note: NoteCreate, user_id: str =
         content=note.content
     )
     db.add(new_note)
-    db.commit()
-    db.refresh(new_note)
+    await db.commit()
     return new_note
 
 @router.patch("/notes/{note_id}")
-async def update_note(note_id: str, update: NoteUpdate, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    note = db.query(ResearchNote).filter(ResearchNote.id == note_id, ResearchNote.user_id == user_id).first()
+async def update_note(note_id: str, update: NoteUpdate, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    note = await _get_owned(db, ResearchNote, ResearchNote.id == parse_uuid(note_id), user_id)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
     
@@ -201,15 +286,16 @@ async def update_note(note_id: str, update: NoteUpdate, user_id: str = Depends(g
     if update.content is not None:
         note.content = update.content
     
-    db.commit()
-    db.refresh(note)
+    await db.commit()
+    # Pick up the onupdate timestamp
+    await db.refresh(note)
     return note
 
 @router.delete("/notes/{note_id}")
-async def delete_note(note_id: str, user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    note = db.query(ResearchNote).filter(ResearchNote.id == note_id, ResearchNote.user_id == user_id).first()
+async def delete_note(note_id: str, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    note = await _get_owned(db, ResearchNote, ResearchNote.id == parse_uuid(note_id), user_id)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
-    db.delete(note)
-    db.commit()
+    await db.delete(note)
+    await db.commit()
     return {"status": "success"}
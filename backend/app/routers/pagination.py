@@ -0,0 +1,85 @@
+import base64
+from datetime import datetime, timezone
+from typing import Optional, List, Any
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import and_, or_
+from ..database import parse_uuid
+
+MAX_PAGE_SIZE = 500
+
+class PageParams:
+    """
+    Common query parameters for keyset-paginated list endpoints.
+    Omitting `limit` returns the full list, as before pagination existed.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Maximum rows to return"),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+        since: Optional[datetime] = Query(None, description="Only rows created or updated after this time (use X-Synced-At)"),
+    ):
+        self.limit = limit
+        self.cursor = decode_cursor(cursor) if cursor else None
+        self.since = _naive_utc(since) if since else None
+        # Taken before the query runs, so a write landing mid-request is picked up by the next sync
+        self.synced_at = datetime.utcnow()
+
+def _naive_utc(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        row_uuid = parse_uuid(row_id)
+        if row_uuid is None:
+            raise ValueError(row_id)
+        return datetime.fromisoformat(created_at), row_uuid
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def paginate(stmt, model, page: PageParams, descending: bool = True, since_column=None):
+    """
+    Order by (created_at, id) and apply the cursor, `since` and limit filters.
+    One extra row is fetched so the caller can tell whether another page exists.
+    """
+    created_at, row_id = model.created_at, model.id
+
+    if page.since is not None:
+        stmt = stmt.where((since_column if since_column is not None else created_at) > page.since)
+
+    if page.cursor is not None:
+        cursor_created_at, cursor_id = page.cursor
+        if descending:
+            stmt = stmt.where(or_(created_at < cursor_created_at, and_(created_at == cursor_created_at, row_id < cursor_id)))
+        else:
+            stmt = stmt.where(or_(created_at > cursor_created_at, and_(created_at == cursor_created_at, row_id > cursor_id)))
+
+    if descending:
+        stmt = stmt.order_by(created_at.desc(), row_id.desc())
+    else:
+        stmt = stmt.order_by(created_at.asc(), row_id.asc())
+
+    if page.limit is not None:
+        stmt = stmt.limit(page.limit + 1)
+    return stmt
+
+def finish_page(rows: List[Any], page: PageParams, response: Response) -> List[Any]:
+    """
+    Trim the look-ahead row and expose paging state as headers, so the
+    response body stays a plain list for existing clients.
+    """
+    response.headers["X-Synced-At"] = page.synced_at.isoformat()
+    if page.limit is not None and len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+    return rows
@@ -0,0 +1,104 @@
+import os
+import re
+import csv
+from typing import Optional, Dict, Set, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Optional CSV of zip,state,district rows (district 0 = at-large). A ZIP listed
+# with several districts is ambiguous and always goes to the full lookup.
+ZIP_DISTRICT_FILE = os.getenv("ZIP_DISTRICT_FILE")
+
+STATE_ABBREVIATIONS = {
+    "ALABAMA": "AL", "ALASKA": "AK", "ARIZONA": "AZ", "ARKANSAS": "AR", "CALIFORNIA": "CA",
+    "COLORADO": "CO", "CONNECTICUT": "CT", "DELAWARE": "DE", "DISTRICT OF COLUMBIA": "DC",
+    "FLORIDA": "FL", "GEORGIA": "GA", "HAWAII": "HI", "IDAHO": "ID", "ILLINOIS": "IL",
+    "INDIANA": "IN", "IOWA": "IA", "KANSAS": "KS", "KENTUCKY": "KY", "LOUISIANA": "LA",
+    "MAINE": "ME", "MARYLAND": "MD", "MASSACHUSETTS": "MA", "MICHIGAN": "MI", "MINNESOTA": "MN",
+    "MISSISSIPPI": "MS", "MISSOURI": "MO", "MONTANA": "MT", "NEBRASKA": "NE", "NEVADA": "NV",
+    "NEW HAMPSHIRE": "NH", "NEW JERSEY": "NJ", "NEW MEXICO": "NM", "NEW YORK": "NY",
+    "NORTH CAROLINA": "NC", "NORTH DAKOTA": "ND", "OHIO": "OH", "OKLAHOMA": "OK", "OREGON": "OR",
+    "PENNSYLVANIA": "PA", "RHODE ISLAND": "RI", "SOUTH CAROLINA": "SC", "SOUTH DAKOTA": "SD",
+    "TENNESSEE": "TN", "TEXAS": "TX", "UTAH": "UT", "VERMONT": "VT", "VIRGINIA": "VA",
+    "WASHINGTON": "WA", "WEST VIRGINIA": "WV", "WISCONSIN": "WI", "WYOMING": "WY",
+    "PUERTO RICO": "PR", "GUAM": "GU", "AMERICAN SAMOA": "AS", "VIRGIN ISLANDS": "VI",
+    "NORTHERN MARIANA ISLANDS": "MP",
+}
+
+# USPS standard abbreviations for the words people most often spell out
+STREET_ABBREVIATIONS = {
+    "STREET": "ST", "AVENUE": "AVE", "AV": "AVE", "ROAD": "RD", "DRIVE": "DR", "BOULEVARD": "BLVD",
+    "LANE": "LN", "COURT": "CT", "PLACE": "PL", "TERRACE": "TER", "HIGHWAY": "HWY",
+    "PARKWAY": "PKWY", "CIRCLE": "CIR", "SQUARE": "SQ", "TRAIL": "TRL", "EXPRESSWAY": "EXPY",
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+    "MOUNT": "MT", "SAINT": "ST", "FORT": "FT",
+}
+
+# Secondary unit designators; the unit never changes the district, so it's dropped.
+# ("FL" is left out: it's far more often Florida than a floor.)
+UNIT_PATTERN = re.compile(
+    r"\b(?:APT|APARTMENT|UNIT|STE|SUITE|FLOOR|RM|ROOM|BLDG|BUILDING|LOT|SPC|SPACE|DEPT|TRLR)\b\.?\s*[A-Z0-9-]+\b"
+    r"|#\s*[A-Z0-9-]+\b"
+)
+ZIP_PATTERN = re.compile(r"\b(\d{5})(?:-?\d{4})?\b")
+# A ZIP is only trusted at the end of the address, so a five-digit house number isn't mistaken for one
+TRAILING_ZIP = re.compile(r"\b(\d{5})(?:-?\d{4})?[\s,.]*(?:USA|US|UNITED STATES(?: OF AMERICA)?)?[\s.]*$", re.IGNORECASE)
+COUNTRY_SUFFIX = re.compile(r"\b(?:USA|US|U S A|UNITED STATES(?: OF AMERICA)?)\s*$")
+
+_STATE_NAME_PATTERN = re.compile(r"\b(" + "|".join(sorted(STATE_ABBREVIATIONS, key=len, reverse=True)) + r")\b")
+
+def normalize_address(address: str) -> str:
+    """
+    Canonical form used as the cache key, so "123 Main Street, Apt 4B,
+    Princeton, New Jersey 08540-1234" and "123 main st princeton nj 08540"
+    share an entry.
+    """
+    text = address.upper()
+    text = ZIP_PATTERN.sub(r"\1", text)
+    text = UNIT_PATTERN.sub(" ", text)
+    text = re.sub(r"[^\w\s-]", " ", text)
+    text = COUNTRY_SUFFIX.sub(" ", re.sub(r"\s+", " ", text).strip())
+    text = _STATE_NAME_PATTERN.sub(lambda m: STATE_ABBREVIATIONS[m.group(1)], text)
+    words = [STREET_ABBREVIATIONS.get(word, word) for word in text.split()]
+    return " ".join(words)
+
+def extract_zip(address: str) -> Optional[str]:
+    """
+    The five-digit ZIP ending the address, if there is one.
+    """
+    match = TRAILING_ZIP.search(address.strip())
+    return match.group(1) if match else None
+
+_zip_districts: Optional[Dict[str, Set[Tuple[str, int]]]] = None
+
+def _load_zip_districts() -> Dict[str, Set[Tuple[str, int]]]:
+    table: Dict[str, Set[Tuple[str, int]]] = {}
+    if not ZIP_DISTRICT_FILE:
+        return table
+    try:
+        with open(ZIP_DISTRICT_FILE, newline="") as f:
+            for row in csv.DictReader(f):
+                zip_code = (row.get("zip") or "").strip()
+                state = (row.get("state") or "").strip().upper()
+                district = (row.get("district") or "").strip()
+                if zip_code and state and district.isdigit():
+                    table.setdefault(zip_code.zfill(5), set()).add((state, int(district)))
+    except OSError as e:
+        print(f"Failed to load ZIP district file {ZIP_DISTRICT_FILE}: {e}")
+    return table
+
+def district_for_zip(zip_code: Optional[str]) -> Optional[Tuple[str, int]]:
+    """
+    The district for a ZIP that lies entirely within one district, else None.
+    """
+    global _zip_districts
+    if not zip_code:
+        return None
+    if _zip_districts is None:
+        _zip_districts = _load_zip_districts()
+    districts = _zip_districts.get(zip_code)
+    if districts and len(districts) == 1:
+        return next(iter(districts))
+    return None
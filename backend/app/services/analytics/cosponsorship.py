@@ -0,0 +1,391 @@
+import os
+import json
+import time
+import tempfile
+import threading
+import numpy as np
+import scipy.sparse as sp
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
+from dotenv import load_dotenv
+from ...database import SessionLocal, WarehouseBill, WarehouseBillCosponsor
+from ..cache_service import cache_dir
+
+load_dotenv()
+
+try:
+    import fcntl
+except ImportError:  # no cross-process lock off POSIX; saves are still atomic per file
+    fcntl = None
+
+COSPONSOR_GRAPH_DIR = os.getenv("COSPONSOR_GRAPH_DIR") or os.path.join(cache_dir, "cosponsorship")
+# How often reads check the warehouse for bills with new cosponsor data
+COSPONSOR_SYNC_INTERVAL = int(os.getenv("COSPONSOR_SYNC_INTERVAL", "3600"))
+# Seconds before the watermark a sync looks back, for ingest batches that commit
+# after bills with a later ingested_at were already folded in
+COSPONSOR_SYNC_OVERLAP = int(os.getenv("COSPONSOR_SYNC_OVERLAP", "900"))
+
+_ARRAY_PARTS = ("data", "indices", "indptr")
+
+class CosponsorshipGraph:
+    """
+    Sparse member x bill incidence matrix B (sponsor and cosponsors of each
+    bill) and the member x member adjacency A = B·Bᵀ, where A[i, j] counts
+    the bills members i and j both put their name on and A[i, i] counts
+    member i's bills. Both are persisted as raw CSR/CSC arrays in .npy files
+    and memory-mapped on load.
+    """
+
+    def __init__(self, path: str = COSPONSOR_GRAPH_DIR):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self.members: List[Dict[str, Any]] = []
+        self.bill_ids: List[str] = []
+        self._member_index: Dict[str, int] = {}
+        self._bill_index: Dict[str, int] = {}
+        self.incidence = sp.csc_matrix((0, 0), dtype=np.int32)
+        self.adjacency = sp.csr_matrix((0, 0), dtype=np.int32)
+        self.built_through: Optional[str] = None
+        # Bills applied within the overlap window, with the ingested_at they were applied at
+        self._applied: Dict[str, str] = {}
+        self.last_sync = 0.0
+        self._loaded_version = None
+        self._load()
+
+    # --- Storage ---
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False):
+        """
+        Cross-process lock on the graph files. Every API worker and the
+        build-graph CLI may save, and the arrays and index must be swapped as a set.
+        """
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _disk_version(self):
+        # Saves replace the index file, so a new inode or mtime means another writer saved
+        try:
+            st = os.stat(os.path.join(self.path, "index.json"))
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    def _load_arrays(self, name: str, shape, cls):
+        parts = [np.load(os.path.join(self.path, f"{name}.{part}.npy"), mmap_mode="r") for part in _ARRAY_PARTS]
+        return cls(tuple(parts), shape=shape, copy=False)
+
+    def _read(self):
+        """
+        Replace the in-memory graph with the one on disk, if it changed since
+        this process last read or wrote it. The caller holds the file lock.
+        """
+        version = self._disk_version()
+        if version is None or version == self._loaded_version:
+            return
+        try:
+            with open(os.path.join(self.path, "index.json")) as f:
+                index = json.load(f)
+            n_members, n_bills = len(index["members"]), len(index["bills"])
+            incidence = self._load_arrays("incidence", (n_members, n_bills), sp.csc_matrix)
+            adjacency = self._load_arrays("adjacency", (n_members, n_members), sp.csr_matrix)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Failed to load cosponsorship graph from {self.path}: {e}")
+            return
+        self.members, self.bill_ids = index["members"], index["bills"]
+        self.built_through = index.get("built_through")
+        self._applied = index.get("applied", {})
+        self.incidence, self.adjacency = incidence, adjacency
+        self._member_index = {m["bioguideId"]: i for i, m in enumerate(self.members)}
+        self._bill_index = {b: j for j, b in enumerate(self.bill_ids)}
+        self._loaded_version = version
+
+    def _load(self):
+        if self._disk_version() is None:
+            return
+        with self._file_lock(shared=True):
+            self._read()
+
+    def _write(self):
+        """
+        Write the arrays and index to uniquely named temp files, then swap them
+        in. The caller holds the exclusive file lock, so readers never mmap
+        parts from different builds.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        staged = []
+        try:
+            for name, matrix in (("incidence", self.incidence), ("adjacency", self.adjacency)):
+                for part in _ARRAY_PARTS:
+                    fd, tmp = tempfile.mkstemp(dir=self.path, prefix=f"{name}.{part}.", suffix=".tmp")
+                    staged.append((tmp, f"{name}.{part}.npy"))
+                    with os.fdopen(fd, "wb") as f:
+                        np.save(f, getattr(matrix, part))
+            fd, tmp = tempfile.mkstemp(dir=self.path, prefix="index.", suffix=".tmp")
+            staged.append((tmp, "index.json"))
+            with os.fdopen(fd, "w") as f:
+                json.dump({"members": self.members, "bills": self.bill_ids, "built_through": self.built_through, "applied": self._applied}, f)
+            # The index goes last; it's what _disk_version watches
+            for tmp, name in staged:
+                os.replace(tmp, os.path.join(self.path, name))
+            self._loaded_version = self._disk_version()
+        finally:
+            for tmp, _ in staged:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+    # --- Updates ---
+
+    def _member_row(self, bioguide_id: str, full_name: Optional[str], party: Optional[str], state: Optional[str]) -> int:
+        row = self._member_index.get(bioguide_id)
+        if row is None:
+            row = self._member_index[bioguide_id] = len(self.members)
+            self.members.append({"bioguideId": bioguide_id, "name": full_name, "party": party, "state": state})
+        elif party:
+            self.members[row]["party"] = party
+        return row
+
+    def sync(self) -> int:
+        """
+        Fold in bills whose cosponsor lists were (re)loaded into the warehouse
+        since the last build. Only the changed bill columns are touched, and A
+        is adjusted by Bn·Bnᵀ - Bo·Boᵀ over just those columns.
+        Returns the number of bills applied.
+
+        Runs under the exclusive file lock on a fresh read of the saved graph,
+        so a save never overwrites bills another process folded in. The query
+        looks back COSPONSOR_SYNC_OVERLAP before the watermark; bills already
+        applied at the same ingested_at are skipped.
+        """
+        with self._lock, self._file_lock():
+            self._read()
+            with SessionLocal() as db:
+                query = db.query(WarehouseBill).filter(WarehouseBill.cosponsors_loaded.is_(True))
+                if self.built_through:
+                    since = datetime.fromisoformat(self.built_through) - timedelta(seconds=COSPONSOR_SYNC_OVERLAP)
+                    query = query.filter(WarehouseBill.ingested_at > since)
+                bills = [
+                    b for b in query.all()
+                    if not (b.ingested_at and self._applied.get(b.bill_id) == b.ingested_at.isoformat())
+                ]
+                if not bills:
+                    self.last_sync = time.time()
+                    return 0
+                cosponsors = (
+                    db.query(WarehouseBillCosponsor)
+                    .filter(
+                        WarehouseBillCosponsor.bill_id.in_([b.bill_id for b in bills]),
+                        WarehouseBillCosponsor.withdrawn_date.is_(None),
+                    )
+                    .all()
+                )
+
+            stamps = [b.ingested_at for b in bills if b.ingested_at]
+            if self.built_through:
+                stamps.append(datetime.fromisoformat(self.built_through))
+            built_through = max(stamps) if stamps else None
+
+            # 1. Resolve rows (members) and columns (bills), growing the index as needed
+            rows, cols = [], []
+            changed_cols = []
+            for offset, bill in enumerate(bills):
+                changed_cols.append(self._bill_index.get(bill.bill_id, -1))
+                if bill.sponsor_bioguide_id:
+                    rows.append(self._member_row(bill.sponsor_bioguide_id, bill.sponsor_name, bill.sponsor_party, bill.sponsor_state))
+                    cols.append(offset)
+            offsets = {bill.bill_id: offset for offset, bill in enumerate(bills)}
+            for c in cosponsors:
+                rows.append(self._member_row(c.bioguide_id, c.full_name, c.party, c.state))
+                cols.append(offsets[c.bill_id])
+
+            new_bills = [b.bill_id for b, col in zip(bills, changed_cols) if col < 0]
+            for bill_id in new_bills:
+                self._bill_index[bill_id] = len(self.bill_ids)
+                self.bill_ids.append(bill_id)
+            target_cols = np.array([self._bill_index[b.bill_id] for b in bills])
+
+            n_members, n_bills = len(self.members), len(self.bill_ids)
+            incidence = self.incidence.copy()
+            incidence.resize((n_members, n_bills))
+            adjacency = self.adjacency.copy()
+            adjacency.resize((n_members, n_members))
+
+            # 2. The changed bills' old and new columns
+            existing = target_cols[np.array(changed_cols) >= 0]
+            old_cols = incidence[:, existing]
+            new_cols = sp.csc_matrix(
+                (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(n_members, len(bills))
+            )
+            new_cols.data[:] = 1  # duplicates (sponsor listed as cosponsor) count once
+
+            # 3. Adjust the adjacency by the difference in co-participation
+            adjacency = (adjacency - old_cols @ old_cols.T + new_cols @ new_cols.T).tocsr()
+            adjacency.eliminate_zeros()
+
+            # 4. Replace the columns: zero the changed ones, then place the new ones
+            keep = np.ones(n_bills, dtype=np.int32)
+            keep[target_cols] = 0
+            placement = sp.csr_matrix(
+                (np.ones(len(bills), dtype=np.int32), (np.arange(len(bills)), target_cols)), shape=(len(bills), n_bills)
+            )
+            incidence = (incidence @ sp.diags(keep, dtype=np.int32) + new_cols @ placement).tocsc()
+            incidence.eliminate_zeros()
+
+            self.incidence, self.adjacency = incidence, adjacency
+            if built_through:
+                applied = dict(self._applied, **{b.bill_id: b.ingested_at.isoformat() for b in bills if b.ingested_at})
+                cutoff = built_through - timedelta(seconds=COSPONSOR_SYNC_OVERLAP)
+                self._applied = {bill_id: at for bill_id, at in applied.items() if datetime.fromisoformat(at) > cutoff}
+                self.built_through = built_through.isoformat()
+            self._write()
+
+        self.last_sync = time.time()
+        return len(bills)
+
+    def ensure_fresh(self):
+        if time.time() - self.last_sync < COSPONSOR_SYNC_INTERVAL:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            self.sync()
+        except Exception as e:
+            print(f"Cosponsorship graph sync failed: {e}")
+            self.last_sync = time.time()
+        finally:
+            self._sync_lock.release()
+
+    # --- Queries ---
+
+    def _row(self, bioguide_id: str) -> int:
+        row = self._member_index.get(bioguide_id)
+        if row is None or row >= self.adjacency.shape[0]:
+            raise KeyError(bioguide_id)
+        return row
+
+    def _party_weights(self, adjacency) -> Dict[str, np.ndarray]:
+        # Collaboration weight each member has with D, R and everyone else, for all members at once
+        parties = np.array([(m.get("party") or "")[:1].upper() for m in self.members[:adjacency.shape[0]]])
+        off_diagonal = adjacency - sp.diags(adjacency.diagonal(), dtype=adjacency.dtype)
+        return {
+            party: np.asarray(off_diagonal @ (parties == party).astype(np.float64)).ravel()
+            for party in ("D", "R")
+        } | {"total": np.asarray(off_diagonal.sum(axis=1)).ravel()}
+
+    def top_collaborators(self, bioguide_id: str, k: int = 10) -> List[Dict[str, Any]]:
+        adjacency = self.adjacency
+        row = self._row(bioguide_id)
+        own_bills = adjacency[row, row]
+        neighbors = adjacency.getrow(row)
+        idx, shared = neighbors.indices, neighbors.data
+        mask = idx != row
+        idx, shared = idx[mask], shared[mask]
+        top = np.argsort(-shared, kind="stable")[:k]
+        return [
+            dict(self.members[idx[i]], sharedBills=int(shared[i]),
+                 shareOfBills=round(float(shared[i] / own_bills), 4) if own_bills else None)
+            for i in top
+        ]
+
+    def bipartisan_score(self, bioguide_id: str) -> Dict[str, Any]:
+        """
+        Share of a member's co-participation weight that is with the other
+        major party, plus their percentile among members of their own party.
+        """
+        adjacency = self.adjacency
+        row = self._row(bioguide_id)
+        weights = self._party_weights(adjacency)
+        party = (self.members[row].get("party") or "")[:1].upper()
+        other = {"D": "R", "R": "D"}.get(party)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(weights["total"] > 0, weights[other] / weights["total"], np.nan) if other else None
+
+        result = {
+            "party": self.members[row].get("party"),
+            "bills": int(adjacency[row, row]),
+            "collaborationWeight": int(weights["total"][row]),
+            "withDemocrats": int(weights["D"][row]),
+            "withRepublicans": int(weights["R"][row]),
+            "bipartisanScore": None,
+            "partyPercentile": None,
+        }
+        if scores is not None and not np.isnan(scores[row]):
+            parties = np.array([(m.get("party") or "")[:1].upper() for m in self.members[:adjacency.shape[0]]])
+            peers = scores[(parties == party) & ~np.isnan(scores)]
+            result["bipartisanScore"] = round(float(scores[row]), 4)
+            result["partyPercentile"] = round(float((peers <= scores[row]).mean()), 4)
+        return result
+
+    def committee_overlap(self, bioguide_id: str, client, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        For the top-k collaborators, the committees they share with the member.
+        Memberships form a small members x committees matrix C, so the overlap
+        counts are a single row of C·Cᵀ.
+        """
+        collaborators = self.top_collaborators(bioguide_id, k)
+        ids = [bioguide_id] + [c["bioguideId"] for c in collaborators]
+
+        def fetch(member_id):
+            try:
+                return client.get_member_committees(member_id)
+            except Exception as e:
+                print(f"Failed to fetch committees for {member_id}: {e}")
+                return []
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            assignments = list(pool.map(fetch, ids))
+
+        columns: Dict[str, int] = {}
+        names: List[str] = []
+        rows, cols = [], []
+        for i, committees in enumerate(assignments):
+            for committee in committees:
+                code = committee.get("systemCode") or committee.get("name")
+                if not code:
+                    continue
+                if code not in columns:
+                    columns[code] = len(names)
+                    names.append(committee.get("name") or code)
+                rows.append(i)
+                cols.append(columns[code])
+
+        memberships = sp.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(ids), len(names)))
+        memberships.data[:] = 1
+        overlap = np.asarray((memberships[0] @ memberships.T).todense()).ravel()
+        own = set(memberships[0].indices)
+
+        return [
+            dict(c, sharedCommitteeCount=int(overlap[i + 1]),
+                 sharedCommittees=[names[j] for j in sorted(own & set(memberships[i + 1].indices))])
+            for i, c in enumerate(collaborators)
+        ]
+
+    def member_summary(self, bioguide_id: str, k: int = 10) -> Dict[str, Any]:
+        row = self._row(bioguide_id)
+        return {
+            "member": self.members[row],
+            "bipartisan": self.bipartisan_score(bioguide_id),
+            "collaborators": self.top_collaborators(bioguide_id, k),
+        }
+
+_graph: Optional[CosponsorshipGraph] = None
+_graph_lock = threading.Lock()
+
+def get_cosponsorship_graph() -> CosponsorshipGraph:
+    global _graph
+    with _graph_lock:
+        if _graph is None:
+            _graph = CosponsorshipGraph()
+        return _graph
@@ -0,0 +1,460 @@
+import os
+import json
+import time
+import tempfile
+import threading
+import numpy as np
+from contextlib import contextmanager
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
+from dotenv import load_dotenv
+from ..cache_service import cache_dir
+
+load_dotenv()
+
+try:
+    import fcntl
+except ImportError:  # no cross-process lock off POSIX; saves are still atomic per file
+    fcntl = None
+
+VOTE_MATRIX_DIR = os.getenv("VOTE_MATRIX_DIR") or os.path.join(cache_dir, "votes")
+# How many of the latest House roll calls a sync looks at, and how often reads trigger one
+VOTE_SYNC_LIMIT = int(os.getenv("VOTE_SYNC_LIMIT", "50"))
+VOTE_SYNC_INTERVAL = int(os.getenv("VOTE_SYNC_INTERVAL", "900"))
+VOTE_SYNC_WORKERS = int(os.getenv("VOTE_SYNC_WORKERS", "4"))
+
+# Cell values. NOT_SEATED means the member has no record for that roll call at all.
+NOT_SEATED = 0
+YEA = 1
+NAY = -1
+PRESENT = 2
+NOT_VOTING = 3
+
+VOTE_CODES = {
+    "yea": YEA, "aye": YEA,
+    "nay": NAY, "no": NAY,
+    "present": PRESENT,
+    "not voting": NOT_VOTING,
+}
+
+def roll_call_key(congress: int, session: int, roll_call: int) -> str:
+    return f"{congress}-{session}-{roll_call}"
+
+def _date_ordinal(value: Optional[str]) -> int:
+    try:
+        return date.fromisoformat(value[:10]).toordinal() if value else 0
+    except ValueError:
+        return 0
+
+class VoteRange:
+    """
+    Selects a subset of roll calls: any of congress, session, an inclusive
+    roll-call number range and an inclusive date range.
+    """
+
+    def __init__(
+        self,
+        congress: Optional[int] = None,
+        session: Optional[int] = None,
+        start_roll: Optional[int] = None,
+        end_roll: Optional[int] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+    ):
+        self.congress = congress
+        self.session = session
+        self.start_roll = start_roll
+        self.end_roll = end_roll
+        self.since = since
+        self.until = until
+
+class VoteMatrix:
+    """
+    House roll-call results as a members x roll-calls int8 matrix. Rows and
+    columns only ever grow; new roll calls are appended as they're synced,
+    and the matrix is persisted as .npy plus a JSON index.
+    """
+
+    def __init__(self, path: str = VOTE_MATRIX_DIR):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._votes = np.zeros((0, 0), dtype=np.int8)
+        self.members: List[Dict[str, Any]] = []
+        self.roll_calls: List[Dict[str, Any]] = []
+        self._member_index: Dict[str, int] = {}
+        self._roll_call_index: Dict[str, int] = {}
+        # Per-column metadata as arrays, for vectorized range masks
+        self._congress = np.zeros(0, dtype=np.int16)
+        self._session = np.zeros(0, dtype=np.int8)
+        self._roll = np.zeros(0, dtype=np.int32)
+        self._day = np.zeros(0, dtype=np.int32)
+        self.last_sync = 0.0
+        self._loaded_version: Optional[Tuple[int, int]] = None
+        self._load()
+
+    # --- Storage ---
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False):
+        """
+        Cross-process lock on the matrix files. Every API worker and the
+        sync-votes CLI may save, and the matrix and index must be swapped as a pair.
+        """
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _disk_version(self) -> Optional[Tuple[int, int]]:
+        # Saves replace the index file, so a new inode or mtime means another writer saved
+        try:
+            st = os.stat(os.path.join(self.path, "index.json"))
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    def _read(self):
+        """
+        Replace the in-memory matrix with the one on disk, if it changed since
+        this process last read or wrote it. The caller holds the file lock.
+        """
+        matrix_path = os.path.join(self.path, "votes.npy")
+        index_path = os.path.join(self.path, "index.json")
+        version = self._disk_version()
+        if version is None or version == self._loaded_version or not os.path.exists(matrix_path):
+            return
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+            votes = np.load(matrix_path)
+        except (OSError, ValueError) as e:
+            print(f"Failed to load vote matrix from {self.path}: {e}")
+            return
+        self._votes = votes
+        self.members = index["members"]
+        self.roll_calls = index["roll_calls"]
+        self._reindex()
+        self._loaded_version = version
+
+    def _load(self):
+        if self._disk_version() is None:
+            return
+        with self._file_lock(shared=True):
+            self._read()
+
+    def _write(self):
+        """
+        Write the matrix and index. The caller holds the exclusive file lock,
+        so the pair is swapped together.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        rows, cols = len(self.members), len(self.roll_calls)
+        # Write to uniquely named temp files and rename so readers never see a
+        # half-written matrix, and concurrent writers never share a temp file
+        matrix_fd, tmp_matrix = tempfile.mkstemp(dir=self.path, prefix="votes.", suffix=".tmp")
+        index_fd, tmp_index = tempfile.mkstemp(dir=self.path, prefix="index.", suffix=".tmp")
+        try:
+            with os.fdopen(matrix_fd, "wb") as f:
+                np.save(f, self._votes[:rows, :cols])
+            with os.fdopen(index_fd, "w") as f:
+                json.dump({"members": self.members, "roll_calls": self.roll_calls}, f)
+            os.replace(tmp_matrix, os.path.join(self.path, "votes.npy"))
+            os.replace(tmp_index, os.path.join(self.path, "index.json"))
+            self._loaded_version = self._disk_version()
+        finally:
+            for tmp in (tmp_matrix, tmp_index):
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+    def _reindex(self):
+        self._member_index = {m["bioguideId"]: i for i, m in enumerate(self.members)}
+        self._roll_call_index = {rc["key"]: j for j, rc in enumerate(self.roll_calls)}
+        self._congress = np.array([rc["congress"] for rc in self.roll_calls], dtype=np.int16)
+        self._session = np.array([rc["session"] for rc in self.roll_calls], dtype=np.int8)
+        self._roll = np.array([rc["rollCall"] for rc in self.roll_calls], dtype=np.int32)
+        self._day = np.array([_date_ordinal(rc.get("date")) for rc in self.roll_calls], dtype=np.int32)
+
+    # --- Updates ---
+
+    def has_roll_call(self, congress: int, session: int, roll_call: int) -> bool:
+        return roll_call_key(congress, session, roll_call) in self._roll_call_index
+
+    def add_roll_calls(self, roll_calls: List[Dict[str, Any]]) -> int:
+        """
+        Append roll calls as returned by get_house_roll_call_member_votes.
+        Already-known roll calls are ignored. Returns how many were added.
+
+        Other workers and the sync-votes CLI save too, so the matrix is
+        re-read under the exclusive file lock and the new columns are merged
+        into that copy before it's written back.
+        """
+        with self._lock, self._file_lock():
+            self._read()
+            new, seen = [], set()
+            for data in roll_calls:
+                key = roll_call_key(data.get("congress"), data.get("sessionNumber"), data.get("rollCallNumber"))
+                if data.get("results") and key not in self._roll_call_index and key not in seen:
+                    seen.add(key)
+                    new.append((key, data))
+            if not new:
+                return 0
+
+            # Register any new members first so the matrix is sized once
+            for _, data in new:
+                for result in data["results"]:
+                    bioguide_id = result.get("bioguideID")
+                    if bioguide_id and bioguide_id not in self._member_index:
+                        self._member_index[bioguide_id] = len(self.members)
+                        self.members.append({
+                            "bioguideId": bioguide_id,
+                            "name": f"{result.get('firstName', '')} {result.get('lastName', '')}".strip(),
+                            "party": result.get("voteParty"),
+                            "state": result.get("voteState"),
+                        })
+
+            rows, cols = len(self.members), len(self.roll_calls) + len(new)
+            votes = np.zeros((rows, cols), dtype=np.int8)
+            old_rows, old_cols = self._votes.shape
+            votes[:old_rows, :old_cols] = self._votes
+
+            for offset, (key, data) in enumerate(new):
+                col = old_cols + offset
+                member_rows, codes = [], []
+                for result in data["results"]:
+                    row = self._member_index.get(result.get("bioguideID"))
+                    if row is None:
+                        continue
+                    member_rows.append(row)
+                    codes.append(VOTE_CODES.get((result.get("voteCast") or "").lower(), NOT_VOTING))
+                    # Keep the party as of the latest roll call appended
+                    self.members[row]["party"] = result.get("voteParty") or self.members[row]["party"]
+                votes[member_rows, col] = codes
+                self.roll_calls.append({
+                    "key": key,
+                    "congress": int(data.get("congress")),
+                    "session": int(data.get("sessionNumber")),
+                    "rollCall": int(data.get("rollCallNumber")),
+                    "date": (data.get("startDate") or "")[:10] or None,
+                    "question": data.get("voteQuestion"),
+                    "result": data.get("result"),
+                    "legislation": " ".join(filter(None, [data.get("legislationType"), str(data.get("legislationNumber") or "")])) or None,
+                })
+
+            self._votes = votes
+            self._reindex()
+            self._write()
+            return len(new)
+
+    def sync(self, client, limit: int = VOTE_SYNC_LIMIT) -> int:
+        """
+        Pull the member votes for any of the latest `limit` House roll calls
+        that aren't in the matrix yet.
+        """
+        # Skip roll calls another process has already synced
+        with self._lock:
+            self._load()
+        recent = client.get_recent_house_votes(limit=limit)
+        missing = [
+            (v.get("congress"), v.get("sessionNumber"), v.get("rollCallNumber"))
+            for v in recent
+            if not self.has_roll_call(v.get("congress"), v.get("sessionNumber"), v.get("rollCallNumber"))
+        ]
+
+        def fetch(args):
+            try:
+                return client.get_house_roll_call_member_votes(*args)
+            except Exception as e:
+                print(f"Failed to fetch member votes for roll call {roll_call_key(*args)}: {e}")
+                return None
+
+        fetched = []
+        if missing:
+            with ThreadPoolExecutor(max_workers=VOTE_SYNC_WORKERS) as pool:
+                fetched = [data for data in pool.map(fetch, missing) if data]
+        added = self.add_roll_calls(fetched)
+        self.last_sync = time.time()
+        return added
+
+    def ensure_fresh(self, client):
+        """
+        Sync if the last one is older than VOTE_SYNC_INTERVAL. Concurrent
+        callers don't queue up behind a sync; they read the current matrix.
+        """
+        if time.time() - self.last_sync < VOTE_SYNC_INTERVAL:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            self.sync(client)
+        except Exception as e:
+            # Serve whatever we already have
+            print(f"Vote matrix sync failed: {e}")
+            self.last_sync = time.time()
+        finally:
+            self._sync_lock.release()
+
+    # --- Queries ---
+
+    def _snapshot(self, vote_range: Optional[VoteRange]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The current matrix and a boolean column mask for the range.
+        """
+        with self._lock:
+            votes, congress, session, roll, day = self._votes, self._congress, self._session, self._roll, self._day
+        mask = np.ones(votes.shape[1], dtype=bool)
+        r = vote_range
+        if r is not None:
+            if r.congress is not None:
+                mask &= congress == r.congress
+            if r.session is not None:
+                mask &= session == r.session
+            if r.start_roll is not None:
+                mask &= roll >= r.start_roll
+            if r.end_roll is not None:
+                mask &= roll <= r.end_roll
+            if r.since is not None:
+                mask &= day >= r.since.toordinal()
+            if r.until is not None:
+                mask &= day <= r.until.toordinal()
+        return votes, mask
+
+    def _rows(self, bioguide_ids: List[str]) -> List[int]:
+        missing = [b for b in bioguide_ids if b not in self._member_index]
+        if missing:
+            raise KeyError(", ".join(missing))
+        return [self._member_index[b] for b in bioguide_ids]
+
+    def agreement(self, bioguide_ids: List[str], vote_range: Optional[VoteRange] = None) -> Dict[str, Any]:
+        """
+        Pairwise share of roll calls where two members cast the same Yea/Nay,
+        out of the roll calls where both cast one.
+        """
+        votes, mask = self._snapshot(vote_range)
+        sub = votes[self._rows(bioguide_ids)][:, mask]
+        yea = (sub == YEA).astype(np.float32)
+        nay = (sub == NAY).astype(np.float32)
+        agree = yea @ yea.T + nay @ nay.T
+        both = (yea + nay) @ (yea + nay).T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = np.where(both > 0, agree / both, np.nan)
+        return {
+            "members": bioguide_ids,
+            "rollCalls": int(mask.sum()),
+            "agreement": [[None if np.isnan(x) else round(float(x), 4) for x in row] for row in rates],
+            "sharedVotes": both.astype(int).tolist(),
+        }
+
+    def closest_members(self, bioguide_id: str, vote_range: Optional[VoteRange] = None, top: int = 5, min_shared: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        The members who vote most and least like `bioguide_id`, computed
+        against every other row in one pass.
+        """
+        votes, mask = self._snapshot(vote_range)
+        row = self._rows([bioguide_id])[0]
+        sub = votes[:, mask]
+        target = sub[row]
+        cast = (sub == YEA) | (sub == NAY)
+        both = cast & ((target == YEA) | (target == NAY))
+        shared = both.sum(axis=1)
+        agree = ((sub == target) & both).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = np.where(shared >= min_shared, agree / shared, np.nan)
+        rates[row] = np.nan
+
+        order = np.argsort(rates)
+        valid = order[~np.isnan(rates[order])]
+
+        def describe(i):
+            return dict(self.members[i], agreement=round(float(rates[i]), 4), sharedVotes=int(shared[i]))
+
+        return {
+            "mostAligned": [describe(i) for i in valid[::-1][:top]],
+            "leastAligned": [describe(i) for i in valid[:top]],
+        }
+
+    def attendance(self, vote_range: Optional[VoteRange] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Per member: share of roll calls they were seated for where they voted (including Present).
+        """
+        votes, mask = self._snapshot(vote_range)
+        sub = votes[:, mask]
+        seated = (sub != NOT_SEATED).sum(axis=1)
+        voted = ((sub != NOT_SEATED) & (sub != NOT_VOTING)).sum(axis=1)
+        return {
+            m["bioguideId"]: {
+                "eligible": int(seated[i]),
+                "voted": int(voted[i]),
+                "attendance": round(float(voted[i] / seated[i]), 4) if seated[i] else None,
+            }
+            for i, m in enumerate(self.members[:sub.shape[0]])
+        }
+
+    def party_unity(self, vote_range: Optional[VoteRange] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        CQ-style party unity: on roll calls where a majority of Democrats opposed
+        a majority of Republicans, how often each member sided with their party.
+        """
+        votes, mask = self._snapshot(vote_range)
+        sub = votes[:, mask]
+        parties = np.array([(m.get("party") or "")[:1].upper() for m in self.members[:sub.shape[0]]])
+        yea, nay = sub == YEA, sub == NAY
+
+        # Each party's majority position per roll call: +1 yea, -1 nay, 0 tied/absent
+        majority = {}
+        for party in ("D", "R"):
+            in_party = parties == party
+            majority[party] = np.sign(yea[in_party].sum(axis=0).astype(np.int32) - nay[in_party].sum(axis=0).astype(np.int32))
+        unity_votes = (majority["D"] != 0) & (majority["R"] != 0) & (majority["D"] != majority["R"])
+
+        # The position each member's party took, row by row (0 for independents)
+        party_position = np.zeros(sub.shape, dtype=np.int8)
+        for party in ("D", "R"):
+            party_position[parties == party] = majority[party]
+
+        cast = (yea | nay) & unity_votes & (party_position != 0)
+        with_party = cast & (sub == party_position)
+        cast_counts, with_counts = cast.sum(axis=1), with_party.sum(axis=1)
+
+        return {
+            "rollCalls": int(mask.sum()),
+            "partyUnityRollCalls": int(unity_votes.sum()),
+            "members": {
+                m["bioguideId"]: {
+                    "party": m.get("party"),
+                    "partyUnityVotes": int(cast_counts[i]),
+                    "withParty": int(with_counts[i]),
+                    "partyUnity": round(float(with_counts[i] / cast_counts[i]), 4) if cast_counts[i] else None,
+                }
+                for i, m in enumerate(self.members[:sub.shape[0]])
+            },
+        }
+
+    def member_summary(self, bioguide_id: str, vote_range: Optional[VoteRange] = None) -> Dict[str, Any]:
+        self._rows([bioguide_id])
+        unity = self.party_unity(vote_range)
+        return {
+            "member": self.members[self._member_index[bioguide_id]],
+            "rollCalls": unity["rollCalls"],
+            "partyUnityRollCalls": unity["partyUnityRollCalls"],
+            "attendance": self.attendance(vote_range)[bioguide_id],
+            "partyUnity": unity["members"][bioguide_id],
+            **self.closest_members(bioguide_id, vote_range),
+        }
+
+_matrix: Optional[VoteMatrix] = None
+_matrix_lock = threading.Lock()
+
+def get_vote_matrix() -> VoteMatrix:
+    global _matrix
+    with _matrix_lock:
+        if _matrix is None:
+            _matrix = VoteMatrix()
+        return _matrix
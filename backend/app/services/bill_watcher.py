@@ -0,0 +1,272 @@
+import os
+import re
+import uuid
+import asyncio
+from typing import Optional, Dict, Any, List, Set, Tuple
+from sqlalchemy import select
+from dotenv import load_dotenv
+from ..database import AsyncSessionLocal, TrackedBill
+from .cache_service import cache
+from .response_cache import invalidate_json_response
+
+load_dotenv()
+
+BILL_WATCH_ENABLED = os.getenv("BILL_WATCH_ENABLED", "true").lower() == "true"
+# Seconds between checks of every tracked bill
+BILL_WATCH_INTERVAL = int(os.getenv("BILL_WATCH_INTERVAL", "900"))
+BILL_WATCH_CONCURRENCY = int(os.getenv("BILL_WATCH_CONCURRENCY", "4"))
+# Seconds between checks of the shared change log, which every worker relays to its own subscribers
+BILL_WATCH_FANOUT_INTERVAL = float(os.getenv("BILL_WATCH_FANOUT_INTERVAL", "5"))
+# Updates buffered per connection before a slow client starts missing them
+SUBSCRIBER_QUEUE_SIZE = 100
+# Changes kept in the shared log for workers that check it late
+EVENT_LOG_SIZE = 500
+
+# Shared cache keys: one poller per cache (the whole fleet with CACHE_BACKEND=redis)
+LEADER_KEY = "bill_watch:leader"
+SIGNATURES_KEY = "bill_watch:signatures"
+EVENTS_KEY = "bill_watch:events"
+
+def _signature(bill: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    latest = bill.get("latestAction") or {}
+    return bill.get("updateDate"), latest.get("actionDate"), latest.get("text")
+
+def bill_status_record(bill_id: str, congress: int, bill_type: str, bill_number: str, bill: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The compact status shape shared by bill_update events and POST /bills/status.
+    """
+    return {
+        "billId": bill_id,
+        "congress": congress,
+        "billType": bill_type,
+        "billNumber": bill_number,
+        "title": bill.get("title"),
+        "latestAction": bill.get("latestAction"),
+        "updateDate": bill.get("updateDate"),
+    }
+
+def invalidate_bill(congress: int, bill_type: str, bill_number: str):
+    """
+    Drop every cached view of a bill so the next dashboard load refetches it.
+    """
+    from .cosint.api_client import CongressAPIClient
+
+    sanitized_type = re.sub(r'[^a-zA-Z]', '', bill_type).lower()
+    # Member dashboards look bills up with the roll call's upper-case type
+    for type_variant in {sanitized_type, sanitized_type.upper()}:
+        cache.delete(CongressAPIClient.get_bill_details.cache_key(congress, type_variant, bill_number))
+    for method in (
+        CongressAPIClient.get_bill_actions,
+        CongressAPIClient.get_bill_cosponsors,
+        CongressAPIClient.get_bill_text,
+        CongressAPIClient.get_bill_text_content,
+    ):
+        cache.delete(method.cache_key(congress, sanitized_type, bill_number))
+    invalidate_json_response(f"dashboard:bill:{congress}:{sanitized_type}:{bill_number}")
+
+class BillWatcher:
+    """
+    Polls the distinct set of tracked bills (so upstream cost scales with
+    bills, not users x bills) and pushes latestAction changes to the users
+    tracking them.
+
+    Every worker runs one, but only the holder of a lease in the shared
+    cache polls. It keeps the last-seen signatures in the cache (so changes
+    made across a restart are still noticed) and appends changes to a
+    shared log. Each worker relays new log entries to its own subscribers.
+    """
+
+    def __init__(self, interval: int = BILL_WATCH_INTERVAL):
+        self.interval = interval
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._token = uuid.uuid4().hex
+        self._last_seq = 0
+
+    # --- Subscriptions ---
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self.subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self.subscribers[user_id]
+
+    # --- Polling ---
+
+    async def tracked_bills(self) -> Dict[str, Tuple[int, str, str]]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(TrackedBill.bill_id, TrackedBill.congress, TrackedBill.bill_type, TrackedBill.bill_number).distinct()
+            )
+            rows = result.all()
+        # Users may have saved the same bill with different type casing
+        return {bill_id: (congress, bill_type, bill_number) for bill_id, congress, bill_type, bill_number in rows if congress and bill_type and bill_number}
+
+    async def poll_once(self, client) -> List[Dict[str, Any]]:
+        """
+        Check every tracked bill once and return (and log) the ones whose
+        latest action changed since the previous poll, by any worker.
+        """
+        bills = await self.tracked_bills()
+        semaphore = asyncio.Semaphore(BILL_WATCH_CONCURRENCY)
+
+        async def check(bill_id: str):
+            congress, bill_type, bill_number = bills[bill_id]
+            async with semaphore:
+                return await asyncio.to_thread(client.get_bill_status, congress, re.sub(r'[^a-zA-Z]', '', bill_type), bill_number)
+
+        bill_ids = list(bills)
+        results = await asyncio.gather(*(check(bill_id) for bill_id in bill_ids), return_exceptions=True)
+
+        signatures: Dict[str, Tuple] = cache.get(SIGNATURES_KEY) or {}
+        changes = []
+        for bill_id, status in zip(bill_ids, results):
+            if isinstance(status, Exception) or not status:
+                if isinstance(status, Exception):
+                    print(f"Bill watcher failed to check {bill_id}: {status}")
+                continue
+            signature = _signature(status)
+            previous = signatures.get(bill_id)
+            signatures[bill_id] = signature
+            # The first sighting is only a baseline
+            if previous is None or previous == signature:
+                continue
+            congress, bill_type, bill_number = bills[bill_id]
+            invalidate_bill(congress, bill_type, bill_number)
+            changes.append(bill_status_record(bill_id, congress, bill_type, bill_number, status))
+
+        # Forget bills nobody tracks any more
+        for bill_id in set(signatures) - set(bills):
+            del signatures[bill_id]
+        cache.set(SIGNATURES_KEY, signatures)
+
+        if changes:
+            self.log_changes(changes)
+        return changes
+
+    # --- Leadership and fan-out ---
+
+    def acquire_lead(self) -> bool:
+        """
+        Take or renew the polling lease. It outlives a few missed polls, so a
+        dead leader is replaced within about three intervals.
+        """
+        ttl = self.interval * 3
+        if cache.add(LEADER_KEY, self._token, expire=ttl):
+            return True
+        if cache.get(LEADER_KEY) == self._token:
+            cache.set(LEADER_KEY, self._token, expire=ttl)
+            return True
+        return False
+
+    def release_lead(self):
+        if cache.get(LEADER_KEY) == self._token:
+            cache.delete(LEADER_KEY)
+
+    def log_changes(self, changes: List[Dict[str, Any]]):
+        # Only the lease holder writes the log, so read-modify-write is safe
+        log = cache.get(EVENTS_KEY) or {"seq": 0, "events": []}
+        seq = log["seq"]
+        events = log["events"]
+        for change in changes:
+            seq += 1
+            events.append((seq, change))
+        cache.set(EVENTS_KEY, {"seq": seq, "events": events[-EVENT_LOG_SIZE:]})
+
+    async def relay(self) -> int:
+        """
+        Publish logged changes this worker hasn't relayed yet. Returns how many.
+        """
+        log = cache.get(EVENTS_KEY)
+        if not log or log["seq"] <= self._last_seq:
+            return 0
+        changes = [change for seq, change in log["events"] if seq > self._last_seq]
+        self._last_seq = log["seq"]
+        if changes:
+            await self.publish(changes)
+        return len(changes)
+
+    async def publish(self, changes: List[Dict[str, Any]]):
+        if not self.subscribers:
+            return
+        by_bill = {change["billId"]: change for change in changes}
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(TrackedBill.user_id, TrackedBill.bill_id).where(
+                    TrackedBill.bill_id.in_(by_bill),
+                    TrackedBill.user_id.in_(list(self.subscribers)),
+                )
+            )
+            rows = result.all()
+        for user_id, bill_id in rows:
+            for queue in list(self.subscribers.get(user_id, ())):
+                try:
+                    queue.put_nowait(by_bill[bill_id])
+                except asyncio.QueueFull:
+                    pass
+
+    async def run(self):
+        from .cosint.api_client import CongressAPIClient
+
+        try:
+            client = CongressAPIClient()
+        except ValueError as e:
+            # Still relay changes found by a worker that has a key
+            print(f"Bill watcher polling disabled: {e}")
+            client = None
+        # Only relay changes logged after this worker started
+        self._last_seq = (cache.get(EVENTS_KEY) or {}).get("seq", 0)
+        tasks = [self._relay_loop()]
+        if client is not None:
+            tasks.append(self._poll_loop(client))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            self.release_lead()
+
+    async def _poll_loop(self, client):
+        while True:
+            try:
+                if self.acquire_lead():
+                    changes = await self.poll_once(client)
+                    if changes:
+                        print(f"Bill watcher: {len(changes)} tracked bills changed")
+            except Exception as e:
+                print(f"Bill watcher poll failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def _relay_loop(self):
+        while True:
+            await asyncio.sleep(BILL_WATCH_FANOUT_INTERVAL)
+            try:
+                await self.relay()
+            except Exception as e:
+                print(f"Bill watcher relay failed: {e}")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+_watcher: Optional[BillWatcher] = None
+
+def get_bill_watcher() -> BillWatcher:
+    global _watcher
+    if _watcher is None:
+        _watcher = BillWatcher()
+    return _watcher
@@ -1,43 +1,165 @@
 import os
+import re
+import asyncio
+import hashlib
+import threading
 import requests
-from typing import Optional, Dict, Any, List
+import httpx
+from typing import Optional, Dict, Any, Tuple
 from dotenv import load_dotenv
+from .tracing import trace_span
+from .cache_service import cache
+from .rate_limit import RateLimiter, retry_after_seconds
 
 load_dotenv()
 
+# Search results go stale quickly, but near-identical queries arrive in bursts
+BRAVE_CACHE_TTL = int(os.getenv("BRAVE_CACHE_TTL", "600"))
+# Requests per second allowed per API key (Brave's free plan allows 1)
+BRAVE_RATE_LIMIT = float(os.getenv("BRAVE_RATE_LIMIT", "1"))
+BRAVE_TIMEOUT = float(os.getenv("BRAVE_TIMEOUT", "10"))
+
+def normalize_query(query: str) -> str:
+    """
+    Cache and dedup key only: "Senator X scandal?" and "  senator x  SCANDAL"
+    share an entry. The query sent to Brave keeps its quotes and case.
+    """
+    query = re.sub(r"\s+", " ", query.lower()).strip()
+    return query.strip(" ?!.,;:\"'")
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def _limiter_for(api_key: str) -> RateLimiter:
+    with _limiters_lock:
+        limiter = _limiters.get(api_key)
+        if limiter is None:
+            limiter = _limiters[api_key] = RateLimiter(BRAVE_RATE_LIMIT)
+        return limiter
+
+# Connection pools, shared by every client instance
+_session = requests.Session()
+_async_client: Optional[Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = None
+_in_flight: Dict[str, "asyncio.Future"] = {}
+
+async def _get_async_client() -> httpx.AsyncClient:
+    """
+    The pooled client for the running loop. A client left by an earlier loop
+    (e.g. a previous asyncio.run) is closed rather than leaked.
+    """
+    global _async_client
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client[0] is not loop:
+        previous = _async_client
+        _async_client = (loop, httpx.AsyncClient(timeout=BRAVE_TIMEOUT, limits=httpx.Limits(max_keepalive_connections=10)))
+        if previous is not None:
+            try:
+                await previous[1].aclose()
+            except Exception as e:
+                # Its connections belong to a loop that may already be closed
+                print(f"Failed to close previous Brave client: {e}")
+    return _async_client[1]
+
+async def close_async_client():
+    """
+    Close the pooled client. Call before the loop that uses it ends (app
+    shutdown, the end of a batch run).
+    """
+    global _async_client
+    if _async_client is not None and _async_client[0] is asyncio.get_running_loop():
+        client = _async_client[1]
+        _async_client = None
+        await client.aclose()
+
 class BraveSearchClient:
     BASE_URL = "https://api.search.brave.com/res/v1/web/search"
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv("BRAVE_SEARCH_API_KEY")
 
-    def search(self, query: str, count: int = 5) -> Dict[str, Any]:
-        """
-        Perform a web search using Brave Search API.
-        """
+    def _check_key(self):
         if not self.api_key or "your_brave_search_api_key" in self.api_key:
             raise ValueError("BRAVE_SEARCH_API_KEY is not set or is a placeholder.")
 
+    def _request(self, query: str, count: int) -> Tuple[Dict[str, str], Dict[str, Any]]:
         headers = {
             "Accept": "application/json",
             "Accept-Encoding": "gzip",
             "X-Subscription-Token": self.api_key
         }
         params = {
-            "q": query,
+            # Only whitespace is collapsed; case, quotes and operators like site: are Brave's to interpret
+            "q": re.sub(r"\s+", " ", query).strip(),
             "count": count
         }
-        
-        response = requests.get(self.BASE_URL, headers=headers, params=params)
-        response.raise_for_status()
-        return response.json()
+        return headers, params
+
+    def _cache_key(self, query: str, count: int) -> str:
+        digest = hashlib.sha256(normalize_query(query).encode()).hexdigest()[:32]
+        return f"brave:v1:{digest}:{count}"
+
+    def search(self, query: str, count: int = 5) -> Dict[str, Any]:
+        """
+        Perform a web search using Brave Search API.
+        """
+        self._check_key()
+        key = self._cache_key(query, count)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        headers, params = self._request(query, count)
+        with trace_span("brave.search", count=count):
+            _limiter_for(self.api_key).wait()
+            response = _session.get(self.BASE_URL, headers=headers, params=params, timeout=BRAVE_TIMEOUT)
+            response.raise_for_status()
+            data = response.json()
+
+        cache.set(key, data, expire=BRAVE_CACHE_TTL)
+        return data
+
+    async def asearch(self, query: str, count: int = 5) -> Dict[str, Any]:
+        """
+        Async search over a pooled connection. Concurrent identical (normalized)
+        queries share one request, and results are cached for BRAVE_CACHE_TTL.
+        """
+        self._check_key()
+        key = self._cache_key(query, count)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        pending = _in_flight.get(key)
+        if pending is None or pending.get_loop() is not asyncio.get_running_loop():
+            pending = asyncio.ensure_future(self._fetch(key, query, count))
+            _in_flight[key] = pending
+            pending.add_done_callback(lambda _: _in_flight.pop(key, None) if _in_flight.get(key) is pending else None)
+        # Shield so one caller being cancelled doesn't cancel the request for the others
+        return await asyncio.shield(pending)
+
+    async def _fetch(self, key: str, query: str, count: int) -> Dict[str, Any]:
+        headers, params = self._request(query, count)
+        with trace_span("brave.search", count=count):
+            limiter = _limiter_for(self.api_key)
+            await asyncio.sleep(limiter.reserve())
+            response = await (await _get_async_client()).get(self.BASE_URL, headers=headers, params=params)
+            if response.status_code == 429:
+                # Another process shares the key; back off once as instructed
+                await asyncio.sleep(retry_after_seconds(response.headers.get("Retry-After")))
+                await asyncio.sleep(limiter.reserve())
+                response = await (await _get_async_client()).get(self.BASE_URL, headers=headers, params=params)
+            response.raise_for_status()
+            data = response.json()
+
+        cache.set(key, data, expire=BRAVE_CACHE_TTL)
+        return data
 
     def format_search_results(self, data: Dict[str, Any]) -> str:
         """
         Format search results into a readable string for the LLM.
         """
         web_results = data.get("web", {}).get("results", [])
-        
+
         if not web_results:
             return "No web search results found."
 
@@ -47,5 +169,5 @@ class BraveSearchClient:
             url = res.get("url", "No URL")
             description = res.get("description", "No Description")
             result += f"\n{i+1}. {title}\n   URL: {url}\n   Summary: {description}\n"
-        
+
         return result
@@ -1,25 +1,269 @@
 import os
+import time
+import pickle
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
 from diskcache import Cache
 from functools import wraps
+from typing import Any, Optional
+from dotenv import load_dotenv
 import json
 import hashlib
 
+load_dotenv()
+
 # Initialize a persistent cache in the project's temporary directory or local app folder
 cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".cache")
-cache = Cache(cache_dir)
+
+# disk (per node), memory (per process) or redis (shared by every node)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND") or "disk"
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL") or "redis://localhost:6379/0"
+# Every key is stored as "<namespace>:<version>:<key>". Bump the version to
+# invalidate the whole fleet's cache at once (e.g. after a payload shape change).
+CACHE_NAMESPACE = os.getenv("CACHE_NAMESPACE") or "cosint"
+CACHE_VERSION = os.getenv("CACHE_VERSION") or "v1"
+MEMORY_CACHE_MAX_ITEMS = int(os.getenv("MEMORY_CACHE_MAX_ITEMS", "10000"))
+
+class CacheBackend(ABC):
+    """
+    The subset of the diskcache interface the app uses.
+    """
+
+    @abstractmethod
+    def get(self, key: str, default: Any = None) -> Any:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        ...
+
+    @abstractmethod
+    def add(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        """
+        Set `key` only if it's absent, atomically. True if this call set it.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def clear(self, prefix: str = "") -> int:
+        ...
+
+class DiskCacheBackend(CacheBackend):
+    def __init__(self, directory: str = cache_dir):
+        self.directory = directory
+        self._store: Optional[Cache] = None
+        self._lock = threading.Lock()
+
+    @property
+    def store(self) -> Cache:
+        # Opened on first use: creating a new cache directory costs a few
+        # hundred ms, which would otherwise land on every fresh instance's import
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    self._store = Cache(self.directory)
+        return self._store
+
+    def get(self, key, default=None):
+        return self.store.get(key, default)
+
+    def set(self, key, value, expire=None):
+        return self.store.set(key, value, expire=expire)
+
+    def add(self, key, value, expire=None):
+        # A single SQLite transaction, so atomic across processes on this node
+        return self.store.add(key, value, expire=expire)
+
+    def delete(self, key):
+        return self.store.delete(key)
+
+    def clear(self, prefix=""):
+        if not prefix:
+            return self.store.clear()
+        stale = [key for key in self.store.iterkeys() if isinstance(key, str) and key.startswith(prefix)]
+        for key in stale:
+            self.store.delete(key)
+        return len(stale)
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Process-local LRU with per-entry expiry. Nothing is shared between
+    workers; meant for development and tests.
+    """
+
+    def __init__(self, max_items: int = MEMORY_CACHE_MAX_ITEMS):
+        self.max_items = max_items
+        self.store: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self.store.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.store[key]
+                return default
+            self.store.move_to_end(key)
+            return value
+
+    def set(self, key, value, expire=None):
+        expires_at = time.monotonic() + expire if expire else None
+        with self._lock:
+            self.store[key] = (value, expires_at)
+            self.store.move_to_end(key)
+            while len(self.store) > self.max_items:
+                self.store.popitem(last=False)
+        return True
+
+    def add(self, key, value, expire=None):
+        expires_at = time.monotonic() + expire if expire else None
+        with self._lock:
+            entry = self.store.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                return False
+            self.store[key] = (value, expires_at)
+            self.store.move_to_end(key)
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            return self.store.pop(key, None) is not None
+
+    def clear(self, prefix=""):
+        with self._lock:
+            stale = [key for key in self.store if key.startswith(prefix)]
+            for key in stale:
+                del self.store[key]
+        return len(stale)
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache over the Redis protocol. Values are pickled, since cached
+    results include tuples and precompressed bytes. A Redis outage degrades
+    to cache misses instead of failing requests.
+    """
+
+    def __init__(self, url: str = CACHE_REDIS_URL, client=None):
+        if client is None:
+            # Imported here so the disk and memory backends don't pay for it at startup
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("CACHE_BACKEND=redis requires the redis package")
+            client = redis.Redis.from_url(url, socket_timeout=2, socket_connect_timeout=2)
+        self.client = client
+
+    def get(self, key, default=None):
+        try:
+            raw = self.client.get(key)
+        except Exception as e:
+            print(f"Cache read failed for {key}: {e}")
+            return default
+        return default if raw is None else pickle.loads(raw)
+
+    def set(self, key, value, expire=None):
+        raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            # PX keeps sub-second precision for short TTLs
+            return bool(self.client.set(key, raw, px=int(expire * 1000) if expire else None))
+        except Exception as e:
+            print(f"Cache write failed for {key}: {e}")
+            return False
+
+    def add(self, key, value, expire=None):
+        raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            # SET NX: atomic across every node sharing the server
+            return bool(self.client.set(key, raw, px=int(expire * 1000) if expire else None, nx=True))
+        except Exception as e:
+            print(f"Cache add failed for {key}: {e}")
+            return False
+
+    def delete(self, key):
+        try:
+            return bool(self.client.delete(key))
+        except Exception as e:
+            print(f"Cache delete failed for {key}: {e}")
+            return False
+
+    def clear(self, prefix=""):
+        # SCAN rather than FLUSHDB: the database may be shared with other apps
+        removed = 0
+        batch = []
+        try:
+            for key in self.client.scan_iter(match=f"{prefix}*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    removed += self.client.delete(*batch)
+                    batch = []
+            if batch:
+                removed += self.client.delete(*batch)
+        except Exception as e:
+            print(f"Cache clear failed for {prefix}*: {e}")
+        return removed
+
+class NamespacedCache:
+    """
+    Prefixes every key with "<namespace>:<version>:" so several apps or
+    deployments can share one backend, and a version bump orphans old entries.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str = CACHE_NAMESPACE, version: str = CACHE_VERSION):
+        self.backend = backend
+        self.prefix = f"{namespace}:{version}:"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.backend.get(self.prefix + key, default)
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        return self.backend.set(self.prefix + key, value, expire=expire)
+
+    def add(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        return self.backend.add(self.prefix + key, value, expire=expire)
+
+    def delete(self, key: str) -> bool:
+        return self.backend.delete(self.prefix + key)
+
+    def clear(self) -> int:
+        """
+        Drop this namespace and version only.
+        """
+        return self.backend.clear(self.prefix)
+
+def create_backend(name: str = CACHE_BACKEND) -> CacheBackend:
+    if name == "memory":
+        return MemoryCacheBackend()
+    if name == "redis":
+        return RedisCacheBackend()
+    if name != "disk":
+        print(f"Unknown CACHE_BACKEND '{name}', using disk")
+    return DiskCacheBackend()
+
+cache = NamespacedCache(create_backend())
+
+def _api_cache_key(func_name, args, kwargs):
+    key_parts = [func_name] + list(args) + [f"{k}:{v}" for k, v in sorted(kwargs.items())]
+    key_str = ":".join(map(str, key_parts))
+    return f"api:{func_name}:{hashlib.md5(key_str.encode()).hexdigest()}"
 
 def api_cache(expire=86400): # Default 24 hours
     """
     Decorator to cache the results of a function based on its arguments.
+    `func.cache_key(*args, **kwargs)` gives the key for a call (without self),
+    for invalidating a single entry.
     """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Create a unique key based on function name and arguments
             # We skip the first arg (self) for class methods
-            key_parts = [func.__name__] + list(args[1:]) + [f"{k}:{v}" for k, v in sorted(kwargs.items())]
-            key_str = ":".join(map(str, key_parts))
-            key = hashlib.md5(key_str.encode()).hexdigest()
+            key = _api_cache_key(func.__name__, args[1:], kwargs)
 
             result = cache.get(key)
             if result is not None:
@@ -27,9 +271,10 @@ def api_cache(expire=86400): # Default 24 hours
 
             # If not in cache, call the function
             result = func(*args, **kwargs)
-            
+
             # Store in cache
             cache.set(key, result, expire=expire)
             return result
+        wrapper.cache_key = lambda *args, **kwargs: _api_cache_key(func.__name__, args, kwargs)
         return wrapper
     return decorator
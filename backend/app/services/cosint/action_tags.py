@@ -0,0 +1,119 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Tags the agent is prompted to append (see the system prompt in agent.py), with their fields in order
+ACTION_TAGS = {
+    "TRACK_BILL": ("congress", "billType", "billNumber", "title"),
+    "RESEARCH_BILL": ("congress", "billType", "billNumber", "title"),
+    "CREATE_PAGE_ACTION": ("name", "bioguideId"),
+}
+
+# Event types sent to the client for each tag
+ACTION_TYPES = {
+    "TRACK_BILL": "track_bill",
+    "RESEARCH_BILL": "research_bill",
+    "CREATE_PAGE_ACTION": "open_member",
+}
+
+# Bracketed text longer than this can't be a tag, so it's released as plain text
+MAX_TAG_LENGTH = 500
+
+# Fields may contain balanced brackets (e.g. a title "A [big] bill"); callers find the closing "]" by depth
+TAG_PATTERN = re.compile(r"\[\s*(" + "|".join(ACTION_TAGS) + r"):(.*)\]", re.DOTALL)
+
+def parse_action_tag(tag: str) -> Optional[Dict[str, Any]]:
+    """
+    The action for one complete "[NAME: a | b | ...]" tag, or None if it isn't a well-formed action tag.
+    """
+    match = TAG_PATTERN.fullmatch(tag)
+    if not match or _closing_bracket(tag, 0) != len(tag) - 1:
+        return None
+    name = match.group(1)
+    fields = ACTION_TAGS[name]
+    # The last field (a title) may itself contain "|"
+    values = [value.strip() for value in match.group(2).split("|", len(fields) - 1)]
+    if len(values) != len(fields) or not all(values):
+        return None
+    action = {"type": ACTION_TYPES[name], **dict(zip(fields, values))}
+    if "congress" in action:
+        if not action["congress"].isdigit():
+            return None
+        action["congress"] = int(action["congress"])
+        action["billId"] = f"{action['congress']}-{action['billType']}-{action['billNumber']}".lower()
+    return action
+
+def _closing_bracket(text: str, start: int) -> int:
+    """
+    Index of the "]" that balances the "[" at `start`, or -1 if it isn't
+    within the text (or within MAX_TAG_LENGTH).
+    """
+    depth = 0
+    for j in range(start, min(len(text), start + MAX_TAG_LENGTH + 1)):
+        if text[j] == "[":
+            depth += 1
+        elif text[j] == "]":
+            depth -= 1
+            if depth == 0:
+                return j
+    return -1
+
+def _could_be_tag(text: str) -> bool:
+    if len(text) > MAX_TAG_LENGTH:
+        return False
+    head = text[1:].lstrip()
+    return any(f"{name}:".startswith(head) or head.startswith(f"{name}:") for name in ACTION_TAGS)
+
+class ActionTagParser:
+    """
+    Incremental parser over the model's token stream. `feed()` returns the
+    text that's safe to display (complete action tags removed) and the
+    actions completed by this chunk. Only a possible tag prefix is held
+    back, so plain text is never delayed by more than one tag's length.
+    """
+
+    def __init__(self):
+        # Raw text, joined once at the end rather than concatenated per token
+        self.chunks: List[str] = []
+        self._held = ""
+
+    def feed(self, text: str) -> Tuple[str, List[Dict[str, Any]]]:
+        self.chunks.append(text)
+        buffer = self._held + text
+        self._held = ""
+        visible: List[str] = []
+        actions: List[Dict[str, Any]] = []
+        i = 0
+        while True:
+            start = buffer.find("[", i)
+            if start < 0:
+                visible.append(buffer[i:])
+                break
+            visible.append(buffer[i:start])
+            end = _closing_bracket(buffer, start)
+            if end < 0:
+                if _could_be_tag(buffer[start:]):
+                    self._held = buffer[start:]
+                    break
+                visible.append("[")
+                i = start + 1
+                continue
+            tag = buffer[start:end + 1]
+            action = parse_action_tag(tag)
+            if action is not None:
+                actions.append(action)
+                i = end + 1
+            else:
+                # Ordinary brackets (links, citations); a nested "[" may still start a tag
+                visible.append("[")
+                i = start + 1
+        return "".join(visible), actions
+
+    def finish(self) -> str:
+        """
+        Release anything still held back (an unterminated tag-like fragment).
+        """
+        held, self._held = self._held, ""
+        return held
+
+    def text(self) -> str:
+        return "".join(self.chunks)
@@ -1,5 +1,5 @@
 import os
-from typing import Type
+from typing import Type, Optional
 from pydantic import BaseModel, Field
 from langchain.tools import BaseTool
 from langchain_openai import ChatOpenAI
@@ -10,6 +10,9 @@ from dotenv import load_dotenv
 from .api_client import CongressAPIClient
 from ..google_civic_client import GoogleCivicClient
 from ..brave_search_client import BraveSearchClient
+from ..warehouse.search import search_bills
+from ..analytics.vote_matrix import get_vote_matrix, VoteRange
+from ..analytics.cosponsorship import get_cosponsorship_graph
 
 load_dotenv()
 
@@ -122,6 +125,59 @@ class MemberVotesTool(BaseTool):
         except Exception as e:
             return f"Error fetching voting records: {str(e)}"
 
+class VotingAnalyticsInput(BaseModel):
+    bioguide_id: str = Field(description="The Bioguide ID of the House representative")
+    compare_with: Optional[str] = Field(default=None, description="Optional Bioguide ID of another representative to compare voting agreement with")
+    congress: Optional[int] = Field(default=None, description="Optionally restrict to one Congress (e.g., 118)")
+
+class VotingAnalyticsTool(BaseTool):
+    name: str = "analyze_member_voting"
+    description: str = "Get a House representative's attendance, party-unity score and most/least aligned colleagues across recorded roll calls, optionally comparing agreement with another member"
+    args_schema: Type[BaseModel] = VotingAnalyticsInput
+    client: CongressAPIClient = Field(default_factory=CongressAPIClient)
+
+    def _run(self, bioguide_id: str, compare_with: Optional[str] = None, congress: Optional[int] = None):
+        try:
+            matrix = get_vote_matrix()
+            matrix.ensure_fresh(self.client)
+            votes = VoteRange(congress=congress)
+            summary = matrix.member_summary(bioguide_id.upper(), votes)
+            if compare_with:
+                pair = matrix.agreement([bioguide_id.upper(), compare_with.upper()], votes)
+                summary["comparison"] = {
+                    "with": compare_with.upper(),
+                    "agreement": pair["agreement"][0][1],
+                    "sharedVotes": pair["sharedVotes"][0][1],
+                }
+            return summary
+        except KeyError as e:
+            return f"No recorded House roll-call votes for: {e.args[0]}"
+        except Exception as e:
+            return f"Error analyzing voting record: {str(e)}"
+
+class CollaboratorsInput(BaseModel):
+    bioguide_id: str = Field(description="The Bioguide ID of the Congress member")
+    include_committees: bool = Field(default=False, description="Also list the committees shared with each collaborator")
+
+class CosponsorshipTool(BaseTool):
+    name: str = "get_member_collaborators"
+    description: str = "Find who a Congress member most often cosponsors legislation with, and how bipartisan their cosponsorship is"
+    args_schema: Type[BaseModel] = CollaboratorsInput
+    client: CongressAPIClient = Field(default_factory=CongressAPIClient)
+
+    def _run(self, bioguide_id: str, include_committees: bool = False):
+        try:
+            graph = get_cosponsorship_graph()
+            graph.ensure_fresh()
+            summary = graph.member_summary(bioguide_id.upper(), k=10)
+            if include_committees:
+                summary["collaborators"] = graph.committee_overlap(bioguide_id.upper(), self.client, k=10)
+            return summary
+        except KeyError as e:
+            return f"No cosponsorship data for: {e.args[0]}"
+        except Exception as e:
+            return f"Error fetching collaborators: {str(e)}"
+
 class CivicInfoInput(BaseModel):
     address: str = Field(description="The full address or city/state to look up representatives for")
 
@@ -133,6 +189,24 @@ class BillSearchInput(BaseModel):
     bill_type: str = Field(description="The type of bill (e.g., 'hr', 's', 'hres')")
     bill_number: str = Field(description="The bill number (e.g., '1')")
 
+class BillTopicSearchInput(BaseModel):
+    query: str = Field(description="Topic keywords to search bill titles and text for (e.g., 'drone privacy')")
+    congress: Optional[int] = Field(default=None, description="Optionally restrict results to one Congress (e.g., 118)")
+
+class BillTopicSearchTool(BaseTool):
+    name: str = "search_bills_by_topic"
+    description: str = "Find bills about a topic by searching a local full-text index of bill titles, summaries and text"
+    args_schema: Type[BaseModel] = BillTopicSearchInput
+
+    def _run(self, query: str, congress: Optional[int] = None):
+        try:
+            results = search_bills(query, congress=congress, limit=10)
+            if results:
+                return results
+            return f"No indexed bills matched: {query}"
+        except Exception as e:
+            return f"Error searching bills: {str(e)}"
+
 class GoogleCivicTool(BaseTool):
     name: str = "get_representatives_by_address"
     description: str = "Find your Congressional district and representatives for a specific address or location"
@@ -142,9 +216,8 @@ class GoogleCivicTool(BaseTool):
 
     def _run(self, address: str):
         try:
-            # 1. Get divisions from Google Civic API
-            division_data = self.civic_client.get_divisions_by_address(address)
-            state, district = self.civic_client.extract_district_info(division_data)
+            # 1. Resolve the district (ZIP table, address cache, then Google Civic API)
+            state, district = self.civic_client.resolve_district(address)
             
             result = f"I found the following for: {address}\n"
             
@@ -189,6 +262,13 @@ class BraveSearchTool(BaseTool):
         except Exception as e:
             return f"Error performing web search: {str(e)}"
 
+    async def _arun(self, query: str):
+        try:
+            data = await self.client.asearch(query)
+            return self.client.format_search_results(data)
+        except Exception as e:
+            return f"Error performing web search: {str(e)}"
+
 class SummarizeBillTool(BaseTool):
     name: str = "summarize_congressional_bill"
     description: str = "Fetch the text of a specific bill and provide a summary. Useful for complex legislation."
@@ -229,7 +309,10 @@ def get_cosint_agent(streaming: bool = False):
         MemberVotesTool(),
         GoogleCivicTool(),
         BraveSearchTool(),
-        SummarizeBillTool()
+        SummarizeBillTool(),
+        BillTopicSearchTool(),
+        VotingAnalyticsTool(),
+        CosponsorshipTool()
     ]
     
     # Define the prompt locally to avoid dependency on LangSmith Hub
@@ -243,6 +326,9 @@ def get_cosint_agent(streaming: bool = False):
                    "- Use 'search_congress_member_by_name' when you have a specific person's name. "
                    "- Use 'get_congress_member_details' to get full info once you have a Bioguide ID. "
                    "- Use 'get_member_recent_votes' to see how a House representative voted on recent bills. "
+                   "- Use 'analyze_member_voting' for attendance, party loyalty, or how often two representatives vote together. "
+                   "- Use 'get_member_collaborators' when asked who a member works with or cosponsors bills with most, or how bipartisan they are. "
+                   "- Use 'search_bills_by_topic' FIRST when a user asks which bills address a subject (e.g., 'bills about drone privacy'); only fall back to 'web_search' if it finds nothing. "
                    "- Use 'summarize_congressional_bill' if a user asks for a summary or explanation of a specific bill (HR 1, etc.). "
                    "- Use 'web_search' ONLY as a fallback if official Congress or Civic data is unavailable, or to look up very recent news/scandals/biographical details not in official records. "
                    "If you cannot find a member, explain why or suggest alternative names. "
@@ -1,18 +1,29 @@
 import os
+import time
 import requests
 from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
 from ..cache_service import api_cache
+from ..tracing import trace_span
+from ..rate_limit import RateLimiter, retry_after_seconds
+from ..warehouse import lookup as warehouse
+from ..warehouse.search import index_bill_in_background
 
 load_dotenv()
 
 class CongressAPIClient:
     BASE_URL = "https://api.congress.gov/v3"
 
-    def __init__(self, api_key: Optional[str] = None):
+    # Congress.gov returns 429 once a key exceeds its hourly quota. Only
+    # throttled bulk jobs wait and retry; interactive requests fail fast
+    MAX_RETRIES = 2
+
+    def __init__(self, api_key: Optional[str] = None, rate_limiter: Optional[RateLimiter] = None):
         self.api_key = api_key or os.getenv("CONGRESS_API_KEY")
         if not self.api_key:
             raise ValueError("CONGRESS_API_KEY not found. Please set it in your environment or .env file.")
+        # Optional throttle for bulk jobs (cache warm-up); interactive requests run unthrottled
+        self.rate_limiter = rate_limiter
 
     def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
@@ -20,9 +31,39 @@ class CongressAPIClient:
         if params:
             default_params.update(params)
         
-        response = requests.get(url, params=default_params)
-        response.raise_for_status()
-        return response.json()
+        retries = self.MAX_RETRIES if self.rate_limiter is not None else 0
+        with trace_span("congress.get", endpoint=endpoint):
+            for attempt in range(retries + 1):
+                if self.rate_limiter is not None:
+                    self.rate_limiter.wait()
+                response = requests.get(url, params=default_params)
+                if response.status_code != 429 or attempt == retries:
+                    break
+                time.sleep(retry_after_seconds(response.headers.get("Retry-After"), default=2.0 ** attempt, cap=60.0))
+            response.raise_for_status()
+            return response.json()
+
+    def get_current_members(self, page_size: int = 250) -> List[Dict[str, Any]]:
+        """
+        Fetch the full current roster (House and Senate), paging past the 250-per-request cap.
+        """
+        members = []
+        offset = 0
+        while True:
+            data = self._get("member", params={"currentMember": "true", "limit": page_size, "offset": offset})
+            page = data.get("members", [])
+            members.extend(page)
+            if len(page) < page_size or not data.get("pagination", {}).get("next"):
+                return members
+            offset += page_size
+
+    def get_recent_bills(self, limit: int = 100, congress: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch the most recently updated bills, optionally within one Congress.
+        """
+        endpoint = f"bill/{congress}" if congress else "bill"
+        data = self._get(endpoint, params={"limit": limit, "sort": "updateDate desc"})
+        return data.get("bills", [])
 
     @api_cache(expire=3600)
     def get_members(self, current_member: bool = True, limit: int = 20, state: Optional[str] = None, district: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -47,6 +88,9 @@ class CongressAPIClient:
         """
         Fetch details for a specific member by their Bioguide ID.
         """
+        local = warehouse.get_member(bioguide_id)
+        if local is not None:
+            return local
         data = self._get(f"member/{bioguide_id}")
         return data.get("member", {})
 
@@ -72,6 +116,19 @@ class CongressAPIClient:
         """
         Fetch details for a specific bill.
         """
+        local = warehouse.get_bill(congress, bill_type, bill_number)
+        if local is not None:
+            return local
+        data = self._get(f"bill/{congress}/{bill_type.lower()}/{bill_number}")
+        bill = data.get("bill", {})
+        if bill.get("title"):
+            index_bill_in_background(congress, bill_type, bill_number, title=bill["title"])
+        return bill
+
+    def get_bill_status(self, congress: int, bill_type: str, bill_number: str) -> Dict[str, Any]:
+        """
+        Uncached bill lookup for change detection (latestAction / updateDate).
+        """
         data = self._get(f"bill/{congress}/{bill_type.lower()}/{bill_number}")
         return data.get("bill", {})
 
@@ -108,8 +165,9 @@ class CongressAPIClient:
             
         try:
             # Note: Congress API URLs often require the API key as a param even for direct text links
-            response = requests.get(target_format["url"], params={"api_key": self.api_key})
-            response.raise_for_status()
+            with trace_span("congress.get_text", url=target_format["url"]):
+                response = requests.get(target_format["url"], params={"api_key": self.api_key})
+                response.raise_for_status()
             
             # Simple cleanup of HTML/XML tags
             import re
@@ -118,6 +176,9 @@ class CongressAPIClient:
             clean_text = re.sub(r'<[^>]+>', ' ', text)
             # Normalize whitespace
             clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+
+            # Make the full text searchable locally before truncating it for the LLM
+            index_bill_in_background(congress, bill_type, bill_number, body=clean_text)
             
             # Truncate if extremely long to avoid LLM token limits (e.g., first 15k chars)
             return clean_text[:15000]
@@ -130,6 +191,9 @@ class CongressAPIClient:
         """
         Fetch actions taken on a specific bill.
         """
+        local = warehouse.get_bill_actions(congress, bill_type, bill_number, limit=limit)
+        if local is not None:
+            return local
         params = {"limit": limit}
         data = self._get(f"bill/{congress}/{bill_type.lower()}/{bill_number}/actions", params=params)
         return data.get("actions", [])
@@ -139,6 +203,9 @@ class CongressAPIClient:
         """
         Fetch cosponsors for a specific bill.
         """
+        local = warehouse.get_bill_cosponsors(congress, bill_type, bill_number)
+        if local is not None:
+            return local
         data = self._get(f"bill/{congress}/{bill_type.lower()}/{bill_number}/cosponsors")
         return data.get("cosponsors", [])
 
@@ -150,14 +217,20 @@ class CongressAPIClient:
         data = self._get("house-vote", params=params)
         return data.get("houseRollCallVotes", [])
 
+    @api_cache(expire=604800)
+    def get_house_roll_call_member_votes(self, congress: int, session: int, roll_call: int) -> Dict[str, Any]:
+        """
+        Fetch every member's vote on a House roll call, along with the roll call's
+        metadata. Recorded votes don't change, so results are cached for a week.
+        """
+        data = self._get(f"house-vote/{congress}/{session}/{roll_call}/members", params={"limit": 500})
+        return data.get("houseRollCallVoteMemberVotes", {})
+
     def get_member_vote_on_roll_call(self, congress: int, session: int, roll_call: int, bioguide_id: str) -> Optional[str]:
         """
         Find how a specific member voted on a specific House roll call.
         """
-        endpoint = f"house-vote/{congress}/{session}/{roll_call}/members"
-        data = self._get(endpoint)
-        
-        member_votes = data.get("houseRollCallVoteMemberVotes", {}).get("results", [])
+        member_votes = self.get_house_roll_call_member_votes(congress, session, roll_call).get("results", [])
         for mv in member_votes:
             if mv.get("bioguideID") == bioguide_id:
                 return mv.get("voteCast")
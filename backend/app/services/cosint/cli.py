@@ -1,8 +1,18 @@
 import sys
+import json
+import time
+import asyncio
+from typing import Optional, Dict, Any, List
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
+from rich.table import Table
+from langchain_core.callbacks import UsageMetadataCallbackHandler
 from .agent import get_cosint_agent
+from ..brave_search_client import close_async_client
+
+# Contextual hint for the agent prompt when there's no page context
+DEFAULT_CONTEXT = "General inquiry mode."
 
 console = Console()
 
@@ -37,7 +47,8 @@ def run_cli():
             with console.status("[bold green]Searching Congress data...[/bold green]"):
                 response = agent_executor.invoke({
                     "input": query,
-                    "chat_history": chat_history
+                    "chat_history": chat_history,
+                    "context": DEFAULT_CONTEXT,
                 })
             
             console.print("\n[bold green]COSINT Response:[/bold green]")
@@ -57,5 +68,124 @@ def run_cli():
         except Exception as e:
             console.print(f"[bold red]An error occurred:[/bold red] {e}")
 
+# --- Batch mode ---
+
+def load_questions(path: str) -> List[Dict[str, Any]]:
+    """
+    Read questions from JSONL ({"question": ..., "id"?: ..., "context"?: ...})
+    or plain text (one question per line). Blank lines are skipped.
+    """
+    questions = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                if not record.get("question"):
+                    raise ValueError(f"{path}:{line_number}: missing 'question'")
+            else:
+                record = {"question": line}
+            record.setdefault("id", len(questions) + 1)
+            questions.append(record)
+    return questions
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+async def _answer(agent_executor, record: Dict[str, Any]) -> Dict[str, Any]:
+    usage = UsageMetadataCallbackHandler()
+    started = time.perf_counter()
+    result = {"id": record["id"], "question": record["question"]}
+    try:
+        response = await agent_executor.ainvoke(
+            {
+                "input": record["question"],
+                "chat_history": [],
+                "context": record.get("context") or DEFAULT_CONTEXT,
+            },
+            config={"callbacks": [usage]},
+        )
+        result["answer"] = response["output"]
+        result["tool_calls"] = [
+            {"tool": action.tool, "input": action.tool_input}
+            for action, _ in response.get("intermediate_steps", [])
+        ]
+        result["error"] = None
+    except Exception as e:
+        result["answer"] = None
+        result["tool_calls"] = []
+        result["error"] = str(e)
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    # Summed across models (the agent only uses one, but be safe)
+    result["tokens"] = {
+        key: sum(model_usage.get(key, 0) for model_usage in usage.usage_metadata.values())
+        for key in ("input_tokens", "output_tokens", "total_tokens")
+    }
+    return result
+
+async def _run_batch(questions: List[Dict[str, Any]], output, workers: int, log: Console) -> List[Dict[str, Any]]:
+    agent_executor = get_cosint_agent()
+    agent_executor.return_intermediate_steps = True
+    semaphore = asyncio.Semaphore(workers)
+
+    async def run(record):
+        async with semaphore:
+            return await _answer(agent_executor, record)
+
+    results = []
+    try:
+        # Results are written as they finish, so a long run can be tailed or resumed from
+        for finished in asyncio.as_completed([run(record) for record in questions]):
+            result = await finished
+            results.append(result)
+            output.write(json.dumps(result, default=str) + "\n")
+            output.flush()
+            status = "[red]error[/red]" if result["error"] else "[green]ok[/green]"
+            log.print(f"[{len(results)}/{len(questions)}] {status} {result['latency_ms']:.0f} ms  {result['question'][:60]}")
+    finally:
+        # The pooled search client is bound to this run's event loop
+        await close_async_client()
+    return results
+
+def run_batch(input_path: str, output_path: Optional[str] = None, workers: int = 4):
+    """
+    Answer every question in `input_path` concurrently and write one JSON
+    result per line (answer, latency, tool calls, token usage).
+    """
+    questions = load_questions(input_path)
+    if not questions:
+        console.print("[yellow]No questions found.[/yellow]")
+        return
+
+    # Keep stdout clean for the JSONL when no output file is given
+    log = Console(stderr=output_path is None)
+    started = time.perf_counter()
+    output = open(output_path, "w") if output_path else sys.stdout
+    try:
+        results = asyncio.run(_run_batch(questions, output, max(workers, 1), log))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - started
+
+    latencies = [r["latency_ms"] for r in results if not r["error"]]
+    total_tokens = sum(r["tokens"]["total_tokens"] for r in results)
+    tool_calls = sum(len(r["tool_calls"]) for r in results)
+
+    summary = Table(title="Batch summary", show_header=False)
+    summary.add_row("Queries", f"{len(results)} ({sum(1 for r in results if r['error'])} failed)")
+    summary.add_row("Workers", str(workers))
+    summary.add_row("Wall time", f"{elapsed:.1f} s")
+    summary.add_row("Throughput", f"{len(results) / elapsed:.2f} queries/s")
+    summary.add_row("Latency p50 / p95", f"{_percentile(latencies, 50):.0f} / {_percentile(latencies, 95):.0f} ms")
+    summary.add_row("Tool calls", f"{tool_calls} ({tool_calls / len(results):.1f} per query)")
+    summary.add_row("Tokens", f"{total_tokens} ({total_tokens / elapsed:.0f}/s)")
+    log.print(summary)
+
 if __name__ == "__main__":
     run_cli()
@@ -0,0 +1,48 @@
+import os
+import asyncio
+import importlib
+import threading
+from types import ModuleType
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Import the LangChain/OpenAI stack in the background once the app is up,
+# so the first chat doesn't pay for it. Readiness never waits on this.
+AGENT_PRELOAD = os.getenv("AGENT_PRELOAD", "true").lower() == "true"
+
+_AGENT_MODULE = f"{__package__}.agent"
+# Set once the import has finished (sys.modules also holds half-imported modules)
+_loaded = threading.Event()
+
+def agent_loaded() -> bool:
+    return _loaded.is_set()
+
+def load_agent() -> ModuleType:
+    """
+    The agent module (LangChain, langchain_openai, the OpenAI SDK), imported
+    on first use. Concurrent callers share the import lock.
+    """
+    module = importlib.import_module(_AGENT_MODULE)
+    _loaded.set()
+    return module
+
+async def aload_agent() -> ModuleType:
+    """
+    `load_agent()` without blocking the event loop on the first import.
+    """
+    if agent_loaded():
+        return load_agent()
+    return await asyncio.to_thread(load_agent)
+
+def preload_agent():
+    if agent_loaded():
+        return
+
+    def run():
+        try:
+            load_agent()
+        except Exception as e:
+            print(f"Agent preload failed: {e}")
+
+    threading.Thread(target=run, name="agent-preload", daemon=True).start()
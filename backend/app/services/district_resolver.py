@@ -0,0 +1,192 @@
+import os
+import re
+import csv
+import json
+import math
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+try:
+    from shapely import affinity
+    from shapely.geometry import shape, Point
+    from shapely.strtree import STRtree
+except ImportError:  # offline resolution is disabled without shapely
+    affinity = shape = Point = STRtree = None
+
+try:
+    import shapefile  # pyshp, only needed for .shp boundaries
+except ImportError:
+    shapefile = None
+
+# Congressional district polygons (GeoJSON FeatureCollection or .shp, e.g. Census cb_*_cd*)
+DISTRICT_BOUNDARIES_FILE = os.getenv("DISTRICT_BOUNDARIES_FILE")
+# ZIP centroids: zip,lat,lon[,aland] or the Census ZCTA gazetteer (GEOID, INTPTLAT, INTPTLONG, ALAND)
+ZIP_CENTROID_FILE = os.getenv("ZIP_CENTROID_FILE")
+# Radius assumed for a ZIP when the centroid file has no land area
+ZIP_DEFAULT_RADIUS_KM = float(os.getenv("ZIP_DEFAULT_RADIUS_KM", "3"))
+
+STATE_FIPS = {
+    "01": "AL", "02": "AK", "04": "AZ", "05": "AR", "06": "CA", "08": "CO", "09": "CT", "10": "DE",
+    "11": "DC", "12": "FL", "13": "GA", "15": "HI", "16": "ID", "17": "IL", "18": "IN", "19": "IA",
+    "20": "KS", "21": "KY", "22": "LA", "23": "ME", "24": "MD", "25": "MA", "26": "MI", "27": "MN",
+    "28": "MS", "29": "MO", "30": "MT", "31": "NE", "32": "NV", "33": "NH", "34": "NJ", "35": "NM",
+    "36": "NY", "37": "NC", "38": "ND", "39": "OH", "40": "OK", "41": "OR", "42": "PA", "44": "RI",
+    "45": "SC", "46": "SD", "47": "TN", "48": "TX", "49": "UT", "50": "VT", "51": "VA", "53": "WA",
+    "54": "WV", "55": "WI", "56": "WY", "60": "AS", "66": "GU", "69": "MP", "72": "PR", "78": "VI",
+}
+
+KM_PER_DEGREE = 111.32
+
+COORDINATES = re.compile(r"^\s*(-?\d{1,2}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)\s*$")
+
+def _district_from_properties(props: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+    """
+    Read (state, district) from common boundary file schemas: Census
+    (STATEFP + CD118FP / GEOID), or plain state/district properties.
+    """
+    lowered = {k.lower(): v for k, v in props.items()}
+    state = lowered.get("state") or lowered.get("stusps") or lowered.get("state_abbr")
+    if not state and lowered.get("statefp"):
+        state = STATE_FIPS.get(str(lowered["statefp"]).zfill(2))
+
+    district = lowered.get("district")
+    if district is None:
+        cd_key = next((k for k in lowered if re.fullmatch(r"cd\d*fp", k)), None)
+        district = lowered.get(cd_key) if cd_key else None
+    if district is None and lowered.get("geoid") and len(str(lowered["geoid"])) == 4:
+        geoid = str(lowered["geoid"])
+        state = state or STATE_FIPS.get(geoid[:2])
+        district = geoid[2:]
+
+    if not state or district is None:
+        return None
+    district = str(district).strip()
+    if not district.isdigit():
+        return None  # "ZZ": water/undefined areas
+    number = int(district)
+    # Census codes at-large seats as 00 (and 98 for non-voting delegates)
+    return str(state).upper(), 0 if number in (0, 98) else number
+
+class DistrictResolver:
+    """
+    Offline (lat, lon) -> (state, district) via an STR-tree over district
+    polygons, with ZIP centroids as a coarse geocoder in front of it.
+    """
+
+    def __init__(self, boundaries_file: Optional[str] = DISTRICT_BOUNDARIES_FILE, centroid_file: Optional[str] = ZIP_CENTROID_FILE):
+        self.districts: List[Tuple[str, int]] = []
+        self.tree = None
+        self.centroids: Dict[str, Tuple[float, float, float]] = {}
+        if STRtree is None or not boundaries_file:
+            return
+        try:
+            self._load_boundaries(boundaries_file)
+            if centroid_file:
+                self._load_centroids(centroid_file)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Offline district resolver disabled: {e}")
+            self.tree = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.tree is not None
+
+    def _features(self, path: str):
+        if path.lower().endswith(".shp"):
+            if shapefile is None:
+                raise ValueError("pyshp is required to read .shp boundary files")
+            reader = shapefile.Reader(path)
+            for record in reader.iterShapeRecords():
+                yield record.shape.__geo_interface__, record.record.as_dict()
+            return
+        with open(path) as f:
+            data = json.load(f)
+        for feature in data.get("features", []):
+            yield feature.get("geometry"), feature.get("properties") or {}
+
+    def _load_boundaries(self, path: str):
+        geometries = []
+        for geometry, props in self._features(path):
+            district = _district_from_properties(props)
+            if geometry is None or district is None:
+                continue
+            geometries.append(shape(geometry))
+            self.districts.append(district)
+        if not geometries:
+            raise ValueError(f"no usable district polygons in {path}")
+        self.tree = STRtree(geometries)
+
+    def _load_centroids(self, path: str):
+        with open(path, newline="") as f:
+            sample = f.readline()
+            f.seek(0)
+            # The Census gazetteer is tab-delimited with padded headers
+            reader = csv.DictReader(f, delimiter="\t" if "\t" in sample else ",")
+            for row in reader:
+                row = {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+                zip_code = row.get("zip") or row.get("geoid") or row.get("zcta")
+                lat = row.get("lat") or row.get("intptlat")
+                lon = row.get("lon") or row.get("lng") or row.get("intptlong")
+                if not (zip_code and lat and lon):
+                    continue
+                aland = row.get("aland")
+                radius_km = math.sqrt(float(aland) / math.pi) / 1000 if aland else ZIP_DEFAULT_RADIUS_KM
+                self.centroids[zip_code.zfill(5)] = (float(lat), float(lon), radius_km)
+
+    def districts_at(self, lat: float, lon: float, radius_km: float = 0.0) -> List[Tuple[str, int]]:
+        """
+        Every district touching the point, or the disc of `radius_km` around it.
+        """
+        if not self.enabled:
+            return []
+        geometry = Point(lon, lat)
+        if radius_km > 0:
+            # Approximate the disc in degrees; longitude degrees shrink with latitude
+            lat_deg = radius_km / KM_PER_DEGREE
+            lon_deg = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+            geometry = geometry.buffer(1.0, quad_segs=8)
+            geometry = affinity.scale(geometry, xfact=lon_deg, yfact=lat_deg, origin=(lon, lat))
+        hits = self.tree.query(geometry, predicate="intersects")
+        return sorted({self.districts[i] for i in hits})
+
+    def resolve_point(self, lat: float, lon: float) -> Optional[Tuple[str, int]]:
+        districts = self.districts_at(lat, lon)
+        return districts[0] if len(districts) == 1 else None
+
+    def resolve_zip(self, zip_code: Optional[str]) -> Optional[Tuple[str, int]]:
+        """
+        The district for a ZIP whose whole (approximate) area falls in one
+        district. ZIPs straddling a boundary are ambiguous and return None.
+        """
+        centroid = self.centroids.get(zip_code) if zip_code else None
+        if centroid is None:
+            return None
+        lat, lon, radius_km = centroid
+        districts = self.districts_at(lat, lon, radius_km)
+        return districts[0] if len(districts) == 1 else None
+
+    def resolve(self, address: str, zip_code: Optional[str]) -> Optional[Tuple[str, int]]:
+        """
+        Resolve "lat,lon" input exactly, otherwise fall back to the ZIP centroid.
+        None means the caller should ask the Civic API.
+        """
+        if not self.enabled:
+            return None
+        coordinates = COORDINATES.match(address)
+        if coordinates:
+            return self.resolve_point(float(coordinates.group(1)), float(coordinates.group(2)))
+        return self.resolve_zip(zip_code)
+
+_resolver: Optional[DistrictResolver] = None
+_resolver_lock = threading.Lock()
+
+def get_district_resolver() -> DistrictResolver:
+    # Boundary files are large; load them once, on first use
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = DistrictResolver()
+        return _resolver
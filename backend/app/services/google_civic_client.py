@@ -3,9 +3,16 @@ import requests
 import re
 from typing import Optional, Dict, Any, List, Tuple
 from dotenv import load_dotenv
+from .tracing import trace_span
+from .cache_service import cache
+from .address import normalize_address, extract_zip, district_for_zip
+from .district_resolver import get_district_resolver
 
 load_dotenv()
 
+# Districts only change with redistricting, so resolved addresses are kept for a long time
+ADDRESS_CACHE_TTL = int(os.getenv("ADDRESS_CACHE_TTL", str(30 * 86400)))
+
 class GoogleCivicClient:
     BASE_URL = "https://www.googleapis.com/civicinfo/v2"
 
@@ -26,9 +33,49 @@ class GoogleCivicClient:
             "address": address
         }
         
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        with trace_span("civic.divisions_by_address"):
+            response = requests.get(url, params=params)
+            response.raise_for_status()
+            return response.json()
+
+    def resolve_district(self, address: str) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Resolve an address to (state, district) as cheaply as possible:
+        a ZIP that lies in a single district, the normalized-address cache,
+        the offline boundary resolver, and only then the Civic API.
+        """
+        with trace_span("civic.resolve_district") as span:
+            zip_code = extract_zip(address)
+
+            # 1. ZIP fast path
+            by_zip = district_for_zip(zip_code)
+            if by_zip:
+                if span:
+                    span.set_attribute("source", "zip")
+                return by_zip
+
+            # 2. Previously resolved (under any spelling that normalizes the same)
+            key = f"civic:district:v1:{normalize_address(address)}"
+            cached = cache.get(key)
+            if cached is not None:
+                if span:
+                    span.set_attribute("source", "cache")
+                return cached
+
+            # 3. Offline point-in-polygon (coordinates or an unambiguous ZIP centroid)
+            offline = get_district_resolver().resolve(address, zip_code)
+            if offline:
+                if span:
+                    span.set_attribute("source", "offline")
+                return offline
+
+            # 4. Civic API, only when local resolution is missing or ambiguous
+            if span:
+                span.set_attribute("source", "api")
+            state, district = self.extract_district_info(self.get_divisions_by_address(address))
+            if state and district is not None:
+                cache.set(key, (state, district), expire=ADDRESS_CACHE_TTL)
+            return state, district
 
     def extract_district_info(self, data: Dict[str, Any]) -> Tuple[Optional[str], Optional[int]]:
         """
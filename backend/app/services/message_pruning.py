@@ -0,0 +1,98 @@
+import os
+import gzip
+import json
+import uuid
+import asyncio
+import threading
+from datetime import datetime
+from typing import Optional, List
+from sqlalchemy import select, delete, and_, or_
+from dotenv import load_dotenv
+from ..database import AsyncSessionLocal, Message
+
+load_dotenv()
+
+# How many of the newest messages to keep per conversation type (0 keeps everything)
+HISTORY_LIMIT_GENERAL = int(os.getenv("CHAT_HISTORY_LIMIT", "10"))
+HISTORY_LIMIT_MEMBER = int(os.getenv("CHAT_HISTORY_LIMIT_MEMBER", str(HISTORY_LIMIT_GENERAL)))
+
+# When set, pruned rows are appended to gzipped JSONL files here instead of being discarded
+MESSAGE_ARCHIVE_DIR = os.getenv("MESSAGE_ARCHIVE_DIR")
+
+_archive_lock = threading.Lock()
+
+def history_limit(bioguide_id: Optional[str]) -> int:
+    """
+    Member briefings and general inquiries can retain different amounts of history.
+    """
+    return HISTORY_LIMIT_MEMBER if bioguide_id else HISTORY_LIMIT_GENERAL
+
+async def prune_conversation(conversation_id: uuid.UUID, limit: int) -> int:
+    """
+    Delete everything older than the newest `limit` messages in one statement.
+    The (created_at, id) of the limit-th newest row is used as the keyset
+    boundary, so no message rows are loaded into the session.
+    """
+    if limit <= 0:
+        return 0
+
+    try:
+        async with AsyncSessionLocal() as db:
+            boundary = (await db.execute(
+                select(Message.created_at, Message.id)
+                .where(Message.conversation_id == conversation_id)
+                .order_by(Message.created_at.desc(), Message.id.desc())
+                .offset(limit - 1)
+                .limit(1)
+            )).first()
+            if boundary is None:
+                return 0
+
+            created_at, message_id = boundary
+            stmt = delete(Message).where(
+                Message.conversation_id == conversation_id,
+                or_(
+                    Message.created_at < created_at,
+                    and_(Message.created_at == created_at, Message.id < message_id),
+                ),
+            ).execution_options(synchronize_session=False)
+
+            if MESSAGE_ARCHIVE_DIR:
+                result = await db.execute(stmt.returning(Message.id, Message.role, Message.content, Message.created_at))
+                pruned = result.all()
+                # Commit the delete only once the rows are safely archived
+                if pruned:
+                    try:
+                        await asyncio.to_thread(_archive, conversation_id, pruned)
+                    except Exception:
+                        await db.rollback()
+                        raise
+                await db.commit()
+                return len(pruned)
+
+            result = await db.execute(stmt)
+            await db.commit()
+            return result.rowcount
+    except Exception as e:
+        print(f"Chat pruning failed: {e}")
+        return 0
+
+def _archive(conversation_id: uuid.UUID, rows: List) -> None:
+    """
+    Append pruned messages to a per-day gzip file (gzip members concatenate,
+    so appending keeps each file a valid stream).
+    """
+    os.makedirs(MESSAGE_ARCHIVE_DIR, exist_ok=True)
+    path = os.path.join(MESSAGE_ARCHIVE_DIR, f"messages-{datetime.utcnow():%Y%m%d}.jsonl.gz")
+    lines = "".join(
+        json.dumps({
+            "id": str(message_id),
+            "conversation_id": str(conversation_id),
+            "role": role,
+            "content": content,
+            "created_at": created_at.isoformat() if created_at else None,
+        }) + "\n"
+        for message_id, role, content, created_at in rows
+    )
+    with _archive_lock, gzip.open(path, "at", encoding="utf-8") as f:
+        f.write(lines)
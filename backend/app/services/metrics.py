@@ -0,0 +1,58 @@
+import threading
+from typing import Dict, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class Metrics:
+    """
+    Process-local counters and gauges, rendered in the Prometheus text format
+    by GET /metrics. Each worker process reports its own values.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Dict[LabelKey, float]] = {}
+        self._types: Dict[str, str] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, kind: str, help_text: str):
+        self._types[name] = kind
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values.setdefault(name, {})[key] = value
+
+    def get(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted(set(self._types) | set(self._values)):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {self._types.get(name, 'untyped')}")
+                for key, value in sorted(self._values.get(name, {}).items()):
+                    labels = ",".join(f'{k}="{v}"' for k, v in key)
+                    lines.append(f"{name}{{{labels}}} {value:g}" if labels else f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+metrics.describe("chat_streams_started_total", "counter", "Chat responses started")
+metrics.describe("chat_streams_completed_total", "counter", "Chat responses streamed to the end")
+metrics.describe("chat_streams_cancelled_total", "counter", "Chat responses abandoned because the client disconnected")
+metrics.describe("chat_streams_failed_total", "counter", "Chat responses that ended in an error")
+metrics.describe("chat_streams_active", "gauge", "Chat responses currently being generated")
+metrics.describe("chat_partial_responses_saved_total", "counter", "Interrupted responses persisted with their partial text")
+metrics.describe("app_import_seconds", "gauge", "Time to import the API app")
+metrics.describe("app_startup_seconds", "gauge", "Time from app import to the end of startup hooks")
@@ -0,0 +1,40 @@
+import time
+import threading
+from typing import Optional
+
+class RateLimiter:
+    """
+    Token bucket shared by threads and coroutines. `reserve()` claims the
+    next slot and returns how long the caller must wait for it.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.granted = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            self.granted += 1
+            if self.rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def wait(self):
+        time.sleep(self.reserve())
+
+def retry_after_seconds(value: Optional[str], default: float = 1.0, cap: float = 10.0) -> float:
+    """
+    Seconds to wait from a 429's Retry-After header (HTTP dates fall back to the default).
+    """
+    try:
+        return min(max(float(value), 0.0), cap)
+    except (TypeError, ValueError):
+        return default
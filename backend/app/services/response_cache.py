@@ -0,0 +1,126 @@
+import os
+import time
+import gzip
+import asyncio
+import hashlib
+import orjson
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+from fastapi import Request, Response
+from dotenv import load_dotenv
+from .cache_service import cache
+
+load_dotenv()
+
+try:
+    import brotli
+except ImportError:  # gzip-only when brotli isn't installed
+    brotli = None
+
+DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", "3600"))
+# How long browsers may reuse a dashboard before revalidating with If-None-Match
+DASHBOARD_BROWSER_MAX_AGE = int(os.getenv("DASHBOARD_BROWSER_MAX_AGE", "60"))
+
+# Bump when the shape of a cached payload changes
+PAYLOAD_VERSION = "v1"
+
+# Bodies smaller than this aren't worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+# One in-flight build per key; dropped once it's done, after the entry is cached
+_builds: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+def encode_payload(payload: Any) -> Dict[str, Any]:
+    """
+    Serialize a payload once and precompress it, so cache hits only pick a
+    representation instead of re-encoding the dashboard.
+    """
+    body = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    entry = {
+        "etag": hashlib.sha256(body).hexdigest()[:32],
+        "identity": body,
+        "gzip": None,
+        "br": None,
+    }
+    if len(body) >= MIN_COMPRESS_SIZE:
+        entry["gzip"] = gzip.compress(body, compresslevel=6)
+        if brotli is not None:
+            entry["br"] = brotli.compress(body, quality=5)
+    return entry
+
+def _choose_encoding(entry: Dict[str, Any], accept_encoding: str) -> str:
+    accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+    if entry["br"] is not None and "br" in accepted:
+        return "br"
+    if entry["gzip"] is not None and "gzip" in accepted:
+        return "gzip"
+    return "identity"
+
+def _etag_matches(if_none_match: str, base_etag: str) -> bool:
+    # Compare on the payload hash, ignoring the per-encoding suffix and weak prefix
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag.removeprefix("W/").strip('"')
+        if tag.split("-", 1)[0] == base_etag:
+            return True
+    return False
+
+def invalidate_json_response(key: str):
+    """
+    Drop a shared payload so the next request rebuilds it.
+    """
+    cache.delete(f"response:{PAYLOAD_VERSION}:{key}")
+
+async def _build_entry(cache_key: str, build: Callable[[], Awaitable[Any]], ttl: Union[int, Callable[[Any], int]]) -> Dict[str, Any]:
+    payload = await build()
+    expire = ttl(payload) if callable(ttl) else ttl
+    entry = encode_payload(payload)
+    entry["expires_at"] = time.time() + expire
+    cache.set(cache_key, entry, expire=expire)
+    return entry
+
+async def cached_json_response(
+    request: Request,
+    key: str,
+    build: Callable[[], Awaitable[Any]],
+    ttl: Union[int, Callable[[Any], int]] = DASHBOARD_CACHE_TTL,
+    max_age: int = DASHBOARD_BROWSER_MAX_AGE,
+) -> Response:
+    """
+    Serve a shared JSON payload from the cache, building it at most once per
+    key at a time. Responses carry a strong ETag and Cache-Control so
+    browsers and CDNs can revalidate with 304s.
+    """
+    cache_key = f"response:{PAYLOAD_VERSION}:{key}"
+    entry = cache.get(cache_key)
+
+    if entry is None:
+        task = _builds.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(_build_entry(cache_key, build, ttl))
+            _builds[cache_key] = task
+            # Also on a failed build, so the next request tries again
+            task.add_done_callback(lambda _: _builds.pop(cache_key, None))
+        # A client disconnecting mustn't cancel the build the others are waiting on
+        entry = await asyncio.shield(task)
+
+    # Shared caches keep the payload no longer than we do (e.g. AI_RETRY_TTL entries)
+    expires_at = entry.get("expires_at")
+    s_maxage = max(int(expires_at - time.time()), 0) if expires_at is not None else DASHBOARD_CACHE_TTL
+
+    encoding = _choose_encoding(entry, request.headers.get("accept-encoding", ""))
+    etag = entry["etag"] if encoding == "identity" else f"{entry['etag']}-{encoding}"
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": f"public, max-age={max_age}, s-maxage={s_maxage}, stale-while-revalidate={max_age}",
+        "Vary": "Accept-Encoding",
+    }
+
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=entry[encoding], media_type="application/json", headers=headers)
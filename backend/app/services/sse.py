@@ -0,0 +1,131 @@
+import os
+import json
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Comment lines sent on idle streams so proxies don't time out long tool calls
+SSE_HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", "15"))
+# Tokens are batched until the oldest has waited this long or the batch is this big
+SSE_COALESCE_MS = float(os.getenv("SSE_COALESCE_MS", "50"))
+SSE_COALESCE_CHARS = int(os.getenv("SSE_COALESCE_CHARS", "512"))
+# How often to check whether the client is still there
+SSE_DISCONNECT_POLL_INTERVAL = 1.0
+
+HEARTBEAT = ": keep-alive\n\n"
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+_END = object()
+
+def format_event(event: str, data: Any) -> str:
+    """
+    One SSE frame. JSON never contains a raw newline, so a single data line suffices.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+class EventChannel:
+    """
+    Producer side of an event stream. Tokens are coalesced by the consumer;
+    every other event is sent as-is, in order.
+    """
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def token(self, text: str):
+        if text:
+            self.queue.put_nowait(("token", text))
+
+    def send(self, event: str, data: Any):
+        self.queue.put_nowait((event, data))
+
+async def event_stream(
+    produce: Callable[[EventChannel], Awaitable[None]],
+    heartbeat_interval: float = SSE_HEARTBEAT_INTERVAL,
+    coalesce_ms: float = SSE_COALESCE_MS,
+    coalesce_chars: int = SSE_COALESCE_CHARS,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> AsyncIterator[str]:
+    """
+    Run `produce` as its own task and yield framed SSE text. The producer
+    never blocks on the socket, tokens go out in batches, and a heartbeat is
+    written whenever nothing else has been for `heartbeat_interval` seconds.
+    If the consumer goes away, or `is_disconnected()` reports the client
+    gone, the producer task is cancelled.
+    """
+    channel = EventChannel()
+    loop = asyncio.get_running_loop()
+
+    async def run():
+        try:
+            await produce(channel)
+        except Exception as e:
+            print(f"Event stream producer failed: {e}")
+        finally:
+            channel.queue.put_nowait(_END)
+
+    task = asyncio.create_task(run())
+
+    async def watch():
+        # A write only fails on the next token or heartbeat; polling stops
+        # silent tool phases from running on after the client has left
+        while not task.done():
+            await asyncio.sleep(SSE_DISCONNECT_POLL_INTERVAL)
+            if await is_disconnected():
+                task.cancel()
+                return
+
+    watcher = asyncio.create_task(watch()) if is_disconnected else None
+    pending: List[str] = []
+    pending_chars = 0
+    flush_at = 0.0
+    last_write = loop.time()
+
+    def take_tokens() -> str:
+        nonlocal pending, pending_chars
+        frame = format_event("token", {"text": "".join(pending)})
+        pending, pending_chars = [], 0
+        return frame
+
+    try:
+        while True:
+            # 1. Wait for the next event, a token flush deadline, or a heartbeat
+            if channel.queue.empty():
+                deadline = flush_at if pending else last_write + heartbeat_interval
+                try:
+                    item = await asyncio.wait_for(channel.queue.get(), timeout=max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    yield take_tokens() if pending else HEARTBEAT
+                    last_write = loop.time()
+                    continue
+            else:
+                item = channel.queue.get_nowait()
+
+            if item is _END:
+                break
+
+            # 2. Buffer tokens; anything else flushes them first to keep order
+            event, data = item
+            if event == "token":
+                if not pending:
+                    flush_at = loop.time() + coalesce_ms / 1000
+                pending.append(data)
+                pending_chars += len(data)
+                if pending_chars < coalesce_chars:
+                    continue
+                out = take_tokens()
+            else:
+                out = (take_tokens() if pending else "") + format_event(event, data)
+            yield out
+            last_write = loop.time()
+
+        if pending:
+            yield take_tokens()
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        if not task.done():
+            task.cancel()
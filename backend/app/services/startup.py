@@ -0,0 +1,96 @@
+import os
+import re
+import sys
+import asyncio
+import subprocess
+from typing import Optional, Dict, Any, List
+from sqlalchemy import text
+from dotenv import load_dotenv
+from ..database import AsyncSessionLocal
+
+load_dotenv()
+
+# How long /ready waits on the database before reporting not ready
+READY_TIMEOUT = float(os.getenv("READY_TIMEOUT", "2"))
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "alembic.ini")
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+_migration_heads: Optional[List[str]] = None
+
+# --- Import profiling ---
+
+def import_profile(module: str = "app.main", top: int = 25) -> Dict[str, Any]:
+    """
+    Import `module` in a fresh interpreter with -X importtime and return the
+    total and the `top` slowest imports by cumulative time (milliseconds).
+    """
+    backend_dir = os.path.dirname(ALEMBIC_INI)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=backend_dir,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+    total = next((e["cumulative_ms"] for e in entries if e["module"] == module), 0.0)
+    return {
+        "module": module,
+        "total_ms": total,
+        "imports": len(entries),
+        "slowest": sorted(entries, key=lambda e: e["cumulative_ms"], reverse=True)[:top],
+    }
+
+# --- Readiness ---
+
+def migration_heads() -> List[str]:
+    """
+    Head revisions of the migration scripts, read once per process.
+    """
+    global _migration_heads
+    if _migration_heads is None:
+        # Only needed by /ready, so Alembic stays out of the startup import path
+        from alembic.config import Config
+        from alembic.script import ScriptDirectory
+
+        _migration_heads = list(ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_heads())
+    return _migration_heads
+
+async def _applied_revisions() -> List[str]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(text("SELECT version_num FROM alembic_version"))
+        return [row[0] for row in result.all()]
+
+async def check_readiness() -> Dict[str, Any]:
+    """
+    Ready means the database answers and its schema is at the migration
+    head. Schema changes are applied by `alembic upgrade head` (the release
+    step), never by the app itself.
+    """
+    checks: Dict[str, Any] = {}
+    try:
+        heads = await asyncio.to_thread(migration_heads)
+        applied = await asyncio.wait_for(_applied_revisions(), timeout=READY_TIMEOUT)
+        checks["database"] = "ok"
+        checks["migrations"] = "ok" if sorted(applied) == sorted(heads) else f"at {applied or 'none'}, expected {heads}"
+    except asyncio.TimeoutError:
+        checks["database"] = f"no response within {READY_TIMEOUT:g}s"
+    except Exception as e:
+        # The driver's own message ("no such table: alembic_version", ...) without SQLAlchemy's footer
+        checks["database"] = f"error: {getattr(e, 'orig', None) or e}"
+    ready = checks.get("database") == "ok" and checks.get("migrations") == "ok"
+    return {"status": "ready" if ready else "unavailable", "checks": checks}
@@ -0,0 +1,265 @@
+import os
+import json
+import time
+import queue
+import random
+import secrets
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, List
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Fraction of requests that get traced (0.0 disables tracing entirely)
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+# Comma separated list of exporters: "json" (stdout or TRACE_LOG_FILE) and/or "otlp"
+TRACE_EXPORTERS = [e.strip() for e in os.getenv("TRACE_EXPORTERS", "json").split(",") if e.strip()]
+TRACE_LOG_FILE = os.getenv("TRACE_LOG_FILE")
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318")
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "cosint-api")
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("cosint_trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("cosint_span", default=None)
+
+
+class Span:
+    __slots__ = ("trace", "name", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException] = None):
+        if self.end_ns is not None:
+            return
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self.end_ns = time.time_ns()
+
+
+class Trace:
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.trace_id = secrets.token_hex(16)
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self.root = self.start_span(name, None, attributes)
+
+    def start_span(self, name: str, parent: Optional[Span] = None, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        parent_id = parent.span_id if parent else (self.root.span_id if self.spans else None)
+        span = Span(self, name, parent_id, attributes or {})
+        # Tool spans are opened from executor threads, so guard the append
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def waterfall(self) -> Dict[str, Any]:
+        """
+        Render the trace as a flat, start-ordered list of spans with offsets
+        relative to the root span.
+        """
+        origin = self.root.start_ns
+        end = self.root.end_ns or time.time_ns()
+        spans = []
+        for s in sorted(self.spans, key=lambda s: s.start_ns):
+            span_end = s.end_ns or end
+            spans.append({
+                "name": s.name,
+                "span_id": s.span_id,
+                "parent_id": s.parent_id,
+                "start_ms": round((s.start_ns - origin) / 1e6, 2),
+                "duration_ms": round((span_end - s.start_ns) / 1e6, 2),
+                "attributes": s.attributes,
+                "error": s.error,
+            })
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name,
+            "duration_ms": round((end - origin) / 1e6, 2),
+            "spans": spans,
+        }
+
+
+def start_trace(name: str, **attributes) -> Optional[Trace]:
+    """
+    Start a sampled trace and make it current. Returns None when the request
+    is not sampled, in which case every span helper below is a no-op.
+    """
+    if TRACE_SAMPLE_RATE <= 0 or random.random() >= TRACE_SAMPLE_RATE:
+        return None
+    trace = Trace(name, attributes)
+    activate(trace)
+    return trace
+
+
+def activate(trace: Optional[Trace], span: Optional[Span] = None):
+    """
+    Make a trace current in this context. Used to carry a trace started in an
+    endpoint into the streaming generator that finishes the request.
+    """
+    if trace is None:
+        return
+    _current_trace.set(trace)
+    _current_span.set(span or trace.root)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def start_span(name: str, parent: Optional[Span] = None, **attributes) -> Optional[Span]:
+    """
+    Open a span without making it current. Useful for spans whose start and end
+    arrive as separate events (e.g. agent tool and model callbacks).
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    return trace.start_span(name, parent or _current_span.get(), attributes)
+
+
+@contextmanager
+def trace_span(name: str, **attributes):
+    """
+    Time a block as a child of the current span.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    span = trace.start_span(name, _current_span.get(), attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.end(error=e)
+        raise
+    finally:
+        span.end()
+        _current_span.reset(token)
+
+
+def finish_trace(trace: Optional[Trace], error: Optional[BaseException] = None):
+    """
+    Close the root span and hand the trace to the exporters off the request path.
+    """
+    if trace is None:
+        return
+    end = time.time_ns()
+    for span in trace.spans:
+        if span.end_ns is None:
+            span.end_ns = end
+    trace.root.end(error=error)
+    _exporter().submit(trace)
+
+
+# --- Exporters ---
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(trace: Trace) -> Dict[str, Any]:
+    """
+    Encode a trace as an OTLP/HTTP JSON ExportTraceServiceRequest.
+    """
+    spans = []
+    for s in trace.spans:
+        span = {
+            "traceId": trace.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 2 if s is trace.root else 1,
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns or s.start_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 0},
+        }
+        if s.parent_id:
+            span["parentSpanId"] = s.parent_id
+        spans.append(span)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "cosint.tracing"}, "spans": spans}],
+        }]
+    }
+
+
+class _TraceExporter:
+    """
+    Ships finished traces from a daemon thread so exporting never adds
+    latency to a response.
+    """
+
+    def __init__(self, exporters: List[str]):
+        self.exporters = exporters
+        self._queue: "queue.Queue[Trace]" = queue.Queue(maxsize=1000)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, trace: Trace):
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            pass  # Drop traces rather than back-pressure requests
+
+    def _run(self):
+        while True:
+            trace = self._queue.get()
+            for name in self.exporters:
+                try:
+                    if name == "json":
+                        self._export_json(trace)
+                    elif name == "otlp":
+                        self._export_otlp(trace)
+                except Exception as e:
+                    print(f"Trace export ({name}) failed: {e}")
+
+    def _export_json(self, trace: Trace):
+        line = json.dumps({"trace": trace.waterfall()}, default=str)
+        if TRACE_LOG_FILE:
+            with open(TRACE_LOG_FILE, "a") as f:
+                f.write(line + "\n")
+        else:
+            print(line)
+
+    def _export_otlp(self, trace: Trace):
+        import requests
+        response = requests.post(
+            f"{OTLP_ENDPOINT.rstrip('/')}/v1/traces",
+            data=json.dumps(to_otlp(trace), default=str),
+            headers={"Content-Type": "application/json"},
+            timeout=5,
+        )
+        response.raise_for_status()
+
+
+_exporter_instance: Optional[_TraceExporter] = None
+_exporter_lock = threading.Lock()
+
+def _exporter() -> _TraceExporter:
+    global _exporter_instance
+    if _exporter_instance is None:
+        with _exporter_lock:
+            if _exporter_instance is None:
+                _exporter_instance = _TraceExporter(TRACE_EXPORTERS)
+    return _exporter_instance
@@ -0,0 +1,151 @@
+import os
+import time
+from typing import Optional, Dict, Any, List
+from sqlalchemy.exc import SQLAlchemyError
+from dotenv import load_dotenv
+from ...database import (
+    SessionLocal, WarehouseBill, WarehouseBillAction, WarehouseBillCosponsor, WarehouseMember,
+)
+from .ingest import make_bill_id
+
+load_dotenv()
+
+# Serve bills and members from the local warehouse before calling Congress.gov
+WAREHOUSE_ENABLED = os.getenv("WAREHOUSE_ENABLED", "true").lower() == "true"
+# After a database error, skip the warehouse for this many seconds before trying again
+WAREHOUSE_RETRY_INTERVAL = float(os.getenv("WAREHOUSE_RETRY_INTERVAL", "60"))
+
+_unavailable_until = 0.0
+
+def _query(fn):
+    """
+    Run a warehouse read, treating any database error (e.g. the wh_* tables
+    haven't been migrated yet, or a dropped connection) as a miss. Callers go
+    straight to the API for WAREHOUSE_RETRY_INTERVAL, then the warehouse is
+    tried again.
+    """
+    def wrapper(*args, **kwargs):
+        global _unavailable_until
+        if not WAREHOUSE_ENABLED or time.monotonic() < _unavailable_until:
+            return None
+        try:
+            with SessionLocal() as db:
+                return fn(db, *args, **kwargs)
+        except SQLAlchemyError as e:
+            print(f"Warehouse unavailable for {WAREHOUSE_RETRY_INTERVAL:g}s, falling back to the API: {getattr(e, 'orig', e)}")
+            _unavailable_until = time.monotonic() + WAREHOUSE_RETRY_INTERVAL
+            return None
+    return wrapper
+
+def _bill_dict(bill: WarehouseBill) -> Dict[str, Any]:
+    # Mirrors the Congress.gov bill detail shape used by the routers and agent tools
+    data = {
+        "congress": bill.congress,
+        "type": bill.bill_type.upper(),
+        "number": bill.bill_number,
+        "title": bill.title,
+        "introducedDate": bill.introduced_date,
+        "originChamber": bill.origin_chamber,
+        "updateDate": bill.update_date,
+        "sponsors": [],
+    }
+    if bill.policy_area:
+        data["policyArea"] = {"name": bill.policy_area}
+    if bill.sponsor_bioguide_id:
+        data["sponsors"].append({
+            "bioguideId": bill.sponsor_bioguide_id,
+            "fullName": bill.sponsor_name,
+            "party": bill.sponsor_party,
+            "state": bill.sponsor_state,
+            "district": bill.sponsor_district,
+        })
+    if bill.latest_action_date or bill.latest_action_text:
+        data["latestAction"] = {"actionDate": bill.latest_action_date, "text": bill.latest_action_text}
+    return data
+
+@_query
+def get_bill(db, congress: int, bill_type: str, bill_number: str) -> Optional[Dict[str, Any]]:
+    bill = db.get(WarehouseBill, make_bill_id(congress, bill_type, bill_number))
+    return _bill_dict(bill) if bill else None
+
+@_query
+def get_bill_actions(db, congress: int, bill_type: str, bill_number: str, limit: int = 100) -> Optional[List[Dict[str, Any]]]:
+    bill_id = make_bill_id(congress, bill_type, bill_number)
+    bill = db.get(WarehouseBill, bill_id)
+    if bill is None or not bill.actions_loaded:
+        return None
+
+    actions = (
+        db.query(WarehouseBillAction)
+        .filter(WarehouseBillAction.bill_id == bill_id)
+        .order_by(WarehouseBillAction.seq)
+        .limit(limit)
+        .all()
+    )
+    return [{
+        "actionDate": a.action_date,
+        "actionTime": a.action_time,
+        "text": a.text,
+        "type": a.action_type,
+        "actionCode": a.action_code,
+    } for a in actions]
+
+@_query
+def get_bill_cosponsors(db, congress: int, bill_type: str, bill_number: str) -> Optional[List[Dict[str, Any]]]:
+    bill_id = make_bill_id(congress, bill_type, bill_number)
+    bill = db.get(WarehouseBill, bill_id)
+    if bill is None or not bill.cosponsors_loaded:
+        return None
+
+    cosponsors = (
+        db.query(WarehouseBillCosponsor)
+        .filter(WarehouseBillCosponsor.bill_id == bill_id)
+        .order_by(WarehouseBillCosponsor.sponsorship_date, WarehouseBillCosponsor.bioguide_id)
+        .all()
+    )
+    results = []
+    for c in cosponsors:
+        item = {
+            "bioguideId": c.bioguide_id,
+            "fullName": c.full_name,
+            "party": c.party,
+            "state": c.state,
+            "district": c.district,
+            "sponsorshipDate": c.sponsorship_date,
+            "isOriginalCosponsor": c.is_original_cosponsor,
+        }
+        if c.withdrawn_date:
+            item["sponsorshipWithdrawnDate"] = c.withdrawn_date
+        results.append(item)
+    return results
+
+@_query
+def get_member(db, bioguide_id: str) -> Optional[Dict[str, Any]]:
+    member = db.get(WarehouseMember, bioguide_id)
+    # Rows loaded only from member lists lack terms, and rows ingested before
+    # addresses were kept lack those; let the API fill in the detail
+    if member is None or not member.terms or not member.address_information:
+        return None
+    if any(term.get("congress") is None for term in member.terms):
+        return None
+
+    data = {
+        "bioguideId": member.bioguide_id,
+        "directOrderName": member.direct_order_name,
+        "invertedOrderName": member.name,
+        "firstName": member.first_name,
+        "lastName": member.last_name,
+        "state": member.state,
+        "currentMember": member.current_member,
+        "terms": member.terms,
+        "partyHistory": member.party_history or [],
+        "updateDate": member.update_date,
+    }
+    if member.district is not None:
+        data["district"] = member.district
+    if member.image_url:
+        data["depiction"] = {"imageUrl": member.image_url}
+    if member.official_url:
+        data["officialWebsiteUrl"] = member.official_url
+    data["addressInformation"] = member.address_information
+    return data
@@ -0,0 +1,180 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from dotenv import load_dotenv
+from ...database import engine
+from .ingest import make_bill_id
+
+load_dotenv()
+
+# Bill text is truncated before indexing; titles and summaries are indexed in full
+SEARCH_TEXT_MAX_CHARS = int(os.getenv("SEARCH_TEXT_MAX_CHARS", "200000"))
+
+# Titles carry far more signal per word than CRS summaries, and summaries more than statute text
+TITLE_WEIGHT = 10.0
+SUMMARY_WEIGHT = 4.0
+BODY_WEIGHT = 1.0
+
+# The wh_bill_search table comes from the b81f04d6c9e2 migration (FTS5 on
+# SQLite, a weighted tsvector on Postgres)
+
+# API fetches queue their indexing here rather than writing on the request path;
+# one worker keeps the writes serialized
+_index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bill-index")
+
+def _is_sqlite(bind) -> bool:
+    return bind.dialect.name == "sqlite"
+
+def index_bill(
+    conn,
+    congress: int,
+    bill_type: str,
+    bill_number: str,
+    title: Optional[str] = None,
+    summary: Optional[str] = None,
+    body: Optional[str] = None,
+):
+    """
+    Add or update a bill in the index on an existing connection/session.
+    Columns passed as None keep whatever was indexed before.
+    """
+    if not (title or summary or body):
+        return
+    bill_id = make_bill_id(congress, bill_type, bill_number)
+    bill_type = "".join(c for c in bill_type if c.isalpha()).lower()
+    if body:
+        body = body[:SEARCH_TEXT_MAX_CHARS]
+    params = {
+        "bill_id": bill_id, "congress": int(congress), "bill_type": bill_type,
+        "bill_number": str(bill_number), "title": title, "summary": summary, "body": body,
+    }
+
+    if _is_sqlite(conn.get_bind() if hasattr(conn, "get_bind") else conn):
+        # FTS5 tables have no upsert, so merge with the existing row by hand
+        existing = conn.execute(
+            text("SELECT title, summary, body FROM wh_bill_search WHERE bill_id = :bill_id"), {"bill_id": bill_id}
+        ).first()
+        if existing is not None:
+            for column in ("title", "summary", "body"):
+                params[column] = params[column] or getattr(existing, column)
+            conn.execute(text("DELETE FROM wh_bill_search WHERE bill_id = :bill_id"), {"bill_id": bill_id})
+        conn.execute(text(
+            "INSERT INTO wh_bill_search (bill_id, congress, bill_type, bill_number, title, summary, body)"
+            " VALUES (:bill_id, :congress, :bill_type, :bill_number, :title, :summary, :body)"
+        ), params)
+    else:
+        conn.execute(text(
+            "INSERT INTO wh_bill_search (bill_id, congress, bill_type, bill_number, title, summary, body)"
+            " VALUES (:bill_id, :congress, :bill_type, :bill_number, :title, :summary, :body)"
+            " ON CONFLICT (bill_id) DO UPDATE SET"
+            " title = COALESCE(EXCLUDED.title, wh_bill_search.title),"
+            " summary = COALESCE(EXCLUDED.summary, wh_bill_search.summary),"
+            " body = COALESCE(EXCLUDED.body, wh_bill_search.body)"
+        ), params)
+
+def index_bill_safely(
+    congress: int,
+    bill_type: str,
+    bill_number: str,
+    title: Optional[str] = None,
+    summary: Optional[str] = None,
+    body: Optional[str] = None,
+):
+    """
+    Index in its own transaction, e.g. after an API fetch. Failures never
+    propagate; the index is a best-effort accelerator.
+    """
+    try:
+        with engine.begin() as conn:
+            index_bill(conn, congress, bill_type, bill_number, title=title, summary=summary, body=body)
+    except SQLAlchemyError as e:
+        print(f"Failed to index bill {congress}-{bill_type}-{bill_number}: {getattr(e, 'orig', e)}")
+
+def index_bill_in_background(
+    congress: int,
+    bill_type: str,
+    bill_number: str,
+    title: Optional[str] = None,
+    summary: Optional[str] = None,
+    body: Optional[str] = None,
+):
+    """
+    Queue `index_bill_safely` so the caller (an API fetch on a request path)
+    doesn't wait on the write.
+    """
+    _index_executor.submit(index_bill_safely, congress, bill_type, bill_number, title=title, summary=summary, body=body)
+
+# Question phrasing and words found in nearly every bill; matching on them only adds noise
+QUERY_STOPWORDS = {
+    "a", "about", "act", "address", "addresses", "an", "and", "any", "are", "bill", "bills",
+    "concerning", "congress", "deal", "for", "in", "is", "legislation", "of", "on", "or",
+    "regarding", "related", "that", "the", "to", "what", "which", "with",
+}
+
+def _terms(query: str) -> List[str]:
+    terms = re.findall(r"\w+", query.lower())
+    return [t for t in terms if t not in QUERY_STOPWORDS] or terms
+
+def _search_sqlite(conn, terms: List[str], any_term: bool, congress: Optional[int], limit: int):
+    # Quote every term so user input can't trip FTS5 query syntax
+    match = (" OR " if any_term else " ").join(f'"{t}"' for t in terms)
+    sql = (
+        "SELECT bill_id, congress, bill_type, bill_number, title,"
+        f" snippet(wh_bill_search, -1, '**', '**', '…', 24) AS snippet,"
+        f" -bm25(wh_bill_search, 0, 0, 0, 0, {TITLE_WEIGHT}, {SUMMARY_WEIGHT}, {BODY_WEIGHT}) AS rank"
+        " FROM wh_bill_search WHERE wh_bill_search MATCH :match"
+    )
+    params = {"match": match, "limit": limit}
+    if congress:
+        sql += " AND congress = :congress"
+        params["congress"] = congress
+    sql += " ORDER BY rank DESC LIMIT :limit"
+    return conn.execute(text(sql), params).mappings().all()
+
+def _search_postgres(conn, terms: List[str], any_term: bool, congress: Optional[int], limit: int):
+    tsquery = "to_tsquery('english', :query)" if any_term else "plainto_tsquery('english', :query)"
+    params = {"query": " | ".join(terms) if any_term else " ".join(terms), "limit": limit}
+    where = "document @@ q"
+    if congress:
+        where += " AND congress = :congress"
+        params["congress"] = congress
+    # Rank in the inner query so ts_headline only runs over the rows returned
+    sql = (
+        "SELECT bill_id, congress, bill_type, bill_number, title, rank,"
+        " ts_headline('english', coalesce(summary, body, title, ''), q,"
+        "  'StartSel=**, StopSel=**, MaxWords=24, MinWords=8, MaxFragments=2, FragmentDelimiter=\" … \"') AS snippet"
+        " FROM ("
+        f"  SELECT s.bill_id, s.congress, s.bill_type, s.bill_number, s.title, s.summary, s.body, q,"
+        f" ts_rank_cd('{{0.0, {BODY_WEIGHT / TITLE_WEIGHT}, {SUMMARY_WEIGHT / TITLE_WEIGHT}, 1.0}}', document, q) AS rank"
+        f"  FROM wh_bill_search s, {tsquery} q WHERE {where}"
+        "  ORDER BY rank DESC LIMIT :limit"
+        " ) ranked ORDER BY rank DESC"
+    )
+    return conn.execute(text(sql), params).mappings().all()
+
+def search_bills(query: str, congress: Optional[int] = None, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Ranked full-text search over indexed bill titles, summaries and text.
+    All terms must match; if nothing does, any term may.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+
+    with engine.connect() as conn:
+        run = _search_sqlite if _is_sqlite(conn) else _search_postgres
+        rows = run(conn, terms, False, congress, limit)
+        if not rows and len(terms) > 1:
+            rows = run(conn, terms, True, congress, limit)
+
+    return [{
+        "congress": row["congress"],
+        "type": row["bill_type"],
+        "number": row["bill_number"],
+        "title": row["title"],
+        "snippet": row["snippet"],
+        "rank": round(float(row["rank"]), 4),
+    } for row in rows]
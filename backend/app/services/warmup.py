@@ -0,0 +1,141 @@
+import os
+import re
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, List, Callable, Tuple
+from dotenv import load_dotenv
+from .cache_service import cache
+from .rate_limit import RateLimiter
+
+load_dotenv()
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "false").lower() == "true"
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", "4"))
+# Congress.gov allows 5,000 requests an hour per key; stay a little under it
+WARMUP_RATE_LIMIT = float(os.getenv("WARMUP_RATE_LIMIT", "1.2"))
+WARMUP_BILL_LIMIT = int(os.getenv("WARMUP_BILL_LIMIT", "100"))
+# Matches the member dashboard's recent votes list
+WARMUP_VOTE_LIMIT = 15
+
+# Only one node of a fleet sharing the cache runs the startup warm-up
+WARMUP_LOCK_KEY = "warmup:running"
+WARMUP_LOCK_TTL = 6 * 3600
+
+# Each task calls the client exactly as the dashboards in routers/intelligence.py
+# do (same positional/keyword split), so the api_cache keys line up.
+
+def warm_member(client, bioguide_id: str):
+    client.get_member_details(bioguide_id)
+    client.get_sponsored_legislation(bioguide_id, limit=10)
+    client.get_member_committees(bioguide_id)
+
+def warm_roll_call(client, vote: Dict[str, Any]):
+    if vote.get("legislationNumber") and vote.get("legislationType"):
+        client.get_bill_details(vote.get("congress"), vote.get("legislationType"), vote.get("legislationNumber"))
+    client.get_house_roll_call_member_votes(vote.get("congress"), vote.get("sessionNumber"), vote.get("rollCallNumber"))
+
+def warm_bill(client, congress: int, bill_type: str, bill_number: str):
+    sanitized_type = re.sub(r'[^a-zA-Z]', '', bill_type).lower()
+    client.get_bill_details(congress, sanitized_type, bill_number)
+    client.get_bill_actions(congress, sanitized_type, bill_number)
+    client.get_bill_cosponsors(congress, sanitized_type, bill_number)
+    client.get_bill_text(congress, sanitized_type, bill_number)
+    client.get_bill_text_content(congress, sanitized_type, bill_number)
+
+def plan_warmup(client, members: bool = True, bills: bool = True, bill_limit: int = WARMUP_BILL_LIMIT) -> List[Tuple[str, Callable[[], None]]]:
+    """
+    List (label, task) pairs for the current roster, the roll calls on the
+    member dashboards and the most recently active bills.
+    """
+    tasks = []
+    if members:
+        for member in client.get_current_members():
+            bioguide_id = member.get("bioguideId")
+            if bioguide_id:
+                tasks.append((f"member {bioguide_id}", lambda b=bioguide_id: warm_member(client, b)))
+        for vote in client.get_recent_house_votes(limit=WARMUP_VOTE_LIMIT):
+            if "AMDT" in vote.get("legislationType", "").upper():
+                continue
+            label = f"roll call {vote.get('congress')}-{vote.get('sessionNumber')}-{vote.get('rollCallNumber')}"
+            tasks.append((label, lambda v=vote: warm_roll_call(client, v)))
+    if bills:
+        for bill in client.get_recent_bills(limit=bill_limit):
+            congress, bill_type, number = bill.get("congress"), bill.get("type"), bill.get("number")
+            if congress and bill_type and number:
+                label = f"bill {congress}-{bill_type.lower()}-{number}"
+                tasks.append((label, lambda c=congress, t=bill_type, n=str(number): warm_bill(client, c, t, n)))
+    return tasks
+
+def warm_cache(
+    members: bool = True,
+    bills: bool = True,
+    bill_limit: int = WARMUP_BILL_LIMIT,
+    concurrency: int = WARMUP_CONCURRENCY,
+    rate_limit: float = WARMUP_RATE_LIMIT,
+    progress: Optional[Callable[[int, int, Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Prefill the api_cache entries behind the member and bill dashboards.
+    Entries that are already cached cost no upstream request, so reruns are cheap.
+    """
+    from .cosint.api_client import CongressAPIClient
+
+    limiter = RateLimiter(rate_limit, burst=max(concurrency, 1))
+    client = CongressAPIClient(rate_limiter=limiter)
+    started = time.monotonic()
+
+    # 1. Work out what to warm
+    tasks = plan_warmup(client, members=members, bills=bills, bill_limit=bill_limit)
+    stats = {"tasks": len(tasks), "done": 0, "failed": 0, "requests": 0, "elapsed": 0.0}
+
+    # 2. Run the tasks; the shared limiter keeps every worker under the quota
+    def run(task):
+        label, fn = task
+        try:
+            fn()
+            return None
+        except Exception as e:
+            return f"{label}: {e}"
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        for future in as_completed([pool.submit(run, task) for task in tasks]):
+            error = future.result()
+            stats["done"] += 1
+            if error:
+                stats["failed"] += 1
+                print(f"Warm-up failed for {error}")
+            stats["requests"] = limiter.granted
+            stats["elapsed"] = time.monotonic() - started
+            if progress:
+                progress(stats["done"], stats["tasks"], stats)
+
+    stats["requests"] = limiter.granted
+    stats["elapsed"] = time.monotonic() - started
+    return stats
+
+def start_background_warmup():
+    """
+    Run warm_cache in a daemon thread unless another node already is.
+    """
+    # Atomic, so nodes booting together can't all win the lock
+    token = uuid.uuid4().hex
+    if not cache.add(WARMUP_LOCK_KEY, token, expire=WARMUP_LOCK_TTL):
+        return
+
+    def run():
+        try:
+            stats = warm_cache()
+            print(
+                f"Cache warm-up finished: {stats['done']} tasks, {stats['failed']} failed, "
+                f"{stats['requests']} upstream requests in {stats['elapsed']:.0f}s"
+            )
+        except Exception as e:
+            print(f"Cache warm-up failed: {e}")
+        finally:
+            # Don't release a lock that expired and was taken by another node
+            if cache.get(WARMUP_LOCK_KEY) == token:
+                cache.delete(WARMUP_LOCK_KEY)
+
+    threading.Thread(target=run, name="cache-warmup", daemon=True).start()
@@ -1,10 +1,129 @@
 import sys
 import os
+import argparse
+from datetime import datetime
 
 # Add the current directory to sys.path to allow imports from app
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.services.cosint.cli import run_cli
+def run_ingest(args):
+    from app.services.warehouse.ingest import ingest_directory
+
+    since = datetime.fromisoformat(args.since) if args.since else None
+    started = datetime.now()
+
+    def progress(path, stats):
+        print(f"[{stats['files']} files] {path}: {stats['bills']} bills, {stats['members']} members loaded")
+
+    stats = ingest_directory(args.directory, since=since, force=args.force, progress=progress)
+    elapsed = (datetime.now() - started).total_seconds()
+    print(
+        f"Done in {elapsed:.1f}s: {stats['files']} files ingested, {stats['files_skipped']} unchanged, "
+        f"{stats['bills']} bills, {stats['texts']} bill texts, {stats['members']} members, "
+        f"{stats['records_skipped']} records already current, {stats['errors']} errors"
+    )
+
+def run_sync_votes(args):
+    from app.services.cosint.api_client import CongressAPIClient
+    from app.services.analytics.vote_matrix import get_vote_matrix
+
+    matrix = get_vote_matrix()
+    added = matrix.sync(CongressAPIClient(), limit=args.limit)
+    print(f"Added {added} roll calls; matrix is {len(matrix.members)} members x {len(matrix.roll_calls)} roll calls")
+
+def run_build_graph(args):
+    from app.services.analytics.cosponsorship import get_cosponsorship_graph
+
+    graph = get_cosponsorship_graph()
+    applied = graph.sync()
+    print(f"Applied {applied} bills; graph has {len(graph.members)} members, {len(graph.bill_ids)} bills, {graph.adjacency.nnz} edges")
+
+def run_warm_cache(args):
+    from app.services.warmup import warm_cache
+
+    def progress(done, total, stats):
+        if done % 25 == 0 or done == total:
+            rate = stats["requests"] / stats["elapsed"] if stats["elapsed"] else 0.0
+            print(f"[{done}/{total}] {stats['requests']} upstream requests, {rate:.2f} req/s, {stats['failed']} failed")
+
+    # Unset options fall back to the WARMUP_* settings
+    overrides = {"bill_limit": args.bills, "concurrency": args.concurrency, "rate_limit": args.rate}
+    stats = warm_cache(
+        members=not args.bills_only,
+        bills=not args.members_only,
+        progress=progress,
+        **{k: v for k, v in overrides.items() if v is not None},
+    )
+    elapsed = stats["elapsed"] or 1e-9
+    print(
+        f"Warmed {stats['done'] - stats['failed']}/{stats['tasks']} entries in {elapsed:.1f}s "
+        f"({stats['done'] / elapsed:.1f} tasks/s, {stats['requests']} upstream requests)"
+    )
+
+def run_profile_imports(args):
+    from app.services.startup import import_profile
+
+    profile = import_profile(args.module, top=args.top)
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for entry in profile["slowest"]:
+        print(f"{entry['cumulative_ms']:>14.1f} {entry['self_ms']:>9.1f}  {'  ' * entry['depth']}{entry['module']}")
+    print(f"Importing {profile['module']} took {profile['total_ms']:.0f} ms across {profile['imports']} modules")
+
+def run_batch(args):
+    from app.services.cosint.cli import run_batch as run_batch_questions
+
+    run_batch_questions(args.input, output_path=args.output, workers=args.workers)
+
+def main():
+    parser = argparse.ArgumentParser(description="COSINT command line tools")
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("chat", help="Interactive Congress research chat (default)")
+
+    ingest = subparsers.add_parser("ingest", help="Load bulk bill status / member files into the local warehouse")
+    ingest.add_argument("directory", help="Directory of BILLSTATUS/BILLS XML, Congress.gov JSON or zip archives")
+    ingest.add_argument("--since", help="Only read files modified after this ISO date")
+    ingest.add_argument("--force", action="store_true", help="Re-read every file and overwrite newer rows")
+
+    sync_votes = subparsers.add_parser("sync-votes", help="Add the latest House roll calls to the vote matrix")
+    sync_votes.add_argument("--limit", type=int, default=250, help="How many of the latest roll calls to check")
+
+    subparsers.add_parser("build-graph", help="Update the cosponsorship graph from the warehouse")
+
+    warm = subparsers.add_parser("warm-cache", help="Prefill the API cache for current members and recently active bills")
+    warm.add_argument("--bills", type=int, default=None, help="How many recently updated bills to warm")
+    warm.add_argument("--concurrency", type=int, default=None, help="Parallel workers")
+    warm.add_argument("--rate", type=float, default=None, help="Max upstream requests per second")
+    scope = warm.add_mutually_exclusive_group()
+    scope.add_argument("--members-only", action="store_true", help="Skip bills")
+    scope.add_argument("--bills-only", action="store_true", help="Skip members and roll calls")
+
+    batch = subparsers.add_parser("batch", help="Answer a file of questions concurrently and write JSONL results")
+    batch.add_argument("input", help="Questions, one per line, or JSONL with a 'question' field (and optional 'id', 'context')")
+    batch.add_argument("-o", "--output", help="Results file (JSONL); defaults to stdout")
+    batch.add_argument("--workers", type=int, default=4, help="Questions answered at once")
+
+    profile = subparsers.add_parser("profile-imports", help="Show the slowest imports on the API's cold-start path")
+    profile.add_argument("--module", default="app.main", help="Module to import")
+    profile.add_argument("--top", type=int, default=25, help="How many imports to list")
+
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        run_ingest(args)
+    elif args.command == "sync-votes":
+        run_sync_votes(args)
+    elif args.command == "build-graph":
+        run_build_graph(args)
+    elif args.command == "warm-cache":
+        run_warm_cache(args)
+    elif args.command == "batch":
+        run_batch(args)
+    elif args.command == "profile-imports":
+        run_profile_imports(args)
+    else:
+        from app.services.cosint.cli import run_cli
+        run_cli()
 
 if __name__ == "__main__":
-    run_cli()
+    main()
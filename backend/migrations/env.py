@@ -34,6 +34,13 @@ if config.config_file_name is not None:
 from app.database import Base
 target_metadata = Base.metadata
 
+def include_object(object, name, type_, reflected, compare_to):
+    # The full-text bill index (and SQLite's FTS5 shadow tables) is managed
+    # with raw DDL, so keep autogenerate from trying to drop it
+    if type_ == "table" and name and name.startswith("wh_bill_search"):
+        return False
+    return True
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
@@ -42,6 +49,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -58,7 +66,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,120 @@
+"""Add local legislative data warehouse tables
+
+Revision ID: a3c91e5d2b74
+Revises: f7557dcfff98
+Create Date: 2026-10-18 11:40:02.581934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91e5d2b74'
+down_revision: Union[str, Sequence[str], None] = 'f7557dcfff98'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('wh_bills',
+    sa.Column('bill_id', sa.String(), nullable=False),
+    sa.Column('congress', sa.Integer(), nullable=False),
+    sa.Column('bill_type', sa.String(), nullable=False),
+    sa.Column('bill_number', sa.String(), nullable=False),
+    sa.Column('title', sa.Text(), nullable=True),
+    sa.Column('introduced_date', sa.String(), nullable=True),
+    sa.Column('origin_chamber', sa.String(), nullable=True),
+    sa.Column('policy_area', sa.String(), nullable=True),
+    sa.Column('sponsor_bioguide_id', sa.String(), nullable=True),
+    sa.Column('sponsor_name', sa.String(), nullable=True),
+    sa.Column('sponsor_party', sa.String(), nullable=True),
+    sa.Column('sponsor_state', sa.String(), nullable=True),
+    sa.Column('sponsor_district', sa.Integer(), nullable=True),
+    sa.Column('latest_action_date', sa.String(), nullable=True),
+    sa.Column('latest_action_text', sa.Text(), nullable=True),
+    sa.Column('update_date', sa.String(), nullable=True),
+    sa.Column('actions_loaded', sa.Boolean(), nullable=True),
+    sa.Column('cosponsors_loaded', sa.Boolean(), nullable=True),
+    sa.Column('ingested_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('bill_id')
+    )
+    op.create_index('ix_wh_bills_congress_type_number', 'wh_bills', ['congress', 'bill_type', 'bill_number'], unique=True)
+    op.create_index('ix_wh_bills_update_date', 'wh_bills', ['update_date'], unique=False)
+    op.create_index(op.f('ix_wh_bills_sponsor_bioguide_id'), 'wh_bills', ['sponsor_bioguide_id'], unique=False)
+
+    op.create_table('wh_bill_actions',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('bill_id', sa.String(), nullable=False),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('action_date', sa.String(), nullable=True),
+    sa.Column('action_time', sa.String(), nullable=True),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.Column('action_type', sa.String(), nullable=True),
+    sa.Column('action_code', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['bill_id'], ['wh_bills.bill_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_wh_bill_actions_bill_id_seq', 'wh_bill_actions', ['bill_id', 'seq'], unique=False)
+
+    op.create_table('wh_bill_cosponsors',
+    sa.Column('bill_id', sa.String(), nullable=False),
+    sa.Column('bioguide_id', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('party', sa.String(), nullable=True),
+    sa.Column('state', sa.String(), nullable=True),
+    sa.Column('district', sa.Integer(), nullable=True),
+    sa.Column('sponsorship_date', sa.String(), nullable=True),
+    sa.Column('is_original_cosponsor', sa.Boolean(), nullable=True),
+    sa.Column('withdrawn_date', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['bill_id'], ['wh_bills.bill_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('bill_id', 'bioguide_id')
+    )
+    op.create_index('ix_wh_bill_cosponsors_bioguide_id', 'wh_bill_cosponsors', ['bioguide_id'], unique=False)
+
+    op.create_table('wh_members',
+    sa.Column('bioguide_id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('direct_order_name', sa.String(), nullable=True),
+    sa.Column('first_name', sa.String(), nullable=True),
+    sa.Column('last_name', sa.String(), nullable=True),
+    sa.Column('party', sa.String(), nullable=True),
+    sa.Column('state', sa.String(), nullable=True),
+    sa.Column('district', sa.Integer(), nullable=True),
+    sa.Column('chamber', sa.String(), nullable=True),
+    sa.Column('current_member', sa.Boolean(), nullable=True),
+    sa.Column('image_url', sa.String(), nullable=True),
+    sa.Column('official_url', sa.String(), nullable=True),
+    sa.Column('terms', sa.JSON(), nullable=True),
+    sa.Column('party_history', sa.JSON(), nullable=True),
+    sa.Column('update_date', sa.String(), nullable=True),
+    sa.Column('ingested_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('bioguide_id')
+    )
+    op.create_index('ix_wh_members_state_district', 'wh_members', ['state', 'district'], unique=False)
+
+    op.create_table('wh_ingest_files',
+    sa.Column('path', sa.String(), nullable=False),
+    sa.Column('mtime', sa.Float(), nullable=False),
+    sa.Column('records', sa.Integer(), nullable=True),
+    sa.Column('ingested_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('path')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('wh_ingest_files')
+    op.drop_index('ix_wh_members_state_district', table_name='wh_members')
+    op.drop_table('wh_members')
+    op.drop_index('ix_wh_bill_cosponsors_bioguide_id', table_name='wh_bill_cosponsors')
+    op.drop_table('wh_bill_cosponsors')
+    op.drop_index('ix_wh_bill_actions_bill_id_seq', table_name='wh_bill_actions')
+    op.drop_table('wh_bill_actions')
+    op.drop_index(op.f('ix_wh_bills_sponsor_bioguide_id'), table_name='wh_bills')
+    op.drop_index('ix_wh_bills_update_date', table_name='wh_bills')
+    op.drop_index('ix_wh_bills_congress_type_number', table_name='wh_bills')
+    op.drop_table('wh_bills')
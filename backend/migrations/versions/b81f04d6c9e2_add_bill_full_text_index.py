@@ -0,0 +1,47 @@
+"""Add full-text index over bill titles, summaries and text
+
+Revision ID: b81f04d6c9e2
+Revises: a3c91e5d2b74
+Create Date: 2026-10-18 13:05:27.114602
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f04d6c9e2'
+down_revision: Union[str, Sequence[str], None] = 'a3c91e5d2b74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(sa.text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS wh_bill_search USING fts5("
+            " bill_id UNINDEXED, congress UNINDEXED, bill_type UNINDEXED, bill_number UNINDEXED,"
+            " title, summary, body, tokenize='porter unicode61')"
+        ))
+        return
+
+    # Title, summary and text are weighted A/B/C so ts_rank_cd favours title hits
+    op.execute(sa.text(
+        "CREATE TABLE IF NOT EXISTS wh_bill_search ("
+        " bill_id VARCHAR PRIMARY KEY, congress INTEGER, bill_type VARCHAR, bill_number VARCHAR,"
+        " title TEXT, summary TEXT, body TEXT,"
+        " document tsvector GENERATED ALWAYS AS ("
+        "  setweight(to_tsvector('english', coalesce(title, '')), 'A') ||"
+        "  setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||"
+        "  setweight(to_tsvector('english', coalesce(body, '')), 'C')"
+        " ) STORED)"
+    ))
+    op.execute(sa.text("CREATE INDEX IF NOT EXISTS ix_wh_bill_search_document ON wh_bill_search USING GIN (document)"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text("DROP TABLE IF EXISTS wh_bill_search"))
@@ -0,0 +1,32 @@
+"""Add updated_at to conversations and tracked bills
+
+Revision ID: c4d2e8a1f390
+Revises: b81f04d6c9e2
+Create Date: 2026-10-19 09:12:44.381027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2e8a1f390'
+down_revision: Union[str, Sequence[str], None] = 'b81f04d6c9e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Renames and reorders must show up in `since` syncs, which created_at can't express
+    for table in ('conversations', 'tracked_bills'):
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.execute(sa.text(f"UPDATE {table} SET updated_at = created_at"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tracked_bills', 'updated_at')
+    op.drop_column('conversations', 'updated_at')
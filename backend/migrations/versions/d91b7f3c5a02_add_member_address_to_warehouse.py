@@ -0,0 +1,29 @@
+"""Add office address and phone to warehouse members
+
+Revision ID: d91b7f3c5a02
+Revises: c4d2e8a1f390
+Create Date: 2026-10-19 10:03:17.552918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91b7f3c5a02'
+down_revision: Union[str, Sequence[str], None] = 'c4d2e8a1f390'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows stay NULL and fall back to the API until re-ingested
+    op.add_column('wh_members', sa.Column('address_information', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('wh_members', 'address_information')
@@ -18,8 +18,60 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _create_core_tables() -> None:
+    """
+    Fresh database: create the app tables in their post-baseline shape
+    (the indexes come from f7557dcfff98). Existing deployments created
+    these outside of Alembic and only take the ALTERs below.
+    """
+    op.create_table('conversations',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('user_id', sa.String(), nullable=True),
+    sa.Column('bioguide_id', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('position', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('messages',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('conversation_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('role', sa.String(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('tracked_bills',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('bill_id', sa.String(), nullable=False),
+    sa.Column('bill_type', sa.String(), nullable=True),
+    sa.Column('bill_number', sa.String(), nullable=True),
+    sa.Column('congress', sa.Integer(), nullable=True),
+    sa.Column('title', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('position', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('research_notes',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('bioguide_id', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
 def upgrade() -> None:
     """Upgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table('conversations'):
+        _create_core_tables()
+        return
+
     # ### commands auto generated by Alembic - please adjust! ###
     op.add_column('conversations', sa.Column('position', sa.Integer(), nullable=True))
     op.alter_column('conversations', 'title',
@@ -0,0 +1,50 @@
+"""Add access path indexes for chat and notebook queries
+
+Revision ID: f7557dcfff98
+Revises: e9211253b1c1
+Create Date: 2026-10-18 09:12:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7557dcfff98'
+down_revision: Union[str, Sequence[str], None] = 'e9211253b1c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # History loads and pruning: WHERE conversation_id = ? ORDER BY created_at
+    # (replaces idx_messages_conversation_id dropped by the baseline)
+    op.create_index('ix_messages_conversation_id_created_at', 'messages', ['conversation_id', 'created_at'], unique=False)
+
+    # Member briefing lookup and sidebar listing: WHERE user_id = ? AND bioguide_id ...
+    op.create_index('ix_conversations_user_id_bioguide_id', 'conversations', ['user_id', 'bioguide_id'], unique=False)
+
+    # A user tracks a bill at most once; drop any duplicates left by the
+    # check-then-insert race before enforcing it (keeps the oldest row)
+    op.execute(sa.text(
+        "DELETE FROM tracked_bills WHERE id IN ("
+        " SELECT t.id FROM tracked_bills t JOIN tracked_bills o"
+        " ON o.user_id = t.user_id AND o.bill_id = t.bill_id"
+        " AND (o.created_at < t.created_at OR (o.created_at = t.created_at AND o.id < t.id))"
+        ")"
+    ))
+    op.create_index('uq_tracked_bills_user_id_bill_id', 'tracked_bills', ['user_id', 'bill_id'], unique=True)
+
+    # Member notes: WHERE user_id = ? AND bioguide_id = ? ORDER BY created_at DESC
+    op.create_index('ix_research_notes_user_id_bioguide_id_created_at', 'research_notes', ['user_id', 'bioguide_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_research_notes_user_id_bioguide_id_created_at', table_name='research_notes')
+    op.drop_index('uq_tracked_bills_user_id_bill_id', table_name='tracked_bills')
+    op.drop_index('ix_conversations_user_id_bioguide_id', table_name='conversations')
+    op.drop_index('ix_messages_conversation_id_created_at', table_name='messages')
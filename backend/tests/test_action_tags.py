@@ -0,0 +1,37 @@
+from app.services.cosint.action_tags import ActionTagParser, parse_action_tag
+
+def feed_all(chunks):
+    parser = ActionTagParser()
+    visible, actions = [], []
+    for chunk in chunks:
+        text, found = parser.feed(chunk)
+        visible.append(text)
+        actions.extend(found)
+    visible.append(parser.finish())
+    return "".join(visible), actions
+
+def test_bracketed_title():
+    text, actions = feed_all(["Tracking it. [TRACK_BILL: 118 | hr | 1234 | A [big] bill]"])
+    assert text == "Tracking it. "
+    assert len(actions) == 1
+    assert actions[0]["title"] == "A [big] bill"
+    assert actions[0]["billId"] == "118-hr-1234"
+
+def test_tag_split_across_tokens():
+    message = "Sure. [TRACK_BILL: 118 | hr | 1234 | A [big] bill] Done."
+    for size in (1, 3, 7):
+        chunks = [message[i:i + size] for i in range(0, len(message), size)]
+        text, actions = feed_all(chunks)
+        assert text == "Sure.  Done."
+        assert [a["title"] for a in actions] == ["A [big] bill"]
+
+def test_plain_brackets_pass_through():
+    text, actions = feed_all(["See [1] and [a [nested] note]", " then [TRACK_BILL: 118 | s | 5 | T]"])
+    assert text == "See [1] and [a [nested] note] then "
+    assert [a["billId"] for a in actions] == ["118-s-5"]
+
+def test_unbalanced_tag_is_not_an_action():
+    assert parse_action_tag("[TRACK_BILL: 118 | hr | 1 | T] [x]") is None
+    text, actions = feed_all(["[TRACK_BILL: 118 | hr | 1 | A [big bill"])
+    assert text == "[TRACK_BILL: 118 | hr | 1 | A [big bill"
+    assert actions == []
@@ -10,7 +10,7 @@ import remarkGfm from 'remark-gfm';
 import { createClient } from '@/utils/supabase/client';
 import { useRouter } from 'next/navigation';
 import { User } from '@supabase/supabase-js';
-import { BillData } from '@/types';
+import { BillData, BillUpdate } from '@/types';
 import { getApiUrl } from '@/utils/api';
 import { Skeleton, CardSkeleton } from '@/components/Skeleton';
 
@@ -66,9 +66,27 @@ export default function BillDashboard({ params }: { params: Promise<{ congress:
     }
     init();
 
+    // The server drops its cached dashboard when a tracked bill changes, so refetch it.
+    // The version param and no-store get past the copies the browser and CDN still hold.
+    const onBillUpdated = async (e: Event) => {
+      const update = (e as CustomEvent<BillUpdate>).detail;
+      if (update.billId !== `${congress}-${type}-${number}`.toLowerCase()) return;
+      const sanitizedType = type.replace(/[^a-zA-Z]/g, '').toLowerCase();
+      const version = encodeURIComponent(update.updateDate ?? Date.now().toString());
+      const response = await fetch(
+        getApiUrl(`/bill/${congress}/${sanitizedType}/${number}?v=${version}`),
+        { cache: 'no-store' }
+      );
+      if (response.ok) setData(await response.json());
+    };
+
     // Re-check status when registry changes elsewhere
     window.addEventListener('refresh-registry', fetchTrackingStatus);
-    return () => window.removeEventListener('refresh-registry', fetchTrackingStatus);
+    window.addEventListener('bill-updated', onBillUpdated);
+    return () => {
+      window.removeEventListener('refresh-registry', fetchTrackingStatus);
+      window.removeEventListener('bill-updated', onBillUpdated);
+    };
   }, [congress, type, number]);
 
   const handleTrackBill = async () => {
@@ -8,6 +8,7 @@ import { User } from '@supabase/supabase-js';
 import { createClient } from '@/utils/supabase/client';
 import { useRouter } from 'next/navigation';
 import { getApiUrl } from '@/utils/api';
+import { ChatAction } from '@/types';
 
 type Message = {
   role: 'human' | 'assistant';
@@ -247,64 +248,62 @@ export default function Chat({
 
       const decoder = new TextDecoder();
       let assistantContent = '';
+      let buffer = '';
+      let streamError: string | null = null;
       
       setMessages((prev) => [...prev, { role: 'assistant', content: '' }]);
-      const processedPackets = new Set<string>();
 
-      while (true) {
-        const { done, value } = await reader.read();
-        if (done) break;
-
-        const chunk = decoder.decode(value, { stream: true });
-        assistantContent += chunk;
-
-        // CHECK FOR INTEL PACKETS: Format: [INTEL_PACKET: Title | Content |END_PACKET]
-        // We use a unique terminator to allow brackets (links) inside the content
-        const allMatches = Array.from(assistantContent.matchAll(/\[INTEL_PACKET:\s*([^|]+)\|\s*([\s\S]*?)\|END_PACKET\]/g));
-        
-        for (const match of allMatches) {
-          const fullTag = match[0];
-          if (!processedPackets.has(fullTag) && onIntelligenceCaptured) {
-            processedPackets.add(fullTag);
-            onIntelligenceCaptured({
-              title: match[1].trim(),
-              content: match[2].trim()
-            });
-          }
-        }
-
-        // CHECK FOR ACTION TRIGGERS: Format: [CREATE_PAGE_ACTION: Name | ID]
-        const memberMatch = assistantContent.match(/\[CREATE_PAGE_ACTION:\s*([^|]+)\|\s*([^\]]+)\]/);
-        if (memberMatch) {
-          setActionTrigger({
-            type: 'member',
-            name: memberMatch[1].trim(),
-            id: memberMatch[2].trim()
-          });
-        }
-
-        // CHECK FOR BILL ACTION TRIGGERS: Format: [RESEARCH_BILL: Congress | Type | Number | Title]
-        const billMatch = assistantContent.match(/\[RESEARCH_BILL:\s*(\d+)\s*\|\s*([^|]+)\|\s*([^|]+)\|\s*([^\]]+)\]/);
-        if (billMatch) {
-          const bType = billMatch[2].trim().toLowerCase();
-          const bNum = billMatch[3].trim();
+      const handleAction = (action: ChatAction) => {
+        if (action.type === 'track_bill') {
+          // Already saved on the server; just refresh the sidebar
+          window.dispatchEvent(new Event('refresh-registry'));
+        } else if (action.type === 'open_member') {
+          setActionTrigger({ type: 'member', name: action.name, id: action.bioguideId });
+        } else if (action.type === 'research_bill') {
+          const bType = action.billType.toLowerCase();
           setActionTrigger({
             type: 'bill',
-            name: `${bType.toUpperCase()} ${bNum}`,
-            id: `${billMatch[1]}-${bType}-${bNum}`,
-            congress: billMatch[1].trim(),
+            name: `${bType.toUpperCase()} ${action.billNumber}`,
+            id: action.billId,
+            congress: String(action.congress),
             billType: bType,
-            billNumber: bNum,
-            fullTitle: billMatch[4].trim()
+            billNumber: action.billNumber,
+            fullTitle: action.title
           });
         }
+      };
+
+      // Server-sent events: token, tool_status, intel, action, done
+      const handleEvent = (event: string, data: any) => {
+        if (event === 'token') {
+          assistantContent += data.text;
+        } else if (event === 'tool_status' && data.status === 'start') {
+          assistantContent += `\n\n*Accessing information from ${data.source}...*\n\n`;
+        } else if (event === 'intel') {
+          onIntelligenceCaptured?.({ title: data.title.trim(), content: data.content.trim() });
+        } else if (event === 'action') {
+          handleAction(data);
+        } else if (event === 'done' && data.error) {
+          streamError = data.error;
+        }
+      };
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+        const frames = buffer.split('\n\n');
+        buffer = frames.pop() || '';
+        for (const frame of frames) {
+          // Heartbeat frames are comments (": keep-alive") and carry no event
+          const event = frame.match(/^event: (.*)$/m)?.[1];
+          const data = frame.match(/^data: (.*)$/m)?.[1];
+          if (event && data) handleEvent(event, JSON.parse(data));
+        }
 
-        // Hide any intel tags and action tags from the UI chat bubble
-        const cleanedContent = assistantContent
-          .replace(/\[INTEL_PACKET:[\s\S]*?\|END_PACKET\]/g, '')
-          .replace(/\[CREATE_PAGE_ACTION:[^\]]+\]/g, '')
-          .replace(/\[RESEARCH_BILL:[^\]]+\]/g, '')
-          .trim();
+        // Action tags are stripped server-side and arrive as `action` events
+        const cleanedContent = (assistantContent + (streamError ? `\n\nError: ${streamError}` : '')).trim();
         
         setMessages((prev) => {
           const newMessages = [...prev];
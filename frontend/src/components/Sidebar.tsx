@@ -3,9 +3,12 @@
 import { useState, useEffect, useRef } from 'react';
 import { createClient } from '@/utils/supabase/client';
 import { useRouter } from 'next/navigation';
-import { RegistryItem, RegistryConversation, RegistryTrackedBill } from '@/types';
+import { RegistryItem, RegistryConversation, RegistryTrackedBill, BillStatus, BillUpdate } from '@/types';
 import { getApiUrl } from '@/utils/api';
 
+// Most bill IDs POST /bills/status accepts per request (MAX_STATUS_BATCH on the server)
+const BILL_STATUS_BATCH = 100;
+
 type SidebarProps = {
   currentId: string | null;
   onSelect: (id: string, bioguideId?: string) => void;
@@ -23,6 +26,12 @@ export default function Sidebar({ currentId, onSelect, onNewChat }: SidebarProps
   
   // Drag and Drop State
   const [draggedItemIndex, setDraggedItemIndex] = useState<number | null>(null);
+  const dragOriginRef = useRef<{ index: number; normalized: boolean } | null>(null);
+
+  // Tracked bills with a new action since they were last opened
+  const [updatedBillIds, setUpdatedBillIds] = useState<Set<string>>(new Set());
+  // Latest action per tracked bill, keyed by bill_id
+  const [billStatuses, setBillStatuses] = useState<Record<string, BillStatus>>({});
 
   useEffect(() => {
     fetchRegistry();
@@ -32,6 +41,56 @@ export default function Sidebar({ currentId, onSelect, onNewChat }: SidebarProps
     return () => window.removeEventListener('refresh-registry', fetchRegistry);
   }, [currentId]);
 
+  // Push updates for tracked bills (server-sent events over an authenticated fetch)
+  useEffect(() => {
+    const controller = new AbortController();
+    let retryTimer: ReturnType<typeof setTimeout> | undefined;
+
+    const subscribe = async () => {
+      try {
+        const { data: { session } } = await createClient().auth.getSession();
+        if (!session) return;
+        const response = await fetch(getApiUrl('/tracked-bills/stream'), {
+          headers: { 'Authorization': `Bearer ${session.access_token}` },
+          signal: controller.signal
+        });
+        const reader = response.body?.getReader();
+        if (!response.ok || !reader) throw new Error('Bill update stream unavailable');
+
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          const frames = buffer.split('\n\n');
+          buffer = frames.pop() || '';
+          for (const frame of frames) {
+            const event = frame.match(/^event: (.*)$/m)?.[1];
+            const data = frame.match(/^data: (.*)$/m)?.[1];
+            if (event !== 'bill_update' || !data) continue;
+            const update: BillUpdate = JSON.parse(data);
+            setUpdatedBillIds(ids => new Set(ids).add(update.billId));
+            setBillStatuses(statuses => ({ ...statuses, [update.billId]: update }));
+            window.dispatchEvent(new CustomEvent('bill-updated', { detail: update }));
+          }
+        }
+      } catch (error) {
+        if (controller.signal.aborted) return;
+        console.error('Bill update stream failed:', error);
+      }
+      if (!controller.signal.aborted) {
+        retryTimer = setTimeout(subscribe, 30000);
+      }
+    };
+
+    subscribe();
+    return () => {
+      controller.abort();
+      clearTimeout(retryTimer);
+    };
+  }, []);
+
   useEffect(() => {
     if (editingId && editInputRef.current) {
       editInputRef.current.focus();
@@ -60,6 +119,30 @@ export default function Sidebar({ currentId, onSelect, onNewChat }: SidebarProps
     }
   };
 
+  // Send only the moved item; the server shifts everything in between
+  const saveMove = async (item: RegistryItem, position: number) => {
+    try {
+      const { data: { session } } = await createClient().auth.getSession();
+      await fetch(getApiUrl('/registry/order'), {
+        method: 'PUT',
+        headers: { 
+          'Authorization': `Bearer ${session?.access_token}`,
+          'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({
+          mode: 'delta',
+          items: [{
+            id: item.type === 'conversation' ? item.id : (item as RegistryTrackedBill).bill_id,
+            type: item.type,
+            position
+          }]
+        })
+      });
+    } catch (error) {
+      console.error('Failed to save sidebar order:', error);
+    }
+  };
+
   const fetchRegistry = async () => {
     try {
       const { data: { session } } = await createClient().auth.getSession();
@@ -89,6 +172,7 @@ export default function Sidebar({ currentId, onSelect, onNewChat }: SidebarProps
       });
 
       setRegistryItems(combined);
+      fetchBillStatuses(bills.map((b: RegistryTrackedBill) => b.bill_id));
     } catch (error) {
       console.error('Failed to fetch registry:', error);
     } finally {
@@ -96,6 +180,40 @@ export default function Sidebar({ currentId, onSelect, onNewChat }: SidebarProps
     }
   };
 
+  // Tracked bills' latest actions in batches (no per-bill dashboard loads)
+  const fetchBillStatuses = async (billIds: string[]) => {
+    if (billIds.length === 0) return;
+    try {
+      const { data: { session } } = await createClient().auth.getSession();
+      const batches: string[][] = [];
+      for (let i = 0; i < billIds.length; i += BILL_STATUS_BATCH) {
+        batches.push(billIds.slice(i, i + BILL_STATUS_BATCH));
+      }
+      const responses = await Promise.all(batches.map(batch =>
+        fetch(getApiUrl('/bills/status'), {
+          method: 'POST',
+          headers: {
+            'Authorization': `Bearer ${session?.access_token}`,
+            'Content-Type': 'application/json'
+          },
+          body: JSON.stringify({ bill_ids: batch })
+        })
+      ));
+      const bills: BillStatus[] = [];
+      for (const response of responses) {
+        if (response.ok) bills.push(...(await response.json()).bills);
+      }
+      if (bills.length === 0) return;
+      setBillStatuses(statuses => {
+        const next = { ...statuses };
+        for (const status of bills) next[status.billId] = status;
+        return next;
+      });
+    } catch (error) {
+      console.error('Failed to fetch bill statuses:', error);
+    }
+  };
+
   const executeDelete = async (item: RegistryItem) => {
     try {
       const { data: { session } } = await createClient().auth.getSession();
@@ -166,6 +284,8 @@ export default function Sidebar({ currentId, onSelect, onNewChat }: SidebarProps
   // Drag and Drop Handlers
   const onDragStart = (e: React.DragEvent, index: number) => {
     setDraggedItemIndex(index);
+    // Deltas are only valid when stored positions already match the displayed order
+    dragOriginRef.current = { index, normalized: registryItems.every((item, i) => item.position === i) };
     e.dataTransfer.effectAllowed = 'move';
     // Add a ghost image or styling if needed
   };
@@ -186,8 +306,20 @@ export default function Sidebar({ currentId, onSelect, onNewChat }: SidebarProps
   };
 
   const onDragEnd = () => {
+    const origin = dragOriginRef.current;
+    const finalIndex = draggedItemIndex;
     setDraggedItemIndex(null);
+    dragOriginRef.current = null;
+
+    if (origin && finalIndex !== null && origin.normalized) {
+      if (finalIndex !== origin.index) {
+        saveMove(registryItems[finalIndex], finalIndex);
+        setRegistryItems(items => items.map((item, i) => ({ ...item, position: i })));
+      }
+      return;
+    }
     saveCustomOrder(registryItems);
+    setRegistryItems(items => items.map((item, i) => ({ ...item, position: i })));
   };
 
   return (
@@ -244,6 +376,11 @@ export default function Sidebar({ currentId, onSelect, onNewChat }: SidebarProps
                         if (item.type === 'conversation') {
                           onSelect(item.id, item.bioguide_id);
                         } else {
+                          setUpdatedBillIds(ids => {
+                            const next = new Set(ids);
+                            next.delete(item.bill_id);
+                            return next;
+                          });
                           router.push(`/bill/${item.congress}/${item.bill_type.toLowerCase()}/${item.bill_number}`);
                         }
                       }}
@@ -260,6 +397,17 @@ export default function Sidebar({ currentId, onSelect, onNewChat }: SidebarProps
                         </span>
                       )}
                       {item.title}
+                      {item.type === 'bill' && billStatuses[item.bill_id]?.latestAction?.text && (
+                        <span
+                          className={`block truncate pl-5 mt-0.5 font-medium ${currentId === item.id ? 'text-white/70' : 'text-gray-600'}`}
+                          title={billStatuses[item.bill_id].latestAction?.text}
+                        >
+                          {billStatuses[item.bill_id].latestAction?.actionDate} · {billStatuses[item.bill_id].latestAction?.text}
+                        </span>
+                      )}
+                      {item.type === 'bill' && updatedBillIds.has(item.bill_id) && (
+                        <span className="absolute right-3 top-1/2 -translate-y-1/2 w-2 h-2 rounded-full bg-green-400 group-hover:opacity-0" title="New action" />
+                      )}
                     </button>
                     
                     {/* Hover Actions */}
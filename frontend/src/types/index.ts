@@ -112,3 +112,32 @@ export interface RegistryTrackedBill {
 }
 
 export type RegistryItem = RegistryConversation | RegistryTrackedBill;
+
+// Compact bill status: returned by POST /bills/status, and pushed on
+// /tracked-bills/stream when a tracked bill gets a new action
+export interface BillStatus {
+  billId: string;
+  congress: number;
+  billType: string;
+  billNumber: string;
+  title?: string;
+  latestAction?: {
+    actionDate?: string;
+    text?: string;
+  };
+  updateDate?: string;
+}
+
+export type BillUpdate = BillStatus;
+
+// `action` events on /chat/stream, parsed from the agent's action tags
+export type ChatAction =
+  | { type: 'open_member'; name: string; bioguideId: string }
+  | {
+      type: 'track_bill' | 'research_bill';
+      congress: number;
+      billType: string;
+      billNumber: string;
+      title: string;
+      billId: string;
+    };